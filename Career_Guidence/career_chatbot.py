@@ -4,17 +4,17 @@ import time
 import numpy as np
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import ConversationalRetrievalChain
-from langchain_groq import ChatGroq
+from common.llm_factory import get_chat_model, get_http_client, get_openai_client
 import os
 from langchain.prompts import PromptTemplate
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
-from openai import OpenAI
+from common.instrumentation import track_call
 load_dotenv()
 
 os.environ["OPENAI_API_KEY"] = os.getenv("A4F_API_KEY")
 os.environ["OPENAI_API_BASE"] = "https://api.a4f.co/v1" # Key configuration
-client = OpenAI(
+client = get_openai_client(
     api_key=os.getenv("A4F_API_KEY"),
     base_url=os.getenv("A4F_BASE_URL"),
 )
@@ -51,6 +51,7 @@ class CareerChatAssistant:
             # Initialize embeddings
             embeddings = OpenAIEmbeddings(
                 model="provider-3/text-embedding-ada-002",
+                http_client=get_http_client(),
             )
             # embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
          
@@ -77,7 +78,8 @@ class CareerChatAssistant:
             chunks = text_splitter.create_documents([" ".join(documents)])
             
         
-            self.vector_store = FAISS.from_documents(chunks, embeddings)
+            with track_call("embedding", "career_chatbot.build_faiss", payload=chunks):
+                self.vector_store = FAISS.from_documents(chunks, embeddings)
 
             structured_prompt_template = """
             You are a Career Chat Assistant providing information about careers based on detailed analysis.
@@ -108,7 +110,7 @@ class CareerChatAssistant:
             )
             
    
-            llm = ChatGroq(model='gemma2-9b-it', groq_api_key=self.groq_api_key, temperature=0.2)
+            llm = get_chat_model('gemma2-9b-it', temperature=0.2, api_key=self.groq_api_key)
             self.retrieval_chain = ConversationalRetrievalChain.from_llm(
                 llm=llm,
                 retriever=self.vector_store.as_retriever(search_kwargs={"k": 3}),
@@ -133,10 +135,12 @@ class CareerChatAssistant:
         if self.retrieval_chain and st.session_state.get("rag_initialized", False):
             try:
                 # Use RAG to answer the question
-                result = self.retrieval_chain.invoke({
-                    "question": question,
-                    "chat_history": self.chat_history
-                })
+                with track_call("llm", "career_chatbot.retrieval_chain", payload=question) as span:
+                    result = self.retrieval_chain.invoke({
+                        "question": question,
+                        "chat_history": self.chat_history
+                    })
+                    span.record_response(result.get("answer"))
                 
                 # Update chat history for context
                 self.chat_history.append((question, result["answer"]))
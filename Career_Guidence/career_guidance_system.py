@@ -3,7 +3,8 @@ from langchain.prompts import PromptTemplate
 from langchain.agents import load_tools, initialize_agent, AgentType
 from langchain_community.utilities import SerpAPIWrapper
 from datetime import datetime
-from langchain_groq import ChatGroq
+from common.llm_factory import get_chat_model
+from common.instrumentation import track_call
 
 import os
 import time
@@ -24,10 +25,7 @@ class CareerGuidanceSystem:
         
         # Initialize the language model
         if groq_api_key:
-            self.llm = ChatGroq(
-                model='gemma2-9b-it',
-                groq_api_key=groq_api_key,
-            )
+            self.llm = get_chat_model('gemma2-9b-it', temperature=0.7, api_key=groq_api_key)
             
             # Initialize search tools if SerpAPI key is provided
             if serpapi_key:
@@ -121,24 +119,28 @@ class CareerGuidanceSystem:
             retry_count = 0
             last_error = None
             
-            while retry_count < max_retries:
-                try:
-                    result = self.search_agent.run(query)
-                    
-                    # Cache the result with timestamp
-                    self.search_cache[cache_key] = {
-                        'data': result,
-                        'timestamp': datetime.now()
-                    }
-                    
-                    # Add a small delay to prevent rate limiting
-                    time.sleep(1)
-                    
-                    return result
-                except Exception as e:
-                    last_error = str(e)
-                    retry_count += 1
-                    time.sleep(2)  # Wait before retrying
+            with track_call("search", "career_guidance.search_agent", payload=query) as span:
+                while retry_count < max_retries:
+                    try:
+                        result = span.record_response(self.search_agent.run(query))
+                        
+                        # Cache the result with timestamp
+                        self.search_cache[cache_key] = {
+                            'data': result,
+                            'timestamp': datetime.now()
+                        }
+                        
+                        # Add a small delay to prevent rate limiting
+                        time.sleep(1)
+                        
+                        return result
+                    except Exception as e:
+                        last_error = str(e)
+                        retry_count += 1
+                        if retry_count < max_retries:
+                            span.add_retry()
+                        time.sleep(2)  # Wait before retrying
+                span.error = last_error
             
             # If all retries failed, fall back to direct LLM query without agent
             try:
@@ -150,7 +152,7 @@ class CareerGuidanceSystem:
                     """
                 )
                 chain = LLMChain(llm=self.llm, prompt=prompt)
-                result = chain.run(query=query)
+                result = self._run_chain(chain, "search_fallback", query=query)
                 
                 # Cache this result as well
                 self.search_cache[cache_key] = {
@@ -164,6 +166,11 @@ class CareerGuidanceSystem:
         else:
             return "Search unavailable. Please provide a SerpAPI key for web search capabilities."
     
+    def _run_chain(self, chain, site, **inputs):
+        """Run an LLMChain, recording the call under career_guidance.<site>"""
+        with track_call("llm", f"career_guidance.{site}", payload=inputs) as span:
+            return span.record_response(chain.run(**inputs))
+    
     def format_search_results(self, results, title):
         """Format search results into a well-structured markdown document"""
         formatted = f"# {title}\n\n"
@@ -342,10 +349,10 @@ class CareerGuidanceSystem:
                         experience_level = "intermediate"
                 
                 # Generate all components
-                research = career_chain.run(career=career_name)
-                market_analysis = market_chain.run(career=career_name)
-                learning_roadmap = roadmap_chain.run(career=career_name, experience_level=experience_level)
-                industry_insights = insights_chain.run(career=career_name)
+                research = self._run_chain(career_chain, "overview", career=career_name)
+                market_analysis = self._run_chain(market_chain, "market", career=career_name)
+                learning_roadmap = self._run_chain(roadmap_chain, "roadmap", career=career_name, experience_level=experience_level)
+                industry_insights = self._run_chain(insights_chain, "insights", career=career_name)
                 
                 # Create the result dictionary
                 results = {
@@ -409,7 +416,7 @@ class CareerGuidanceSystem:
                 """
             )
             chain = LLMChain(llm=self.llm, prompt=prompt)
-            return chain.run(career=career)
+            return self._run_chain(chain, "career_information", career=career)
         
         # Fallback to generic response
         return f"{career} is a career field that requires specialized skills and education. Enable web search for detailed information."
@@ -442,7 +449,7 @@ class CareerGuidanceSystem:
                 """
             )
             chain = LLMChain(llm=self.llm, prompt=prompt)
-            return chain.run(career=career)
+            return self._run_chain(chain, "market_trends", career=career)
         
         # Fallback to generic response
         return f"Market analysis for {career} requires web search capabilities. Please provide a SerpAPI key."
@@ -475,7 +482,7 @@ class CareerGuidanceSystem:
                 """
             )
             chain = LLMChain(llm=self.llm, prompt=prompt)
-            return chain.run(career=career, experience_level=experience_level)
+            return self._run_chain(chain, "learning_roadmap", career=career, experience_level=experience_level)
         
         # Fallback to generic response
         return f"A personalized learning roadmap for {career} requires web search capabilities. Please provide a SerpAPI key."
@@ -508,7 +515,7 @@ class CareerGuidanceSystem:
                 """
             )
             chain = LLMChain(llm=self.llm, prompt=prompt)
-            return chain.run(career=career)
+            return self._run_chain(chain, "career_insights", career=career)
         
         # Fallback to generic response
         return f"Industry insights for {career} require web search capabilities. Please provide a SerpAPI key."
@@ -556,7 +563,7 @@ class CareerGuidanceSystem:
             
             # Generate response
             chain = LLMChain(llm=self.llm, prompt=prompt)
-            response = chain.run(context=context, question=question)
+            response = self._run_chain(chain, "chat", context=context, question=question)
             
             return response
         
@@ -0,0 +1,184 @@
+"""Process-wide registry of lazily built clients (LLM, embeddings, vector store).
+
+Nothing here talks to the network or opens the Chroma store at import time;
+each client is built on first use and then shared by every module.
+"""
+import contextlib
+import os
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterator
+
+from embedding import (
+    A4F_EMBEDDINGS_BASE, CHROMA_HOST, CHROMA_PORT, COLLECTION_NAME, EMBEDDING_MODEL, PERSIST_DIRECTORY,
+    VECTOR_STORE_MODE
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    from common import llm_factory
+    from common.instrumentation import record_cache, track_call
+except ImportError:
+    # Run from this folder (python main_mcq.py), where the repository root is not on sys.path:
+    # clients are built directly (no shared connection pool) and calls are not instrumented
+    llm_factory = None
+
+    class _NullSpan:
+        def record_response(self, response: Any) -> Any:
+            return response
+
+        def set_tokens(self, tokens_in: int = 0, tokens_out: int = 0) -> None:
+            pass
+
+        def set_payload(self, request: Any) -> None:
+            pass
+
+        def add_retry(self) -> None:
+            pass
+
+        def cache_hit(self) -> None:
+            pass
+
+        def cache_miss(self) -> None:
+            pass
+
+    @contextlib.contextmanager
+    def track_call(kind: str, site: str, payload: Any = None) -> Iterator[_NullSpan]:
+        yield _NullSpan()
+
+    def record_cache(site: str, hit: bool, kind: str = "cache") -> None:
+        pass
+
+LLM_MODEL = "gemma2-9b-it"
+LLM_TEMPERATURE = 0.7
+
+_instances: Dict[str, Any] = {}
+_lock = threading.RLock()
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load .env once per process."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    instance = _instances.get(name)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = factory()
+                _instances[name] = instance
+                logger.info(f"Initialized shared {name} client")
+    return instance
+
+
+def override(name: str, instance: Any) -> None:
+    """Replace a shared client, e.g. with a local fake in benchmarks."""
+    with _lock:
+        _instances[name] = instance
+
+
+def discard(name: str) -> None:
+    """Drop one shared client so the next call rebuilds it."""
+    with _lock:
+        _instances.pop(name, None)
+
+
+def reset() -> None:
+    """Drop every shared client so the next call rebuilds it."""
+    with _lock:
+        _instances.clear()
+
+
+def _build_llm():
+    load_env()
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise RuntimeError("GROQ_API_KEY is not set.")
+    if llm_factory is None:
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=LLM_MODEL, temperature=LLM_TEMPERATURE, api_key=api_key)
+    return llm_factory.get_chat_model(LLM_MODEL, temperature=LLM_TEMPERATURE, api_key=api_key)
+
+
+def _build_embeddings():
+    load_env()
+    from langchain_openai import OpenAIEmbeddings
+    return OpenAIEmbeddings(
+        model=EMBEDDING_MODEL,
+        openai_api_key=os.getenv("A4F_API_KEY"),
+        openai_api_base=A4F_EMBEDDINGS_BASE,
+        http_client=llm_factory.get_http_client() if llm_factory else None
+    )
+
+
+def _build_chroma_client():
+    import chromadb
+    if VECTOR_STORE_MODE == "server":
+        return chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    os.makedirs(PERSIST_DIRECTORY, exist_ok=True)
+    return chromadb.PersistentClient(path=PERSIST_DIRECTORY)
+
+
+def _build_vector_store():
+    from langchain_community.vectorstores import Chroma
+    return Chroma(
+        collection_name=COLLECTION_NAME,
+        embedding_function=get_embeddings(),
+        client=get_chroma_client()
+    )
+
+
+def _build_openai_client():
+    load_env()
+    if llm_factory is None:
+        from openai import OpenAI
+        return OpenAI(api_key=os.getenv("A4F_API_KEY"), base_url=os.getenv("A4F_BASE_URL"))
+    return llm_factory.get_openai_client(os.getenv("A4F_API_KEY"), os.getenv("A4F_BASE_URL"))
+
+
+def _build_wikipedia():
+    import wikipediaapi
+    return wikipediaapi.Wikipedia("AcademicExplainer/1.0", "en")
+
+
+def get_llm():
+    """Shared Groq chat model."""
+    return _get_or_create("llm", _build_llm)
+
+
+def get_embeddings():
+    """Shared A4F embeddings client."""
+    return _get_or_create("embeddings", _build_embeddings)
+
+
+def get_vector_store():
+    """Shared Chroma vector store over PERSIST_DIRECTORY."""
+    return _get_or_create("vector_store", _build_vector_store)
+
+
+def get_chroma_client():
+    """Shared chromadb client (HTTP in server mode, persistent over PERSIST_DIRECTORY otherwise)."""
+    return _get_or_create("chroma_client", _build_chroma_client)
+
+
+def get_openai_client():
+    """Shared raw OpenAI-compatible client for A4F."""
+    return _get_or_create("openai_client", _build_openai_client)
+
+
+def get_wikipedia():
+    """Shared Wikipedia API client."""
+    return _get_or_create("wikipedia", _build_wikipedia)
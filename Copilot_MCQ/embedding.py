@@ -1,30 +1,27 @@
-from langchain_community.vectorstores import Chroma
-from langchain_core.documents import Document
 import os
-from dotenv import load_dotenv
+
 COLLECTION_NAME = "academic_data"
-from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
-from langchain_openai import ChatOpenAI
-from openai import OpenAI
-# Configure Langchain to use A4F
-os.environ["OPENAI_API_KEY"] = os.getenv("A4F_API_KEY")
-os.environ["OPENAI_API_BASE"] = "https://api.a4f.co/v1" # Key configuration
-client = OpenAI(
-    api_key=os.getenv("A4F_API_KEY"),
-    base_url=os.getenv("A4F_BASE_URL"),
-)
+PERSIST_DIRECTORY = os.getenv("VECTOR_STORE_DIR", "./YT_VECTOR")
+# "local" opens PERSIST_DIRECTORY in-process with file-locked writes;
+# "server" talks to a single Chroma server process that owns the directory
+VECTOR_STORE_MODE = os.getenv("VECTOR_STORE_MODE", "local")
+CHROMA_HOST = os.getenv("CHROMA_HOST", "localhost")
+CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
+# Embeddings are served through A4F's OpenAI-compatible API
+EMBEDDING_MODEL = "provider-3/text-embedding-ada-002"
+A4F_EMBEDDINGS_BASE = "https://api.a4f.co/v1"
 # llm=ChatOpenAI(model_name="provider-2/gpt-3.5-turbo")
-# Initialize embeddings
-embeddings = OpenAIEmbeddings(
-    model="provider-3/text-embedding-ada-002",
-)
-COLLECTION_NAME = "academic_data"
-os.makedirs("./YT_VECTOR", exist_ok=True)
+
+_LAZY_CLIENTS = {
+    "vector_store": "get_vector_store",
+    "embeddings": "get_embeddings",
+    "client": "get_openai_client",
+}
 
 
-vector_store = Chroma(
-    collection_name=COLLECTION_NAME,
-    embedding_function=embeddings,
-    persist_directory="./YT_VECTOR"
-)
+def __getattr__(name):
+    # Keep `embedding.vector_store` working without opening Chroma at import time
+    if name in _LAZY_CLIENTS:
+        import clients
+        return getattr(clients, _LAZY_CLIENTS[name])()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,35 +1,13 @@
 from typing import Optional, Dict
 import logging
-from duckduckgo_search import DDGS
-import wikipediaapi
-import logging
-from typing import Dict
-import os
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-import streamlit as st
-load_dotenv()
-
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-# Validate environment
-if not GROQ_API_KEY:
-    st.error("GROQ_API_KEY is not set.")
-    st.stop()
-
-# Initialize Groq LLM
-try:
-    llm = ChatGroq(model_name="gemma2-9b-it", api_key=GROQ_API_KEY, temperature=0.7)
-except Exception as e:
-    st.error(f"Failed to initialize Groq LLM: {e}")
-    st.stop()
+from clients import get_llm, get_wikipedia, track_call
+from source_cache import cached_source
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-wiki = wikipediaapi.Wikipedia("AcademicExplainer/1.0", "en")
 EDUCATION_LEVEL = "college"
 
 def build_prompt(content: str) -> str:
@@ -47,32 +25,49 @@ def build_prompt(content: str) -> str:
                 {content[:1500]}
                 """
 
+@cached_source("wikipedia")
+def _wikipedia_explanation(topic: str) -> Optional[str]:
+    with track_call("search", "wikipedia.page", payload=topic) as span:
+        page = get_wikipedia().page(topic)
+        exists = page.exists()
+        span.record_response(page.summary if exists else None)
+    if exists:
+        prompt = build_prompt(page.summary)
+        with track_call("llm", "fetch_data.wikipedia_summary", payload=prompt) as span:
+            response = span.record_response(get_llm().invoke(prompt))
+        return response.content.strip()
+    logger.info(f"Wikipedia page not found for topic: {topic}")
+    return None
+
 def fetch_wikipedia_explanation(topic: str) -> Optional[str]:
     """Fetch explanation from Wikipedia."""
     try:
-        page = wiki.page(topic)
-        if page.exists():
-            summary = page.summary
-            prompt = build_prompt(summary)
-            response = llm.invoke(prompt)
-            return response.content.strip()
-        logger.info(f"Wikipedia page not found for topic: {topic}")
-        return None
+        return _wikipedia_explanation(topic)
     except Exception as e:
         logger.warning(f"Wikipedia fetch failed for '{topic}': {e}")
         return None
 
+@cached_source("duckduckgo")
+def _duckduckgo_explanation(topic: str) -> Optional[str]:
+    from duckduckgo_search import DDGS
+    with track_call("search", "ddgs.text", payload=topic) as span, DDGS() as ddgs:
+        results = list(ddgs.text(f"{topic} explanation", max_results=2))
+        span.record_response(results)
+    if results:
+        content = " ".join([result.get("body", "") for result in results])
+        prompt = build_prompt(content)
+        with track_call("llm", "fetch_data.duckduckgo_summary", payload=prompt) as span:
+            response = span.record_response(get_llm().invoke(prompt))
+        return response.content.strip()
+    return None
+
 def fetch_duckduckgo_explanation(topic: str) -> str:
     """Fetch explanation from DuckDuckGo as fallback."""
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(f"{topic} explanation", max_results=2))
-            if results:
-                content = " ".join([result.get("body", "") for result in results])
-                prompt = build_prompt(content)
-                response = llm.invoke(prompt)
-                return response.content.strip()
-            return f"⚠️ No reliable content found for '{topic}'."
+        explanation = _duckduckgo_explanation(topic)
+        if explanation:
+            return explanation
+        return f"⚠️ No reliable content found for '{topic}'."
     except Exception as e:
         logger.error(f"DuckDuckGo fetch failed for '{topic}': {e}")
         return f"⚠️ Error fetching content for '{topic}': {e}"
@@ -95,25 +90,33 @@ def fetch_duckduckgo_explanation(topic: str) -> str:
 #         logger.error(f"YouTube video fetch failed for '{topic}': {e}")
 #         return {}
 
+@cached_source("youtube")
+def _youtube_video(topic: str) -> Dict:
+    from duckduckgo_search import DDGS
+    with track_call("search", "ddgs.videos", payload=topic) as span, DDGS() as ddgs:
+        results = list(ddgs.videos(f"{topic} tutorial", max_results=2))
+        span.record_response(results)
+    if results:
+        video = results[0]
+        return {
+            "url": video.get("content", ""),
+            "title": video.get("title", "Unknown"),
+            "description": video.get("description", "")
+        }
+    return {}
+
 def fetch_youtube_video(topic: str) -> Dict:
     """Fetch YouTube video link using DuckDuckGo. Fallback to YouTube search URL if no video is found."""
     try:
-        with DDGS() as ddgs:
-            results = list(ddgs.videos(f"{topic} tutorial", max_results=2))
-            if results:
-                video = results[0]
-                return {
-                    "url": video.get("content", ""),
-                    "title": video.get("title", "Unknown"),
-                    "description": video.get("description", "")
-                }
-            else:
-                logger.info(f"No YouTube video results found for '{topic}'. Falling back to YouTube search URL.")
-                return {
-                    "url": f"https://www.youtube.com/results?search_query={topic.replace(' ', '+')}+tutorial",
-                    "title": "Explore on YouTube",
-                    "description": "No direct video found. Here's a search link to explore related videos."
-                }
+        video = _youtube_video(topic)
+        if video:
+            return video
+        logger.info(f"No YouTube video results found for '{topic}'. Falling back to YouTube search URL.")
+        return {
+            "url": f"https://www.youtube.com/results?search_query={topic.replace(' ', '+')}+tutorial",
+            "title": "Explore on YouTube",
+            "description": "No direct video found. Here's a search link to explore related videos."
+        }
     except Exception as e:
         logger.error(f"YouTube video fetch failed for '{topic}': {e}")
         return {
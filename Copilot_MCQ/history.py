@@ -1,5 +1,7 @@
+import re
 from typing import List
-from embedding import vector_store
+from clients import get_vector_store
+from vector_access import read_lock
 import logging
 
 # Configure logging
@@ -10,7 +12,8 @@ logger = logging.getLogger(__name__)
 def fetch_topic_history() -> List[str]:
     """Retrieve unique topics from ChromaDB."""
     try:
-        results = vector_store.get()
+        with read_lock():
+            results = get_vector_store().get()
         topics = set()
         for metadata in results.get("metadatas", []):
             topic = metadata.get("topic")
@@ -24,15 +27,86 @@ def fetch_topic_history() -> List[str]:
 
 
 
+ACADEMIC_CONTEXT = {
+    "stack": "stack data structure",
+    "queue": "queue data structure",
+    "tree": "tree data structure",
+    "graph": "graph data structure",
+    "heap": "heap data structure",
+    "agile": "agile software development",
+    "benzene": "benzene chemistry",
+    "attention mechanism": "attention mechanism neural networks",
+    "transformer": "transformer neural network architecture",
+    "newton third low of motion": "Newton's Third Law of Motion",
+    "newton's third law": "Newton's Third Law of Motion",
+    "newton third law": "Newton's Third Law of Motion",
+    "newton third law motion": "Newton's Third Law of Motion",
+    "cell": "cell biology",
+    "mole": "mole chemistry",
+}
+
+# Spelling variants and abbreviations mapped to one canonical topic name
+TOPIC_ALIASES = {
+    "quicksort": "quick sort",
+    "mergesort": "merge sort",
+    "heapsort": "heap sort",
+    "bubblesort": "bubble sort",
+    "insertionsort": "insertion sort",
+    "selectionsort": "selection sort",
+    "binarysearch": "binary search",
+    "dfs": "depth first search",
+    "bfs": "breadth first search",
+    "dp": "dynamic programming",
+    "oop": "object oriented programming",
+    "oops": "object oriented programming",
+    "dbms": "database management system",
+    "os": "operating system",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "cnn": "convolutional neural network",
+    "rnn": "recurrent neural network",
+    "dna": "deoxyribonucleic acid",
+}
+
+# Words that describe the request rather than the topic
+TOPIC_FILLER_WORDS = {
+    "a", "an", "the", "what", "is", "are", "explain", "explanation", "introduction", "intro", "to",
+    "basic", "basics", "overview", "concept", "algorithm", "technique", "method", "topic", "definition",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9\s]")
+
+
+def lemmatize_word(word: str) -> str:
+    """Light rule-based lemmatizer for plural English nouns."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _normalize_words(text: str) -> str:
+    text = text.lower().replace("'", "")
+    text = _NON_WORD.sub(" ", text.replace("-", " ").replace("_", " "))
+    words = [lemmatize_word(w) for w in text.split() if w not in TOPIC_FILLER_WORDS]
+    words = [w for w in words if w not in TOPIC_FILLER_WORDS] or text.split()
+    return " ".join(words)
+
+
+def canonicalize_topic(topic: str) -> str:
+    """Reduce spelling variants of a topic ("Quicksort", "quick-sort algorithms") to one key."""
+    key = _normalize_words(topic)
+    key = TOPIC_ALIASES.get(key) or TOPIC_ALIASES.get(key.replace(" ", ""), key)
+    return _normalize_words(disambiguate_topic(key))
+
+
 def disambiguate_topic(topic: str) -> str:
     """Add context to ambiguous topics for better search results."""
     topic = topic.strip().lower()
-    academic_context = {
-        "stack": "stack data structure",
-        "agile": "agile software development",
-        "benzene": "benzene chemistry",
-        "attention mechanism": "attention mechanism neural networks",
-        "newton third low of motion": "Newton's Third Law of Motion",
-        "newton's third law": "Newton's Third Law of Motion"
-    }
-    return academic_context.get(topic, topic)
\ No newline at end of file
+    return ACADEMIC_CONTEXT.get(topic, topic)
@@ -0,0 +1,199 @@
+import heapq
+import math
+import re
+import threading
+import time
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from clients import get_vector_store
+from vector_access import read_lock, similarity_search
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Document types that hold study content (MCQ performance lives in SQLite)
+CONTENT_TYPES = ["topic", "video"]
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Standard reciprocal rank fusion constant; larger values flatten rank differences
+RRF_K = 60
+# Rough chars-per-token ratio for English text, used to fit passages into the prompt
+CHARS_PER_TOKEN = 4
+MCQ_CONTEXT_TOKENS = 1500
+# How often to compare the in-memory index with the stored content ids (other processes may write)
+INDEX_REFRESH_SECONDS = 60.0
+# Length norms are recomputed once the average document length drifts this far from the
+# average they were computed with; documents added in between get a norm from that average
+NORM_REBUILD_DRIFT = 0.1
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "its",
+    "of", "on", "or", "that", "the", "this", "to", "was", "were", "with", "topic", "explanation",
+}
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class LexicalIndex:
+    """In-memory inverted index scored with BM25."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.doc_lengths: Dict[str, int] = {}
+        self.texts: Dict[str, str] = {}
+        # Every content id seen, including documents without text, to tell which stored ids are new
+        self.seen: Set[str] = set()
+        self.total_length = 0
+        # BM25 length normalisation per document and the average length it was computed with
+        self._norms: Optional[Dict[str, float]] = None
+        self._norm_average = 0.0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, doc_id: str, text: str) -> None:
+        with self._lock:
+            if doc_id in self.seen:
+                return
+            self.seen.add(doc_id)
+            if not text:
+                return
+            counts = Counter(tokenize(text))
+            for token, count in counts.items():
+                self.postings[token][doc_id] = count
+            length = sum(counts.values())
+            self.doc_lengths[doc_id] = length
+            self.texts[doc_id] = text
+            self.total_length += length
+            if self._norms is not None:
+                self._norms[doc_id] = self._norm(length, self._norm_average)
+
+    @staticmethod
+    def _norm(length: int, average_length: float) -> float:
+        return BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+
+    def _length_norms(self) -> Dict[str, float]:
+        """Per-document length norms; the caller holds the lock."""
+        average_length = self.total_length / len(self.doc_lengths)
+        if self._norms is None or abs(average_length - self._norm_average) > NORM_REBUILD_DRIFT * self._norm_average:
+            self._norms = {doc_id: self._norm(length, average_length) for doc_id, length in self.doc_lengths.items()}
+            self._norm_average = average_length
+        return self._norms
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top `k` (doc_id, score) pairs for the query."""
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        scores: Dict[str, float] = defaultdict(float)
+        # Scored under the lock: the job worker adds documents while the UI thread searches
+        with self._lock:
+            num_docs = len(self.doc_lengths)
+            if not num_docs:
+                return []
+            norms = self._length_norms()
+            for token in tokens:
+                postings = self.postings.get(token)
+                if not postings:
+                    continue
+                idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                weight = idf * (BM25_K1 + 1)
+                for doc_id, tf in postings.items():
+                    scores[doc_id] += weight * tf / (tf + norms[doc_id])
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+_index: Optional[LexicalIndex] = None
+_index_lock = threading.Lock()
+_last_refresh = 0.0
+
+
+def _add_stored(index: LexicalIndex, ids: Optional[Iterable[str]] = None) -> None:
+    """Adds stored content documents (all of them, or just `ids`) to the index."""
+    with read_lock():
+        data = get_vector_store().get(ids=list(ids) if ids is not None else None,
+                                      where={"type": {"$in": CONTENT_TYPES}}, include=["documents"])
+    for doc_id, text in zip(data["ids"], data["documents"]):
+        index.add(doc_id, text)
+
+
+def _load_index() -> LexicalIndex:
+    index = LexicalIndex()
+    _add_stored(index)
+    logger.info(f"Built lexical index over {len(index)} documents")
+    return index
+
+
+def _stored_content_ids() -> Set[str]:
+    with read_lock():
+        return set(get_vector_store().get(where={"type": {"$in": CONTENT_TYPES}}, include=[])["ids"])
+
+
+def get_index() -> LexicalIndex:
+    """The process-wide lexical index, caught up with documents other processes have stored."""
+    global _index, _last_refresh
+    with _index_lock:
+        now = time.monotonic()
+        if _index is None:
+            _index, _last_refresh = _load_index(), now
+        elif now - _last_refresh > INDEX_REFRESH_SECONDS:
+            _last_refresh = now
+            stored = _stored_content_ids()
+            if _index.seen - stored:
+                # Documents were deleted elsewhere; BM25 statistics need a full rebuild
+                _index = _load_index()
+            elif stored - _index.seen:
+                _add_stored(_index, stored - _index.seen)
+        return _index
+
+
+def index_documents(documents: List, ids: List[str]) -> None:
+    """Add freshly stored content documents to the lexical index."""
+    if _index is None:
+        # Built on first search from the collection, which already holds these
+        return
+    for doc_id, document in zip(ids, documents):
+        if document.metadata.get("type") in CONTENT_TYPES:
+            _index.add(doc_id, document.page_content)
+
+
+def hybrid_search(query: str, k: int = 5, candidates: int = 10) -> List[str]:
+    """Passages ranked by reciprocal rank fusion of BM25 and vector similarity."""
+    fused: Dict[str, float] = defaultdict(float)
+    index = get_index()
+    for rank, (doc_id, _) in enumerate(index.search(query, k=candidates)):
+        fused[index.texts[doc_id]] += 1 / (RRF_K + rank + 1)
+    try:
+        vector_results = similarity_search(query, k=candidates, filter={"type": {"$in": CONTENT_TYPES}})
+    except Exception as e:
+        logger.error(f"Vector search failed for '{query}', using lexical results only: {e}")
+        vector_results = []
+    # Chroma does not return ids from similarity_search, so passages are fused by text
+    for rank, document in enumerate(vector_results):
+        fused[document.page_content] += 1 / (RRF_K + rank + 1)
+    return sorted(fused, key=fused.get, reverse=True)[:k]
+
+
+def assemble_context(passages: List[str], max_tokens: int = MCQ_CONTEXT_TOKENS) -> str:
+    """Join passages in rank order until the token budget is spent."""
+    budget = max_tokens * CHARS_PER_TOKEN
+    selected = []
+    for passage in passages:
+        if budget <= 0:
+            break
+        selected.append(passage[:budget])
+        budget -= len(selected[-1])
+    return "\n\n---\n\n".join(selected)
+
+
+def retrieve_context(topic: str, max_tokens: int = MCQ_CONTEXT_TOKENS) -> str:
+    """Study content for a topic, combined from its best-matching documents."""
+    return assemble_context(hybrid_search(f"Topic: {topic}"), max_tokens)
@@ -0,0 +1,214 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from typing import Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOBS_DB_PATH = "./copilot_jobs.db"
+JOB_WORKERS = int(os.getenv("COPILOT_JOB_WORKERS", "1"))
+# A running job whose heartbeat is older than this is treated as interrupted and resumed
+STALE_JOB_SECONDS = 120
+# How often a worker refreshes the heartbeat of the job it is running
+HEARTBEAT_SECONDS = STALE_JOB_SECONDS / 4
+IDLE_POLL_SECONDS = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS job_topics (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    topic TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+_workers: List[threading.Thread] = []
+_workers_lock = threading.Lock()
+_wakeup = threading.Event()
+
+
+def _connect(db_path: str = JOBS_DB_PATH) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    if db_path not in _initialized_paths:
+        with _init_lock:
+            if db_path not in _initialized_paths:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+                if "owner" not in columns:
+                    conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+                _initialized_paths.add(db_path)
+    return conn
+
+
+def submit_job(topics: List[str], db_path: str = JOBS_DB_PATH) -> str:
+    """Queue a syllabus for background processing and return its job id."""
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    conn = _connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO jobs (job_id, status, created_at, updated_at) VALUES (?, 'pending', ?, ?)",
+                     (job_id, now, now))
+        conn.executemany(
+            "INSERT INTO job_topics (job_id, position, topic, status) VALUES (?, ?, ?, 'pending')",
+            [(job_id, position, topic) for position, topic in enumerate(topics)]
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    ensure_workers(db_path=db_path)
+    _wakeup.set()
+    logger.info(f"Queued job {job_id} with {len(topics)} topics")
+    return job_id
+
+
+def get_job(job_id: str, db_path: str = JOBS_DB_PATH) -> Optional[Dict]:
+    """Job status with the results of every finished topic, in syllabus order."""
+    conn = _connect(db_path)
+    try:
+        job = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if job is None:
+            return None
+        rows = conn.execute(
+            "SELECT topic, status, result FROM job_topics WHERE job_id = ? ORDER BY position", (job_id,)
+        ).fetchall()
+    finally:
+        conn.close()
+    finished = [row for row in rows if row[1] != "pending"]
+    return {
+        "job_id": job_id,
+        "status": job[0],
+        "total": len(rows),
+        "done": len(finished),
+        "results": [json.loads(result) for _, status, result in finished if status == "done"],
+        "failed_topics": [topic for topic, status, _ in finished if status == "failed"],
+    }
+
+
+def _claim_job(conn: sqlite3.Connection) -> Optional[Tuple[str, str]]:
+    """Atomically take the oldest pending (or stale running) job; returns (job_id, owner token)."""
+    now = time.time()
+    owner = uuid.uuid4().hex
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT job_id FROM jobs WHERE status = 'pending' OR (status = 'running' AND updated_at < ?) "
+            "ORDER BY created_at LIMIT 1",
+            (now - STALE_JOB_SECONDS,)
+        ).fetchone()
+        if row:
+            conn.execute("UPDATE jobs SET status = 'running', updated_at = ?, owner = ? WHERE job_id = ?",
+                         (now, owner, row[0]))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return (row[0], owner) if row else None
+
+
+def _heartbeat(db_path: str, job_id: str, owner: str, stop: threading.Event) -> None:
+    """Keep a claimed job fresh while a topic runs, so no other worker takes it over."""
+    conn = _connect(db_path)
+    try:
+        while not stop.wait(HEARTBEAT_SECONDS):
+            try:
+                refreshed = conn.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ? AND owner = ?",
+                                         (time.time(), job_id, owner)).rowcount
+            except Exception as e:
+                logger.warning(f"Job {job_id}: heartbeat failed: {e}")
+                continue
+            if not refreshed:
+                return
+    finally:
+        conn.close()
+
+
+def _run_job(conn: sqlite3.Connection, job_id: str, owner: str, db_path: str = JOBS_DB_PATH) -> None:
+    # Imported here so queueing and polling never load the LLM stack
+    from processes import TOPIC_DELAY_SECONDS, process_topic
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(db_path, job_id, owner, stop),
+                                 name=f"copilot-job-heartbeat-{job_id[:8]}", daemon=True)
+    heartbeat.start()
+    try:
+        # Topics checkpointed by an interrupted run are skipped
+        pending = conn.execute(
+            "SELECT position, topic FROM job_topics WHERE job_id = ? AND status = 'pending' ORDER BY position",
+            (job_id,)
+        ).fetchall()
+        for position, topic in pending:
+            try:
+                result, from_cache = process_topic(topic)
+                status, payload = "done", json.dumps(result, ensure_ascii=False)
+            except Exception as e:
+                logger.error(f"Job {job_id}: topic '{topic}' failed: {e}")
+                status, payload, from_cache = "failed", json.dumps({"error": str(e)}), True
+            # Only the current owner may record results; a worker whose claim went stale stops here
+            saved = conn.execute(
+                "UPDATE job_topics SET status = ?, result = ? WHERE job_id = ? AND position = ? "
+                "AND EXISTS (SELECT 1 FROM jobs WHERE job_id = ? AND owner = ?)",
+                (status, payload, job_id, position, job_id, owner)
+            ).rowcount
+            if not saved:
+                logger.warning(f"Job {job_id} was taken over by another worker; stopping")
+                return
+            if not from_cache:
+                time.sleep(TOPIC_DELAY_SECONDS)
+        # Counts topics finished by earlier, interrupted runs too
+        topics_done = conn.execute("SELECT COUNT(*) FROM job_topics WHERE job_id = ? AND status = 'done'",
+                                   (job_id,)).fetchone()[0]
+        topics_failed = conn.execute("SELECT COUNT(*) FROM job_topics WHERE job_id = ? AND status = 'failed'",
+                                     (job_id,)).fetchone()[0]
+        status = "failed" if topics_failed and not topics_done else "done"
+        conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ? AND owner = ?",
+                     (status, time.time(), job_id, owner))
+        logger.info(f"Job {job_id} finished: {topics_done} topics done, {topics_failed} failed")
+    finally:
+        stop.set()
+
+
+def _worker_loop(db_path: str) -> None:
+    while True:
+        try:
+            conn = _connect(db_path)
+            try:
+                claim = _claim_job(conn)
+                if claim:
+                    _run_job(conn, *claim, db_path=db_path)
+                    continue
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Job worker error: {e}")
+        _wakeup.wait(IDLE_POLL_SECONDS)
+        _wakeup.clear()
+
+
+def ensure_workers(num_workers: int = JOB_WORKERS, db_path: str = JOBS_DB_PATH) -> None:
+    """Start the background workers once per process; they also resume interrupted jobs."""
+    with _workers_lock:
+        _workers[:] = [worker for worker in _workers if worker.is_alive()]
+        for i in range(len(_workers), num_workers):
+            worker = threading.Thread(target=_worker_loop, args=(db_path,), name=f"copilot-job-worker-{i}", daemon=True)
+            worker.start()
+            _workers.append(worker)
@@ -1,17 +1,16 @@
 import json
 import logging
 import os
-from dotenv import load_dotenv
+import shutil
 from typing import Dict, List
-from langchain_groq import ChatGroq
 from processes import process_syllabus
 from history import fetch_topic_history
-from embedding import vector_store
-from pdf_maker import generate_pdf_from_json
+from clients import load_env
+from pdf_maker import export_pdf
 from mcq import generate_mcqs, store_mcq_performance
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Validate GROQ_API_KEY
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -19,13 +18,6 @@ if not GROQ_API_KEY:
     print("Error: GROQ_API_KEY is not set.")
     exit(1)
 
-# Initialize Groq LLM
-try:
-    llm = ChatGroq(model_name="gemma2-9b-it", api_key=GROQ_API_KEY, temperature=0.7)
-except Exception as e:
-    print(f"Error: Failed to initialize Groq LLM: {e}")
-    exit(1)
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,9 +25,7 @@ logger = logging.getLogger(__name__)
 def save_pdf(json_data, filename="syllabus_explanations.pdf"):
     """Save PDF from JSON data."""
     try:
-        pdf_bytes = generate_pdf_from_json(json_data)
-        with open(filename, "wb") as f:
-            f.write(pdf_bytes)
+        shutil.copyfile(export_pdf(json_data), filename)
         print(f"PDF saved as {filename}")
     except Exception as e:
         logger.error(f"Failed to save PDF: {e}")
@@ -116,6 +106,7 @@ def run_mcq_practice():
         is_correct = answer == question['correct_answer']
         user_answers.append({
             "question": question["question"],
+            "options": question["options"],
             "selected": answer,
             "correct": question["correct_answer"],
             "is_correct": is_correct,
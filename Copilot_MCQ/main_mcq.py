@@ -1,17 +1,16 @@
 import json
 import logging
 import os
-from dotenv import load_dotenv
 from typing import Dict, List
-from langchain_groq import ChatGroq
 from processes import process_syllabus
 from history import fetch_topic_history
-from embedding import vector_store
+from clients import load_env
 from pdf_maker import generate_pdf_from_json
 from mcq import generate_mcqs, store_mcq_performance
+from review_scheduler import due_questions, due_count
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Validate GROQ_API_KEY
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -19,13 +18,6 @@ if not GROQ_API_KEY:
     print("Error: GROQ_API_KEY is not set.")
     exit(1)
 
-# Initialize Groq LLM
-try:
-    llm = ChatGroq(model_name="gemma2-9b-it", api_key=GROQ_API_KEY, temperature=0.7)
-except Exception as e:
-    print(f"Error: Failed to initialize Groq LLM: {e}")
-    exit(1)
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -55,8 +47,13 @@ def run_mcq_practice():
         print(f"Error: {e}")
         return
     
-    print("Generating MCQs...")
-    mcqs = generate_mcqs(selected_topic, num_questions)
+    mcqs = []
+    due = due_count(selected_topic)
+    if due and input(f"{due} questions are due for review. Review them instead? (y/n): ").strip().lower() == "y":
+        mcqs = due_questions(selected_topic, num_questions)
+    if not mcqs:
+        print("Generating MCQs...")
+        mcqs = generate_mcqs(selected_topic, num_questions)
     if not mcqs:
         print("Error: Failed to generate MCQs. Please try another topic or ensure content is stored.")
         return
@@ -76,6 +73,7 @@ def run_mcq_practice():
         is_correct = answer == question['correct_answer']
         user_answers.append({
             "question": question["question"],
+            "options": question["options"],
             "selected": answer,
             "correct": question["correct_answer"],
             "is_correct": is_correct,
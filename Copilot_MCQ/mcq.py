@@ -1,30 +1,11 @@
-from embedding import vector_store
+from clients import get_llm, track_call
+from hybrid_retriever import retrieve_context
+from performance_store import record_performance
+from review_scheduler import record_answers
 from typing import List, Dict
 import json
-import uuid
-import time
-from langchain_core.documents import Document
 import logging
 from typing import Dict
-import os
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-import streamlit as st
-load_dotenv()
-
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-# Validate environment
-if not GROQ_API_KEY:
-    st.error("GROQ_API_KEY is not set.")
-    st.stop()
-
-# Initialize Groq LLM
-try:
-    llm = ChatGroq(model_name="gemma2-9b-it", api_key=GROQ_API_KEY, temperature=0.7)
-except Exception as e:
-    st.error(f"Failed to initialize Groq LLM: {e}")
-    st.stop()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,13 +15,11 @@ EDUCATION_LEVEL = "college"
 def generate_mcqs(topic: str, num_questions: int) -> List[Dict]:
     """Generate MCQs for a topic using Groq."""
     try:
-        results = vector_store.similarity_search(f"Topic: {topic}", k=1)
-        if not results:
+        content = retrieve_context(topic)
+        if not content:
             logger.warning(f"No content found for topic {topic}")
             return []
-            print(num_questions)
-        
-        content = results[0].page_content
+
         prompt = f"""
         Generate {num_questions} multiple-choice questions for the topic '{topic}' based solely on the provided content, suitable for a {EDUCATION_LEVEL} student. Each question must have:
         - A clear question
@@ -51,6 +30,8 @@ def generate_mcqs(topic: str, num_questions: int) -> List[Dict]:
         Return the questions in valid JSON format. Do not use the example content in the output.
         Return *only* valid JSON without markdown formatting or extra explanation.
 
+        Content:
+        {content}
 
 
         JSON format:
@@ -68,7 +49,8 @@ def generate_mcqs(topic: str, num_questions: int) -> List[Dict]:
             }}
         ]
         """
-        response = llm.invoke(prompt)
+        with track_call("llm", "mcq.generate_mcqs", payload=prompt) as span:
+            response = span.record_response(get_llm().invoke(prompt))
         logger.info(f"Raw Groq response for MCQs: {response.content.strip()}")
         try:
             mcqs = json.loads(response.content.strip())
@@ -86,15 +68,10 @@ def generate_mcqs(topic: str, num_questions: int) -> List[Dict]:
         return []
 
 def store_mcq_performance(topic: str, score: float, answers: List[Dict]) -> None:
-    """Store MCQ performance in ChromaDB."""
+    """Store MCQ performance in the local performance store (no embeddings)."""
     try:
-        doc_id = str(uuid.uuid4())
-        document = Document(
-            page_content=f"Topic: {topic}\nScore: {score}\nAnswers: {json.dumps(answers)}",
-            metadata={"type": "mcq_performance", "topic": topic, "timestamp": time.time(), "score": score},
-            id=doc_id
-        )
-        vector_store.add_documents([document])
-        logger.info(f"Stored MCQ performance for topic {topic}")
+        record_performance(topic, score, answers)
+        scheduled = record_answers(topic, answers)
+        logger.info(f"Stored MCQ performance for topic {topic} ({scheduled} questions scheduled for review)")
     except Exception as e:
         logger.error(f"Failed to store MCQ performance: {e}")
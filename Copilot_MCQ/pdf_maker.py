@@ -1,59 +1,252 @@
 import re
-import streamlit as st
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
 from fpdf import FPDF
 import base64
 
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PDF_CACHE_DIR = os.path.join(tempfile.gettempdir(), "syllabus_pdf_cache")
+PDF_CACHE_MAX_FILES = 50
+
+# "auto" embeds a Unicode TTF font when one is available, "latin1" forces the core fonts
+PDF_RENDERER = os.getenv("PDF_RENDERER", "auto")
+PDF_UNICODE_FONT = os.getenv("PDF_UNICODE_FONT", "")
+PDF_UNICODE_BOLD_FONT = os.getenv("PDF_UNICODE_BOLD_FONT", "")
+UNICODE_FONT_CANDIDATES = [
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/dejavu/DejaVuSans.ttf", "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf"),
+    ("/Library/Fonts/Arial Unicode.ttf", None),
+    ("C:\\Windows\\Fonts\\arial.ttf", "C:\\Windows\\Fonts\\arialbd.ttf"),
+]
+
 # Function to create download link for PDF
 def create_download_link(val, filename):
     b64 = base64.b64encode(val)  # val is bytes
     return f'<a href="data:application/octet-stream;base64,{b64.decode()}" download="{filename}.pdf">📥 Download PDF</a>'
 
-# Helper function to clean text for latin-1 encoding
+# Typographic characters replaced with latin-1 compatible ones
+PDF_REPLACEMENTS = {
+    '\u2013': '-',  # en-dash to hyphen
+    '\u2014': '-',  # em-dash to hyphen
+    '\u2018': "'",  # left single quote to straight quote
+    '\u2019': "'",  # right single quote to straight quote
+    '\u201c': '"',  # left double quote to straight quote
+    '\u201d': '"',  # right double quote to straight quote
+    '\u2026': '...'  # ellipsis to three dots
+}
+
+class _Latin1Table(dict):
+    """str.translate table that keeps latin-1, maps other whitespace to a space and drops the rest."""
+    def __missing__(self, codepoint):
+        if codepoint < 256:
+            value = codepoint
+        elif chr(codepoint).isspace():
+            value = ' '
+        else:
+            value = None
+        self[codepoint] = value  # Memoize so each distinct character is classified once
+        return value
+
+_LATIN1_TABLE = _Latin1Table(str.maketrans(PDF_REPLACEMENTS))
+_BOLD_SPAN = re.compile(r'\*\*(.*?)\*\*')
+
+# Helper function to clean text for latin-1 encoding in a single pass
 def clean_text_for_pdf(text):
-    # Replace common Unicode characters with latin-1 compatible ones
-    replacements = {
-        '\u2013': '-',  # en-dash to hyphen
-        '\u2014': '-',  # em-dash to hyphen
-        '\u2018': "'",  # left single quote to straight quote
-        '\u2019': "'",  # right single quote to straight quote
-        '\u201c': '"',  # left double quote to straight quote
-        '\u201d': '"',  # right double quote to straight quote
-        '\u2026': '...'  # ellipsis to three dots
-    }
-    for unicode_char, replacement in replacements.items():
-        text = text.replace(unicode_char, replacement)
-    # Optionally, remove any remaining non-latin-1 characters
-    return ''.join(c for c in text if ord(c) < 256 or c.isspace())
-
-# Function to generate PDF from JSON data with bold formatting
-def generate_pdf_from_json(json_data):
-    pdf = FPDF()
+    return text.translate(_LATIN1_TABLE)
+
+# Split **bold** markup into (is_bold, text) runs, dropping empty fragments
+def bold_runs(text):
+    return [(i % 2 == 1, part) for i, part in enumerate(_BOLD_SPAN.split(text)) if part]
+
+class Latin1Renderer:
+    """Core Arial fonts; text is normalized to latin-1 and other characters are dropped."""
+    name = "latin1"
+    family = "Arial"
+
+    def new_document(self):
+        return FPDF()
+
+    def clean(self, text):
+        return clean_text_for_pdf(text)
+
+
+class _GlyphSubset(list):
+    """Glyph subset list with set-backed membership.
+
+    FPDF 1.7 appends every written character to the font subset and later tests
+    `cid in subset` for each code point of the font, which is quadratic on long
+    documents. Appends are de-duplicated here and lookups are O(1).
+    """
+    def __init__(self, items=()):
+        super().__init__()
+        self._seen = set()
+        for item in items:
+            self.append(item)
+
+    def append(self, item):
+        if item not in self._seen:
+            self._seen.add(item)
+            super().append(item)
+
+    def __contains__(self, item):
+        return item in self._seen
+
+    def __delitem__(self, index):
+        removed = self[index]
+        super().__delitem__(index)
+        for item in (removed if isinstance(index, slice) else [removed]):
+            self._seen.discard(item)
+
+
+# Parsed TTF font entries, shared by every document built in this process
+_font_cache = {}
+_font_cache_lock = threading.Lock()
+
+def _add_cached_font(pdf, family, style, path):
+    """Register a TTF font on a document, parsing the font file only once per process."""
+    fontkey = family.lower() + style
+    if fontkey in pdf.fonts:
+        return
+    cached = _font_cache.get((fontkey, path))
+    if cached is None:
+        known_files = set(pdf.font_files)
+        pdf.add_font(family, style, path, uni=True)
+        font = pdf.fonts[fontkey]
+        cached = {
+            "font": dict(font, subset=list(font["subset"])),
+            "files": {k: dict(v) for k, v in pdf.font_files.items() if k not in known_files},
+        }
+        with _font_cache_lock:
+            _font_cache[(fontkey, path)] = cached
+        font["subset"] = _GlyphSubset(font["subset"])
+        return
+    # Glyph widths are read-only and shared; the subset list is per document
+    font = dict(cached["font"], subset=_GlyphSubset(cached["font"]["subset"]))
+    font["i"] = len(pdf.fonts) + 1
+    pdf.fonts[fontkey] = font
+    pdf.font_files.update({k: dict(v) for k, v in cached["files"].items()})
+
+
+class UnicodeRenderer:
+    """Embedded TTF fonts; FPDF subsets each font down to the glyphs actually used."""
+    name = "unicode"
+    family = "UnicodeSans"
+
+    def __init__(self, regular_path, bold_path=None):
+        self.regular_path = regular_path
+        self.bold_path = bold_path or regular_path
+
+    def new_document(self):
+        pdf = FPDF()
+        _add_cached_font(pdf, self.family, '', self.regular_path)
+        _add_cached_font(pdf, self.family, 'B', self.bold_path)
+        return pdf
+
+    def clean(self, text):
+        return text
+
+
+def find_unicode_font():
+    """Return (regular, bold) TTF paths from the environment or common system locations."""
+    if PDF_UNICODE_FONT and os.path.exists(PDF_UNICODE_FONT):
+        bold = PDF_UNICODE_BOLD_FONT if PDF_UNICODE_BOLD_FONT and os.path.exists(PDF_UNICODE_BOLD_FONT) else None
+        return PDF_UNICODE_FONT, bold
+    for regular, bold in UNICODE_FONT_CANDIDATES:
+        if os.path.exists(regular):
+            return regular, bold if bold and os.path.exists(bold) else None
+    return None, None
+
+
+def get_renderer(kind=PDF_RENDERER):
+    """Pick the PDF renderer; falls back to latin-1 when no Unicode font is available."""
+    if kind != "latin1":
+        regular, bold = find_unicode_font()
+        if regular:
+            return UnicodeRenderer(regular, bold)
+        if kind == "unicode":
+            logger.warning("No Unicode TTF font found (set PDF_UNICODE_FONT); using latin-1 output.")
+    return Latin1Renderer()
+
+# Function to lay out the PDF document from JSON data with bold formatting
+def build_pdf(json_data, renderer=None):
+    renderer = renderer or get_renderer()
+    family = renderer.family
+    pdf = renderer.new_document()
     pdf.add_page()
     pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.set_font("Arial", size=12)
+    pdf.set_font(family, size=12)
 
     for item in json_data:
-        topic = clean_text_for_pdf(item.get('topic', '').capitalize())
-        explanation = clean_text_for_pdf(item.get('explanation', ''))
+        topic = renderer.clean(item.get('topic', '').capitalize())
+        explanation = renderer.clean(item.get('explanation', ''))
 
         # Render topic in bold
-        pdf.set_font("Arial", 'B', 14)
+        pdf.set_font(family, 'B', 14)
         pdf.multi_cell(0, 10, topic)
         pdf.ln(2)
 
-        # Parse explanation for **bold** formatting
-        pdf.set_font("Arial", '', 12)
-        parts = re.split(r'\*\*(.*?)\*\*', explanation)
-        for i, part in enumerate(parts):
-            if i % 2 == 0:
-                # Non-bold text
-                pdf.set_font("Arial", '', 14)
-            else:
-                # Bold text (between ** markers)
-                pdf.set_font("Arial", 'B', 12)
-            if part:
-                pdf.write(5, part)
+        # Only switch fonts when the run style actually changes
+        current_bold = None
+        for is_bold, part in bold_runs(explanation):
+            if is_bold != current_bold:
+                if is_bold:
+                    pdf.set_font(family, 'B', 12)
+                else:
+                    pdf.set_font(family, '', 14)
+                current_bold = is_bold
+            pdf.write(5, part)
         pdf.ln(5)  # Add spacing after explanation
 
-    return pdf.output(dest="S").encode("latin-1")
+    return pdf
+
+# Function to generate PDF bytes from JSON data
+def generate_pdf_from_json(json_data, renderer=None):
+    # FPDF returns its buffer as a latin-1 str for both core and embedded fonts
+    return build_pdf(json_data, renderer).output(dest="S").encode("latin-1")
+
+# Stable cache key for a results list
+def results_hash(json_data):
+    payload = json.dumps(json_data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Function to export the PDF to a cached file and return its path
+def export_pdf(json_data, cache_dir=PDF_CACHE_DIR, renderer=None):
+    renderer = renderer or get_renderer()
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{results_hash(json_data)}-{renderer.name}.pdf")
+    if os.path.exists(path):
+        os.utime(path)  # Keep recently used exports out of pruning
+        return path
+
+    # Write to a unique temp file first so concurrent clicks (threads or processes)
+    # never see a partial file or overwrite each other's half-written output
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        build_pdf(json_data, renderer).output(tmp_path, "F")
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _prune_pdf_cache(cache_dir)
+    return path
+
+def _prune_pdf_cache(cache_dir, max_files=PDF_CACHE_MAX_FILES):
+    files = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.endswith(".pdf")]
+    if len(files) <= max_files:
+        return
+    files.sort(key=os.path.getmtime)
+    for old in files[:len(files) - max_files]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
 
@@ -0,0 +1,101 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+PERFORMANCE_DB_PATH = "./mcq_performance.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mcq_performance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    score REAL NOT NULL,
+    num_answers INTEGER NOT NULL,
+    answers TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mcq_performance_topic_ts ON mcq_performance (topic, timestamp);
+"""
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def connect(db_path: str = PERFORMANCE_DB_PATH) -> sqlite3.Connection:
+    """Open a connection to the performance store, creating the schema on first use."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    if db_path not in _initialized_paths:
+        with _init_lock:
+            if db_path not in _initialized_paths:
+                # WAL lets the Streamlit reader and quiz writers work concurrently
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                conn.commit()
+                _initialized_paths.add(db_path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def record_performances(rows: List[Tuple[str, float, List[Dict]]], timestamp: Optional[float] = None,
+                        db_path: str = PERFORMANCE_DB_PATH) -> int:
+    """Insert many (topic, score, answers) rows in a single transaction."""
+    ts = time.time() if timestamp is None else timestamp
+    payload = [
+        (topic.lower(), ts, float(score), len(answers), json.dumps(answers))
+        for topic, score, answers in rows
+    ]
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO mcq_performance (topic, timestamp, score, num_answers, answers) VALUES (?, ?, ?, ?, ?)",
+                payload
+            )
+        return len(payload)
+    finally:
+        conn.close()
+
+
+def record_performance(topic: str, score: float, answers: List[Dict],
+                       db_path: str = PERFORMANCE_DB_PATH) -> None:
+    """Insert a single quiz result."""
+    record_performances([(topic, score, answers)], db_path=db_path)
+
+
+def average_score_by_topic(db_path: str = PERFORMANCE_DB_PATH) -> Dict[str, Dict]:
+    """Return average score and attempt count per topic."""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT topic, AVG(score), COUNT(*) FROM mcq_performance GROUP BY topic ORDER BY topic"
+        ).fetchall()
+        return {topic: {"average_score": avg, "attempts": count} for topic, avg, count in rows}
+    finally:
+        conn.close()
+
+
+def score_trend(topic: str, limit: int = 20, db_path: str = PERFORMANCE_DB_PATH) -> List[Dict]:
+    """Return the most recent scores for a topic, oldest first."""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT timestamp, score FROM mcq_performance WHERE topic = ? ORDER BY timestamp DESC LIMIT ?",
+            (topic.lower(), limit)
+        ).fetchall()
+        return [{"timestamp": ts, "score": score} for ts, score in reversed(rows)]
+    finally:
+        conn.close()
+
+
+def topic_attempts(topic: str, since: float = 0.0, db_path: str = PERFORMANCE_DB_PATH) -> List[Dict]:
+    """Return full quiz attempts for a topic recorded after `since`."""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT timestamp, score, answers FROM mcq_performance WHERE topic = ? AND timestamp >= ? ORDER BY timestamp",
+            (topic.lower(), since)
+        ).fetchall()
+        return [{"timestamp": ts, "score": score, "answers": json.loads(answers)} for ts, score, answers in rows]
+    finally:
+        conn.close()
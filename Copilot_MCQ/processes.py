@@ -1,93 +1,116 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import uuid
 import time
 from fetch_data import fetch_wikipedia_explanation, fetch_duckduckgo_explanation, fetch_youtube_video
-from embedding import vector_store
-from langchain_core.documents import Document
-from history import disambiguate_topic
+from clients import get_llm, track_call
+from vector_access import add_documents
+from hybrid_retriever import index_documents
+from history import disambiguate_topic, canonicalize_topic
+from semantic_cache import lookup_explanation
+from racing import race_sources, latency_snapshot
 import logging
 from typing import Dict
 import os
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-import streamlit as st
-load_dotenv()
-
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-# Validate environment
-if not GROQ_API_KEY:
-    st.error("GROQ_API_KEY is not set.")
-    st.stop()
-
-# Initialize Groq LLM
-try:
-    llm = ChatGroq(model_name="gemma2-9b-it", api_key=GROQ_API_KEY, temperature=0.7)
-except Exception as e:
-    st.error(f"Failed to initialize Groq LLM: {e}")
-    st.stop()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Explanation sources raced per topic, in order of preference for "quality" merges
+EXPLANATION_SOURCES = [s.strip() for s in os.getenv("EXPLANATION_SOURCES", "llm,wikipedia,duckduckgo").split(",") if s.strip()]
+# "first" returns the first acceptable explanation, "quality" merges every source that answers in time
+EXPLANATION_MODE = os.getenv("EXPLANATION_MODE", "first")
+SOURCE_DEADLINES = {"llm": 20.0, "wikipedia": 15.0, "duckduckgo": 15.0}
+# In "first" mode the next source only starts after the running ones have been slow this long
+# (or have failed); the wikipedia and duckduckgo fetchers call the LLM too, so each one costs a call
+EXPLANATION_HEDGE_SECONDS = float(os.getenv("EXPLANATION_HEDGE_SECONDS", "8"))
 
-def process_syllabus(topics: List[str]) -> List[Dict]:
-    """Process syllabus topics for explanations and YouTube links."""
-    results = []
-    
-    for topic in topics:
-        # topic = disambiguate_topic(topic)
-        
-        # if not explanation:
-        fallback_prompt = f"""
+
+def llm_explanation(topic: str) -> str:
+    """Explain a topic directly with the LLM."""
+    prompt = f"""
                     You are an academic assistant.
 
                     Provide a clear and age-appropriate explanation about the topic: '{topic}'.
                     Use 150-200 words. Format as bullet points or structured explanation depending on the nature of the topic.
                     """
-        try:
-            response = llm.invoke(fallback_prompt)
-            explanation = response.content.strip()
-        except Exception as e:
-            logger.error(f"LLM fallback failed for topic '{topic}': {e}")
-            explanation = f"⚠️ Sorry, we couldn't find an explanation for '{topic}' right now."
-        if not explanation:
-            explanation = fetch_wikipedia_explanation(topic)
-        if not explanation:
-            explanation = fetch_duckduckgo_explanation(topic)
-
-        video_data = fetch_youtube_video(topic)
-        if not video_data.get("url"):
-            logger.info(f"No YouTube video found for topic '{topic}'.")
-
-        doc_id = str(uuid.uuid4())
-        document = Document(
-            page_content=f"Topic: {topic}\nExplanation: {explanation}",
-            metadata={
-                "type": "topic",
-                "topic": topic,
-                "video_url": video_data.get("url", ""),
-                "video_title": video_data.get("title", "")
-            },
-            id=doc_id
-        )
-        vector_store.add_documents([document])
-
-        results.append({
+    with track_call("llm", "processes.llm_explanation", payload=prompt) as span:
+        response = span.record_response(get_llm().invoke(prompt))
+    return response.content.strip()
+
+
+EXPLANATION_FETCHERS = {
+    "llm": llm_explanation,
+    "wikipedia": fetch_wikipedia_explanation,
+    "duckduckgo": fetch_duckduckgo_explanation,
+}
+
+
+# Pause between uncached topics to stay within API rate limits
+TOPIC_DELAY_SECONDS = 2
+
+
+def process_topic(topic: str) -> Tuple[Dict, bool]:
+    """Explain one topic, store it in Chroma and return (result, served_from_cache)."""
+    from langchain_core.documents import Document
+    # topic = disambiguate_topic(topic)
+
+    cached = lookup_explanation(topic)
+    if cached:
+        return {key: cached[key] for key in ("topic", "explanation", "video_url", "video_title")}, True
+
+    sources = {name: EXPLANATION_FETCHERS[name] for name in EXPLANATION_SOURCES if name in EXPLANATION_FETCHERS}
+    explanation, used_sources = race_sources(topic, sources, SOURCE_DEADLINES, mode=EXPLANATION_MODE,
+                                             hedge_delay=EXPLANATION_HEDGE_SECONDS)
+    if explanation:
+        logger.info(f"Explanation for '{topic}' from {', '.join(used_sources)}")
+    else:
+        logger.error(f"All explanation sources failed for topic '{topic}'")
+        explanation = f"⚠️ Sorry, we couldn't find an explanation for '{topic}' right now."
+
+    video_data = fetch_youtube_video(topic)
+    if not video_data.get("url"):
+        logger.info(f"No YouTube video found for topic '{topic}'.")
+
+    doc_id = str(uuid.uuid4())
+    document = Document(
+        page_content=f"Topic: {topic}\nExplanation: {explanation}",
+        metadata={
+            "type": "topic",
             "topic": topic,
-            "explanation": explanation,
-            "video_url": video_data.get("url", "No video found"),
-            "video_title": video_data.get("title", "Unknown")
-        })
+            "canonical_topic": canonicalize_topic(topic),
+            "video_url": video_data.get("url", ""),
+            "video_title": video_data.get("title", "")
+        },
+        id=doc_id
+    )
+    index_documents([document], add_documents([document]))
+
+    return {
+        "topic": topic,
+        "explanation": explanation,
+        "video_url": video_data.get("url", "No video found"),
+        "video_title": video_data.get("title", "Unknown")
+    }, False
 
-        time.sleep(2)  # Optional: reduce to 1-2s if API limits allow
 
+def process_syllabus(topics: List[str]) -> List[Dict]:
+    """Process syllabus topics for explanations and YouTube links."""
+    results = []
+
+    for topic in topics:
+        result, from_cache = process_topic(topic)
+        results.append(result)
+        if not from_cache:
+            time.sleep(TOPIC_DELAY_SECONDS)  # Optional: reduce to 1-2s if API limits allow
+
+    logger.info(f"Explanation source latencies: {latency_snapshot()}")
     return results
 
 
 def process_youtube_video(video_url: str, title: str = "Unknown") -> Dict:
     """Process a YouTube video for transcript and summary."""
+    from langchain_core.documents import Document
     try:
         result = process_video(video_url, title)
         if result["stored"]:
@@ -97,7 +120,7 @@ def process_youtube_video(video_url: str, title: str = "Unknown") -> Dict:
                 metadata={"type": "video", "topic": title.lower(), "video_url": video_url, "video_title": title},
                 id=doc_id
             )
-            vector_store.add_documents([document])
+            index_documents([document], add_documents([document]))
         return result
     except Exception as e:
         logger.error(f"Error processing YouTube video {video_url}: {e}")
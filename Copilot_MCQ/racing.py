@@ -0,0 +1,154 @@
+import bisect
+import threading
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0)
+DEFAULT_DEADLINE = 20.0
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="source-race")
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram with per-outcome counts."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.outcomes: Dict[str, int] = {}
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, outcome: str = "ok") -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            labels = [f"<={bound:g}s" for bound in self.buckets] + [f">{self.buckets[-1]:g}s"]
+            return {
+                "count": self.count,
+                "mean_seconds": self.total / self.count if self.count else 0.0,
+                "buckets": dict(zip(labels, self.counts)),
+                "outcomes": dict(self.outcomes),
+            }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def record_latency(source: str, seconds: float, outcome: str) -> None:
+    """Record one call of a source in its latency histogram."""
+    with _histograms_lock:
+        histogram = _histograms.setdefault(source, LatencyHistogram())
+    histogram.observe(seconds, outcome)
+
+
+def latency_snapshot() -> Dict[str, Dict]:
+    """Latency histograms per source, for deciding which sources to reorder or drop."""
+    with _histograms_lock:
+        histograms = dict(_histograms)
+    return {source: histogram.snapshot() for source, histogram in histograms.items()}
+
+
+def is_acceptable_explanation(text: Optional[str]) -> bool:
+    """An explanation is usable when it is non-empty and not one of our warning placeholders."""
+    return bool(text and text.strip() and not text.startswith("⚠️"))
+
+
+def _timed_call(source: str, fetch: Callable[[str], Optional[str]], topic: str,
+                is_acceptable: Callable[[Optional[str]], bool]) -> Optional[str]:
+    start = time.perf_counter()
+    try:
+        result = fetch(topic)
+    except Exception:
+        record_latency(source, time.perf_counter() - start, "error")
+        raise
+    record_latency(source, time.perf_counter() - start, "ok" if is_acceptable(result) else "rejected")
+    return result
+
+
+def race_sources(topic: str, sources: Dict[str, Callable[[str], Optional[str]]],
+                 deadlines: Optional[Dict[str, float]] = None, mode: str = "first",
+                 is_acceptable: Callable[[Optional[str]], bool] = is_acceptable_explanation,
+                 hedge_delay: Optional[float] = None) -> Tuple[Optional[str], List[str]]:
+    """Query explanation sources concurrently, each with its own deadline.
+
+    In "first" mode the first acceptable result wins. With `hedge_delay` set,
+    sources start one at a time in configured order: the next one only starts
+    once the running ones have been slow for `hedge_delay` seconds, or as soon
+    as one fails, so a fast primary source means the backups are never called.
+    In "quality" mode every source starts at once and gets until its deadline,
+    and the acceptable results are merged in configured order. Calls already
+    running cannot be interrupted; they finish in the background and are
+    discarded. Returns (explanation, names of the sources used).
+    """
+    deadlines = deadlines or {}
+    waiting = list(sources.items())
+    hedged = mode != "quality" and hedge_delay is not None
+    pending = {}
+
+    def launch() -> None:
+        name, fetch = waiting.pop(0)
+        future = _executor.submit(_timed_call, name, fetch, topic, is_acceptable)
+        pending[future] = (name, time.monotonic() + deadlines.get(name, DEFAULT_DEADLINE))
+
+    next_launch = time.monotonic()
+    accepted: Dict[str, str] = {}
+    try:
+        while pending or waiting:
+            now = time.monotonic()
+            if waiting and (not hedged or not pending or now >= next_launch):
+                launch()
+                next_launch = now + (hedge_delay or 0.0)
+                continue
+            for future, (name, deadline) in list(pending.items()):
+                if deadline <= now and not future.done():
+                    # Its real latency is still recorded when the call eventually returns
+                    logger.info(f"Source '{name}' missed its deadline for topic '{topic}'")
+                    future.cancel()
+                    del pending[future]
+            if not pending:
+                continue
+
+            wake = min(deadline for _, deadline in pending.values())
+            if waiting:
+                wake = min(wake, next_launch)
+            done, _ = wait(list(pending), timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Source '{name}' failed for topic '{topic}': {e}")
+                    next_launch = now
+                    continue
+                if is_acceptable(result):
+                    accepted[name] = result.strip()
+                    if mode != "quality":
+                        return accepted[name], [name]
+                else:
+                    next_launch = now
+    finally:
+        for future in pending:
+            future.cancel()
+
+    if not accepted:
+        return None, []
+    used = [name for name in sources if name in accepted]
+    if len(used) == 1:
+        return accepted[used[0]], used
+    merged = "\n\n".join(f"**From {name}:**\n{accepted[name]}" for name in used)
+    return merged, used
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import threading
+import time
+import logging
+from typing import Dict, List, Optional
+
+from performance_store import PERFORMANCE_DB_PATH, connect as connect_performance_store
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+DEFAULT_EASINESS = 2.5
+MIN_EASINESS = 1.3
+CORRECT_QUALITY = 4
+INCORRECT_QUALITY = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_items (
+    question_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    question TEXT NOT NULL,
+    easiness REAL NOT NULL,
+    interval_days REAL NOT NULL,
+    repetitions INTEGER NOT NULL,
+    due REAL NOT NULL,
+    last_reviewed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_review_items_topic_due ON review_items (topic, due);
+"""
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def _connect(db_path: str):
+    conn = connect_performance_store(db_path)
+    if db_path not in _initialized_paths:
+        with _init_lock:
+            if db_path not in _initialized_paths:
+                conn.executescript(_SCHEMA)
+                conn.commit()
+                _initialized_paths.add(db_path)
+    return conn
+
+
+def question_id(topic: str, question: str) -> str:
+    """Stable id for a question within a topic."""
+    return hashlib.sha1(f"{topic.lower()}\x00{question.strip()}".encode("utf-8")).hexdigest()
+
+
+def sm2_update(easiness: float, interval_days: float, repetitions: int, quality: int):
+    """Apply one SM-2 review and return the new (easiness, interval_days, repetitions)."""
+    if quality >= 3:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * easiness)
+        repetitions += 1
+    else:
+        repetitions = 0
+        interval_days = 1
+    easiness = easiness + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return max(MIN_EASINESS, easiness), interval_days, repetitions
+
+
+def record_answers(topic: str, answers: List[Dict], now: Optional[float] = None,
+                   db_path: str = PERFORMANCE_DB_PATH) -> int:
+    """Update per-question review state from quiz answers. Returns the number of items scheduled."""
+    now = time.time() if now is None else now
+    topic = topic.lower()
+    # Only answers that carry their options can be replayed in a review session
+    playable = [a for a in answers if a.get("options")]
+    if not playable:
+        return 0
+
+    ids = [question_id(topic, a["question"]) for a in playable]
+    conn = _connect(db_path)
+    try:
+        states = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                f"SELECT question_id, easiness, interval_days, repetitions FROM review_items WHERE question_id IN ({placeholders})",
+                chunk
+            ):
+                states[row[0]] = row[1:]
+
+        rows = {}
+        for qid, answer in zip(ids, playable):
+            easiness, interval_days, repetitions = states.get(qid, (DEFAULT_EASINESS, 0, 0))
+            quality = CORRECT_QUALITY if answer.get("is_correct") else INCORRECT_QUALITY
+            easiness, interval_days, repetitions = sm2_update(easiness, interval_days, repetitions, quality)
+            states[qid] = (easiness, interval_days, repetitions)
+            question = {
+                "question": answer["question"],
+                "options": answer["options"],
+                "correct_answer": answer["correct"],
+                "explanation": answer.get("explanation", "")
+            }
+            rows[qid] = (qid, topic, json.dumps(question), easiness, interval_days, repetitions,
+                         now + interval_days * SECONDS_PER_DAY, now)
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO review_items "
+                "(question_id, topic, question, easiness, interval_days, repetitions, due, last_reviewed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                list(rows.values())
+            )
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def due_questions(topic: str, limit: int = 10, now: Optional[float] = None,
+                  db_path: str = PERFORMANCE_DB_PATH) -> List[Dict]:
+    """Return up to `limit` due questions for a topic, most overdue first, in generate_mcqs format."""
+    now = time.time() if now is None else now
+    conn = _connect(db_path)
+    try:
+        # Served by the (topic, due) index: a range seek, not a history scan
+        rows = conn.execute(
+            "SELECT question FROM review_items WHERE topic = ? AND due <= ? ORDER BY due LIMIT ?",
+            (topic.lower(), now, limit)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    except Exception as e:
+        logger.error(f"Failed to load due questions for {topic}: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def due_count(topic: str, now: Optional[float] = None, db_path: str = PERFORMANCE_DB_PATH) -> int:
+    """Number of questions currently due for a topic."""
+    now = time.time() if now is None else now
+    conn = _connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT COUNT(*) FROM review_items WHERE topic = ? AND due <= ?",
+            (topic.lower(), now)
+        ).fetchone()[0]
+    except Exception as e:
+        logger.error(f"Failed to count due questions for {topic}: {e}")
+        return 0
+    finally:
+        conn.close()
@@ -0,0 +1,86 @@
+import os
+import logging
+from typing import Dict, Optional
+
+from clients import get_vector_store, track_call
+from vector_access import read_lock, similarity_search_with_relevance_scores
+from history import canonicalize_topic
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Minimum relevance (0-1) for a stored topic to count as the same topic. On ada-002 embeddings
+# related-but-different topics ("Mitosis"/"Meiosis", "TCP"/"UDP") clear it too, so a hit also
+# needs the same canonical words (see _same_topic).
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+
+def _explanation_from_content(page_content: str) -> Optional[str]:
+    _, sep, explanation = page_content.partition("\nExplanation: ")
+    explanation = explanation.strip()
+    if not sep or not explanation or explanation.startswith("⚠️"):
+        return None
+    return explanation
+
+
+def _same_topic(canonical: str, metadata: Dict) -> bool:
+    """
+    Whether both canonical topics have the same words. Broader and narrower topics
+    ("World War" / "World War II", "TCP" / "TCP congestion control") do not match.
+    """
+    cached = metadata.get("canonical_topic") or canonicalize_topic(metadata.get("topic", ""))
+    ours = set(canonical.split())
+    return bool(ours) and ours == set(cached.split())
+
+
+def _cached_result(topic: str, page_content: str, metadata: Dict) -> Optional[Dict]:
+    explanation = _explanation_from_content(page_content)
+    if not explanation:
+        return None
+    return {
+        "topic": topic,
+        "explanation": explanation,
+        "video_url": metadata.get("video_url") or "No video found",
+        "video_title": metadata.get("video_title") or "Unknown",
+        "cached_from": metadata.get("topic", "")
+    }
+
+
+def lookup_explanation(topic: str) -> Optional[Dict]:
+    """Return a stored explanation for the same or a near-duplicate topic, or None."""
+    with track_call("vector_store", "semantic_cache.lookup", payload=topic) as span:
+        result = _lookup(topic)
+        if result:
+            span.cache_hit()
+        else:
+            span.cache_miss()
+    return result
+
+
+def _lookup(topic: str) -> Optional[Dict]:
+    canonical = canonicalize_topic(topic)
+    try:
+        vector_store = get_vector_store()
+        # Exact canonical match: a metadata lookup, no embedding call
+        with read_lock():
+            exact = vector_store.get(
+                where={"$and": [{"type": "topic"}, {"canonical_topic": canonical}]},
+                limit=1
+            )
+        for content, metadata in zip(exact.get("documents", []), exact.get("metadatas", [])):
+            result = _cached_result(topic, content, metadata)
+            if result:
+                logger.info(f"Semantic cache hit for '{topic}' (canonical '{canonical}')")
+                return result
+
+        matches = similarity_search_with_relevance_scores(f"Topic: {canonical}", k=1, filter={"type": "topic"})
+        for document, score in matches:
+            if score >= SEMANTIC_CACHE_THRESHOLD and _same_topic(canonical, document.metadata):
+                result = _cached_result(topic, document.page_content, document.metadata)
+                if result:
+                    logger.info(f"Semantic cache hit for '{topic}' via '{result['cached_from']}' (score {score:.3f})")
+                    return result
+    except Exception as e:
+        logger.warning(f"Semantic cache lookup failed for '{topic}': {e}")
+    return None
@@ -0,0 +1,154 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from clients import record_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SOURCE_CACHE_DB_PATH = "./source_cache.db"
+
+# Seconds a positive result stays fresh, per source
+SOURCE_TTLS = {
+    "wikipedia": 7 * 86400,
+    "duckduckgo": 86400,
+    "youtube": 3 * 86400,
+}
+DEFAULT_TTL = 86400
+# Misses are cached too, but for less time so new pages are picked up
+NEGATIVE_TTL = 3600
+# Serve expired entries instantly (up to MAX_STALE_SECONDS past their TTL) while refreshing in the background
+STALE_WHILE_REVALIDATE = os.getenv("SOURCE_CACHE_SWR", "1") == "1"
+MAX_STALE_SECONDS = 30 * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_cache (
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    negative INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (source, key)
+);
+"""
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="source-refresh")
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
+
+def normalize_topic(topic: str) -> str:
+    """Cache key for a topic: lowercased with collapsed whitespace."""
+    return " ".join(topic.lower().split())
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30)
+    if db_path not in _initialized_paths:
+        with _init_lock:
+            if db_path not in _initialized_paths:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                conn.commit()
+                _initialized_paths.add(db_path)
+    return conn
+
+
+def cache_get(source: str, key: str, db_path: str = SOURCE_CACHE_DB_PATH) -> Optional[Tuple[Any, bool, float]]:
+    """Return (value, negative, fetched_at) for a cached entry, or None."""
+    conn = _connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT value, negative, fetched_at FROM source_cache WHERE source = ? AND key = ?",
+            (source, key)
+        ).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return json.loads(row[0]), bool(row[1]), row[2]
+
+
+def cache_put(source: str, key: str, value: Any, negative: bool, db_path: str = SOURCE_CACHE_DB_PATH) -> None:
+    """Insert or replace a cached entry."""
+    conn = _connect(db_path)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO source_cache (source, key, value, negative, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (source, key, json.dumps(value, ensure_ascii=False), int(negative), time.time())
+            )
+    finally:
+        conn.close()
+
+
+def _fetch_and_store(source, key, topic, fetch, is_negative):
+    value = fetch(topic)
+    try:
+        cache_put(source, key, value, is_negative(value))
+    except Exception as e:
+        logger.warning(f"Failed to cache {source} result for '{key}': {e}")
+    return value
+
+
+def _refresh(source, key, topic, fetch, is_negative):
+    try:
+        _fetch_and_store(source, key, topic, fetch, is_negative)
+        logger.info(f"Refreshed stale {source} entry for '{key}'")
+    except Exception as e:
+        logger.warning(f"Background refresh of {source} for '{key}' failed: {e}")
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard((source, key))
+
+
+def _refresh_in_background(source, key, topic, fetch, is_negative):
+    with _in_flight_lock:
+        if (source, key) in _in_flight:
+            return
+        _in_flight.add((source, key))
+    _refresh_executor.submit(_refresh, source, key, topic, fetch, is_negative)
+
+
+def cached_source(source: str, is_negative: Callable[[Any], bool] = lambda value: not value):
+    """Cache a topic fetcher on disk.
+
+    Results the fetcher returns (including misses, as judged by `is_negative`)
+    are cached; exceptions are not, so transient failures are retried.
+    """
+    def decorator(fetch):
+        @functools.wraps(fetch)
+        def wrapper(topic: str):
+            key = normalize_topic(topic)
+            try:
+                entry = cache_get(source, key)
+            except Exception as e:
+                logger.warning(f"Source cache read failed for {source} '{key}': {e}")
+                entry = None
+
+            if entry is not None:
+                value, negative, fetched_at = entry
+                ttl = NEGATIVE_TTL if negative else SOURCE_TTLS.get(source, DEFAULT_TTL)
+                age = time.time() - fetched_at
+                if age < ttl:
+                    record_cache(f"source_cache.{source}", hit=True)
+                    return value
+                if STALE_WHILE_REVALIDATE and not negative and age < ttl + MAX_STALE_SECONDS:
+                    _refresh_in_background(source, key, topic, fetch, is_negative)
+                    record_cache(f"source_cache.{source}", hit=True)
+                    return value
+
+            record_cache(f"source_cache.{source}", hit=False)
+            return _fetch_and_store(source, key, topic, fetch, is_negative)
+        return wrapper
+    return decorator
@@ -0,0 +1,170 @@
+"""Multi-process access to the shared Chroma store.
+
+Two deployments are supported:
+
+* ``VECTOR_STORE_MODE=server``: one Chroma server process owns PERSIST_DIRECTORY
+  and every Streamlit/worker process is a client. ``python vector_access.py``
+  starts that server locally as a stand-in for a hosted one. This is the mode to
+  use when several processes must see each other's writes immediately.
+* ``VECTOR_STORE_MODE=local`` (default): each process opens the directory
+  in-process. Writers are serialized with an exclusive file lock and readers take
+  a shared lock, so no reader observes a half-applied batch. Chroma keeps its
+  HNSW index in memory per process, so a local read that finds the index stale
+  reopens the store once to pick up segments written by other processes.
+
+Embeddings are computed before the lock is taken, so a slow embedding request
+never holds up other readers and writers; the lock only covers Chroma itself.
+"""
+import contextlib
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+import logging
+from typing import Iterator, List, Tuple
+
+from clients import discard, get_chroma_client, get_vector_store, track_call
+from embedding import CHROMA_HOST, CHROMA_PORT, COLLECTION_NAME, PERSIST_DIRECTORY, VECTOR_STORE_MODE
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LOCK_FILENAME = ".write.lock"
+# Errors chromadb raises when this process's in-memory index is behind segments written elsewhere
+STALE_INDEX_MARKERS = ("Nothing found on disk", "Error finding id", "Error loading hnsw index")
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(handle, exclusive: bool) -> None:
+        # msvcrt has no shared locks; readers and writers both lock exclusively
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(handle) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(handle, exclusive: bool) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _unlock_file(handle) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def _directory_lock(exclusive: bool, directory: str = PERSIST_DIRECTORY) -> Iterator[None]:
+    if VECTOR_STORE_MODE == "server":
+        # The server serializes access itself
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK_FILENAME), "a+") as handle:
+        _lock_file(handle, exclusive)
+        try:
+            yield
+        finally:
+            _unlock_file(handle)
+
+
+def write_lock(directory: str = PERSIST_DIRECTORY):
+    """Exclusive inter-process lock for writes to the local store."""
+    return _directory_lock(True, directory)
+
+
+def read_lock(directory: str = PERSIST_DIRECTORY):
+    """Shared inter-process lock for reads from the local store."""
+    return _directory_lock(False, directory)
+
+
+def add_documents(documents: List) -> List[str]:
+    """Embed documents, then add them to the shared store under the writer lock."""
+    texts = [document.page_content for document in documents]
+    ids = [getattr(document, "id", None) or str(uuid.uuid4()) for document in documents]
+    with track_call("embedding", "chroma.embed_documents", payload=texts) as span:
+        embeddings = span.record_response(get_vector_store().embeddings.embed_documents(texts))
+    with track_call("vector_store", "chroma.add_documents", payload=documents), write_lock():
+        get_chroma_client().get_or_create_collection(COLLECTION_NAME).upsert(
+            ids=ids, embeddings=embeddings, documents=texts,
+            metadatas=[document.metadata or None for document in documents]
+        )
+    return ids
+
+
+def reopen_store() -> None:
+    """Forget the cached Chroma client so the next access reloads the directory."""
+    if VECTOR_STORE_MODE != "server":
+        # chromadb caches one system per path; a new Chroma object alone keeps the stale index
+        from chromadb.api.client import SharedSystemClient
+        SharedSystemClient.clear_system_cache()
+    discard("vector_store")
+    discard("chroma_client")
+
+
+def is_stale_index_error(error: Exception) -> bool:
+    """Whether a local read failed because another process wrote segments this one has not loaded."""
+    return VECTOR_STORE_MODE != "server" and any(marker in str(error) for marker in STALE_INDEX_MARKERS)
+
+
+def embed_query(query: str) -> List[float]:
+    """Embedding for a search query; call it outside the store locks."""
+    with track_call("embedding", "chroma.embed_query", payload=query):
+        return get_vector_store().embeddings.embed_query(query)
+
+
+def _search_by_vector(embedding: List[float], k: int, **kwargs) -> List[Tuple]:
+    with track_call("vector_store", "chroma.similarity_search") as span, read_lock():
+        try:
+            return get_vector_store().similarity_search_by_vector_with_relevance_scores(embedding, k=k, **kwargs)
+        except Exception as e:
+            if not is_stale_index_error(e):
+                raise
+            logger.info(f"Reopening local vector store after stale index read: {e}")
+            reopen_store()
+            span.add_retry()
+            return get_vector_store().similarity_search_by_vector_with_relevance_scores(embedding, k=k, **kwargs)
+
+
+def similarity_search(query: str, k: int = 4, **kwargs) -> List:
+    """Similarity search; only the Chroma query runs under the reader lock."""
+    return [document for document, _ in _search_by_vector(embed_query(query), k, **kwargs)]
+
+
+def similarity_search_with_relevance_scores(query: str, k: int = 4, **kwargs) -> List[Tuple]:
+    """(document, relevance in 0-1) pairs, like the Chroma method of the same name."""
+    # The collection uses Chroma's default l2 space over unit-length embeddings, as langchain assumes
+    return [(document, 1.0 - distance / math.sqrt(2)) for document, distance
+            in _search_by_vector(embed_query(query), k, **kwargs)]
+
+
+def start_local_server(path: str = PERSIST_DIRECTORY, host: str = CHROMA_HOST, port: int = CHROMA_PORT,
+                       wait_seconds: float = 30.0) -> subprocess.Popen:
+    """Start a Chroma server over `path` (the single writer) and wait until it answers."""
+    import chromadb
+    os.makedirs(path, exist_ok=True)
+    process = subprocess.Popen(["chroma", "run", "--path", path, "--host", host, "--port", str(port)])
+    deadline = time.monotonic() + wait_seconds
+    while time.monotonic() < deadline:
+        try:
+            chromadb.HttpClient(host=host, port=port).heartbeat()
+            logger.info(f"Chroma server ready on {host}:{port} over {path}")
+            return process
+        except Exception:
+            if process.poll() is not None:
+                raise RuntimeError(f"Chroma server exited with code {process.returncode}")
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"Chroma server did not start within {wait_seconds:g}s")
+
+
+if __name__ == "__main__":
+    server = start_local_server()
+    try:
+        sys.exit(server.wait())
+    except KeyboardInterrupt:
+        server.terminate()
@@ -1,31 +1,32 @@
 import streamlit as st
 import json
 import logging
+import time
 from typing import Dict
 import os
-from langchain_groq import ChatGroq
-from Copilot_MCQ.processes import process_syllabus
+from Copilot_MCQ.clients import load_env
+from Copilot_MCQ.jobs import ensure_workers, get_job, submit_job
 from Copilot_MCQ.history import fetch_topic_history
-from Copilot_MCQ.embedding import vector_store
-from Copilot_MCQ.pdf_maker import create_download_link, generate_pdf_from_json
+from Copilot_MCQ.pdf_maker import export_pdf
 from Copilot_MCQ.mcq import generate_mcqs, store_mcq_performance
+from Copilot_MCQ.review_scheduler import due_questions, due_count
+from common.instrumentation import render_debug_panel, start_metrics_server
+load_env()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-# Validate environment
+# Validate environment; clients themselves are built lazily on first use
 if not GROQ_API_KEY:
     st.error("GROQ_API_KEY is not set.")
     st.stop()
 
-# Initialize Groq LLM
-try:
-    llm = ChatGroq(model_name="gemma2-9b-it", api_key=GROQ_API_KEY, temperature=0.7)
-except Exception as e:
-    st.error(f"Failed to initialize Groq LLM: {e}")
-    st.stop()
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+JOB_POLL_SECONDS = 1.5
+
+# Background workers survive reruns and resume jobs interrupted by a restart
+ensure_workers()
+
 # Initialize session state
 if 'results' not in st.session_state:
     st.session_state.results = None
@@ -41,6 +42,10 @@ if 'quiz_started' not in st.session_state:
     st.session_state.quiz_started = False
 if 'last_submitted' not in st.session_state:
     st.session_state.last_submitted = None
+if 'pdf_path' not in st.session_state:
+    st.session_state.pdf_path = None
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = None
 
 st.title("Academic Copilot")
 
@@ -57,13 +62,33 @@ if option == "Academic Copilot":
     if st.button("Process Topics"):
         if syllabus_input:
             topics = [topic.strip() for topic in syllabus_input.split(",")]
-            with st.spinner("Processing topics..."):
-                st.session_state.results = process_syllabus(topics)
-                with open("syllabus_results.json", "w", encoding="utf-8") as f:
-                    json.dump(st.session_state.results, f, indent=4, ensure_ascii=False)
+            # Processing runs in a background worker; finished topics stream in below
+            st.session_state.job_id = submit_job(topics)
+            st.session_state.results = None
+            st.session_state.pdf_path = None
         else:
             st.warning("Please enter at least one topic.")
 
+    job_running = False
+    if st.session_state.job_id:
+        job = get_job(st.session_state.job_id)
+        if job is None:
+            st.session_state.job_id = None
+        else:
+            st.session_state.results = job["results"]
+            job_running = job["status"] in ("pending", "running")
+            if job_running:
+                st.progress(job["done"] / max(job["total"], 1),
+                            text=f"Processed {job['done']} of {job['total']} topics...")
+            else:
+                st.session_state.job_id = None
+                with open("syllabus_results.json", "w", encoding="utf-8") as f:
+                    json.dump(st.session_state.results, f, indent=4, ensure_ascii=False)
+            if job["status"] == "failed":
+                st.error("None of the topics could be processed. Please try again later.")
+            for topic in job["failed_topics"]:
+                st.warning(f"Could not process '{topic}'.")
+
     if st.session_state.results:
         for result in st.session_state.results:
             st.subheader(f"Topic: {result['topic'].capitalize()}")
@@ -79,13 +104,26 @@ if option == "Academic Copilot":
     if st.button("Generate PDF"):
         if st.session_state.results:
             with st.spinner("Generating PDF..."):
-                pdf_bytes = generate_pdf_from_json(st.session_state.results)
-                html_link = create_download_link(pdf_bytes, "syllabus_explanations")
+                # Cached by results hash, so repeated clicks reuse the same file
+                st.session_state.pdf_path = export_pdf(st.session_state.results)
                 st.success("✅ PDF generated successfully!")
-                st.markdown(html_link, unsafe_allow_html=True)
         else:
             st.error("❌ No results available. Please process topics first.")
 
+    if st.session_state.pdf_path and os.path.exists(st.session_state.pdf_path):
+        with open(st.session_state.pdf_path, "rb") as pdf_file:
+            st.download_button(
+                label="📥 Download PDF",
+                data=pdf_file,
+                file_name="syllabus_explanations.pdf",
+                mime="application/pdf"
+            )
+
+    if job_running:
+        # Poll after the page has rendered; any widget interaction interrupts the wait
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
 elif option == "MCQ Practice":
     st.header("MCQ Practice")
     topics = fetch_topic_history()
@@ -108,6 +146,16 @@ elif option == "MCQ Practice":
                     st.error("Failed to generate MCQs. Please try another topic or ensure content is stored.")
                     st.session_state.quiz_started = False
 
+        due = due_count(selected_topic)
+        if st.button(f"Review Due Questions ({due})", key="start_review", disabled=due == 0):
+            # Replays questions from the local question bank; no LLM call needed
+            st.session_state.mcqs = due_questions(selected_topic, num_questions)
+            st.session_state.current_question = 0
+            st.session_state.user_answers = []
+            st.session_state.score = 0
+            st.session_state.quiz_started = bool(st.session_state.mcqs)
+            st.session_state.last_submitted = None
+
         if st.session_state.quiz_started and st.session_state.mcqs:
             current_q = st.session_state.current_question
             if current_q < len(st.session_state.mcqs):
@@ -126,6 +174,7 @@ elif option == "MCQ Practice":
                         is_correct = selected_option == question["correct_answer"]
                         st.session_state.user_answers.append({
                             "question": question["question"],
+                            "options": question["options"],
                             "selected": selected_option,
                             "correct": question["correct_answer"],
                             "is_correct": is_correct,
@@ -165,4 +214,8 @@ elif option == "MCQ Practice":
                     st.session_state.last_submitted = None
 
 st.sidebar.markdown("---")
-st.sidebar.info("Built with Groq, Wikipedia, DuckDuckGo, and ChromaDB.")
\ No newline at end of file
+st.sidebar.info("Built with Groq, Wikipedia, DuckDuckGo, and ChromaDB.")
+
+# Opt-in via INSTRUMENTATION_METRICS_PORT / INSTRUMENTATION_DEBUG_PANEL
+start_metrics_server()
+render_debug_panel()
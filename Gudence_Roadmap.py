@@ -8,6 +8,7 @@ from datetime import datetime
 # Import the career_guidance_system
 from Career_Guidence.career_guidance_system import CareerGuidanceSystem
 from Career_Guidence.career_chatbot import display_chat_interface
+from common.instrumentation import render_debug_panel, start_metrics_server
 
 # Set page config
 st.set_page_config(
@@ -652,4 +653,8 @@ with st.expander("ℹ️ About this AI Career Guidance System"):
     5. **Chat Assistant**: Ask specific questions about your selected career path
     
     For the best experience, enter your API key in the sidebar.
-    """) 
\ No newline at end of file
+    """) 
+
+# Opt-in via INSTRUMENTATION_METRICS_PORT / INSTRUMENTATION_DEBUG_PANEL
+start_metrics_server()
+render_debug_panel()
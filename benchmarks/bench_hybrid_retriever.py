@@ -0,0 +1,53 @@
+"""Lexical (BM25) lookup latency of the in-memory index used by hybrid retrieval.
+
+Builds an index over synthetic topic documents and times searches; no Chroma or
+network access is needed.
+Usage: python benchmarks/bench_hybrid_retriever.py [--docs 10000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Copilot_MCQ"))
+
+from hybrid_retriever import LexicalIndex  # noqa: E402
+
+WORDS = [
+    "newton", "law", "motion", "force", "energy", "cell", "photosynthesis", "enzyme", "atom", "bond",
+    "equation", "integral", "derivative", "matrix", "vector", "protein", "gene", "evolution", "circuit",
+    "voltage", "current", "market", "demand", "supply", "revolution", "empire", "poem", "grammar", "acid",
+    "base", "reaction", "gravity", "orbit", "planet", "algorithm", "graph", "tree", "probability", "theorem",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = WORDS + [f"term{i}" for i in range(5000)]
+    index = LexicalIndex()
+    start = time.perf_counter()
+    for n in range(args.docs):
+        body = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(60, 250)))
+        index.add(f"doc-{n}", f"Topic: {rng.choice(WORDS)} {rng.choice(WORDS)}\nExplanation: {body}")
+    build = time.perf_counter() - start
+
+    queries = [f"Topic: {rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(args.queries)]
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k=10)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f"index: {args.docs} docs built in {build:.2f}s")
+    print(f"search: p50 {latencies[len(latencies) // 2] * 1e6:.0f} us, "
+          f"p95 {latencies[int(len(latencies) * 0.95)] * 1e6:.0f} us over {len(latencies)} queries")
+
+
+if __name__ == "__main__":
+    main()
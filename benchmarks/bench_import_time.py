@@ -0,0 +1,68 @@
+"""Measure cold import time of the Copilot_MCQ modules with `python -X importtime`.
+
+Exits non-zero when a module exceeds the budget, so it can guard startup cost.
+Usage: python benchmarks/bench_import_time.py [--budget-ms 300] [module ...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPILOT_DIR = os.path.join(REPO_ROOT, "Copilot_MCQ")
+DEFAULT_MODULES = [
+    "clients", "embedding", "history", "fetch_data", "processes", "mcq",
+    "pdf_maker", "performance_store", "review_scheduler", "source_cache", "semantic_cache", "racing", "vector_access", "hybrid_retriever",
+]
+
+
+def import_time(module: str):
+    """Return (cumulative microseconds for `module`, slowest dependency lines)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=COPILOT_DIR, capture_output=True, text=True,
+        # Shared helpers such as common.instrumentation live at the repository root
+        env=dict(os.environ, PYTHONPATH=REPO_ROOT)
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else f"import {module} failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    total = next(cumulative for cumulative, _, name in rows if name.strip() == module)
+    top_level = sorted((r for r in rows if not r[2].startswith("   ")), reverse=True)[:5]
+    return total, top_level
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        try:
+            total, top_level = import_time(module)
+        except RuntimeError as e:
+            print(f"{module:20s} FAILED: {e}")
+            over_budget.append(module)
+            continue
+        flag = "  OVER BUDGET" if total / 1000 > args.budget_ms else ""
+        print(f"{module:20s} {total / 1000:8.1f} ms{flag}")
+        for cumulative, _, name in top_level:
+            print(f"    {cumulative / 1000:8.1f} ms {name.strip()}")
+        if flag:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over the {args.budget_ms:g} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Per-call overhead of building ChatGroq per call versus the pooled factory client.
+
+A local HTTP/1.1 server mimics Groq's chat-completions endpoint, so no key or
+network is needed. "per_call" builds a new ChatGroq for every call, as the old
+code did; "pooled" uses common.llm_factory.get_chat_model. The report covers
+per-call latency and how many TCP connections the server accepted. Over real
+HTTPS each new connection also pays a TLS handshake, which this local server
+does not charge.
+
+Usage: python benchmarks/bench_llm_client.py [--calls 200] [--server-delay-ms 0]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODEL = "gemma2-9b-it"
+
+
+class CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid the delayed-ACK stall on keep-alive
+    disable_nagle_algorithm = True
+    delay = 0.0
+    connections = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        with self.lock:
+            self.connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.delay:
+            time.sleep(self.delay)
+        body = json.dumps({
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()), "model": MODEL,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(name, make_llm, calls):
+    CompletionHandler.connections.clear()
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        make_llm().invoke(f"ping {i}")
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "mode": name,
+        "calls": calls,
+        "mean_ms": round(sum(latencies) / calls * 1000, 3),
+        "p50_ms": round(latencies[calls // 2] * 1000, 3),
+        "p95_ms": round(latencies[int(calls * 0.95)] * 1000, 3),
+        "tcp_connections": len(CompletionHandler.connections),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--server-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    CompletionHandler.delay = args.server_delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CompletionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["GROQ_API_BASE"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    from langchain_groq import ChatGroq
+    from common.llm_factory import get_chat_model
+
+    # Warm imports and pydantic schemas so neither mode pays one-off costs
+    ChatGroq(model=MODEL, api_key="bench").invoke("warm up")
+    results = [
+        measure("per_call", lambda: ChatGroq(model=MODEL, api_key="bench"), args.calls),
+        measure("pooled", lambda: get_chat_model(MODEL, temperature=0.7, api_key="bench"), args.calls),
+    ]
+    server.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
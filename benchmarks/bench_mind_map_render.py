@@ -0,0 +1,117 @@
+"""Mind-map rendering time for synthetic trees of 10 to 5000 topics.
+
+For each size the report shows the engine render_mind_map_png chooses,
+whether it drew an overview, the Python-side DOT build time for the whole
+tree (old recursive uuid4 builder versus build_dot_source), and PNG
+render time for the old configuration (dot with ortho splines, concentrate
+and newrank on the whole tree) versus the size-based renderer. The full
+tree is also rendered with the size-chosen engine, without the overview
+cut-off. Renders that exceed --timeout are reported as "timeout". Renders
+need the Graphviz executables (dot, twopi, sfdp) on PATH; without them only
+the build time is reported.
+
+Usage: python benchmarks/bench_mind_map_render.py [--sizes 10,50,...] [--timeout 60]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import graphviz
+
+from flashcard_generator.src import visualize
+
+DEFAULT_SIZES = "10,50,100,250,500,1000,2500,5000"
+
+
+def make_tree(size: int, seed: int = 0) -> dict:
+    """A deterministic topic tree with exactly `size` topics and 2-6 children per branch."""
+    rng = random.Random(seed)
+    root = {}
+    queue = deque([(root, "Topic")])
+    created = 0
+    while queue and created < size:
+        node, label = queue.popleft()
+        for i in range(rng.randint(2, 6)):
+            if created >= size:
+                break
+            child_label = f"{label}.{i + 1}"
+            node[child_label] = {}
+            queue.append((node[child_label], child_label))
+            created += 1
+    return root
+
+
+def old_add_nodes_edges(graph, data, parent_id=None):
+    # The recursive uuid4 builder that nodes.py used to have
+    for key, value in data.items():
+        node_id = str(uuid.uuid4())
+        graph.node(node_id, key, shape='box', style='rounded,filled', fillcolor='#cce5ff', fontcolor='#003366')
+        if parent_id:
+            graph.edge(parent_id, node_id)
+        if isinstance(value, dict) and value:
+            old_add_nodes_edges(graph, value, parent_id=node_id)
+
+
+def old_graph(mind_map: dict) -> graphviz.Digraph:
+    dot = graphviz.Digraph('MindMap', comment='Study Mind Map')
+    dot.attr(rankdir='TB', splines='ortho', concentrate='true', newrank='true', size="20,20")
+    dot.attr('node', fontname='Helvetica', fontsize='12', margin='0.25')
+    dot.attr('edge', fontname='Helvetica', fontsize='10')
+    old_add_nodes_edges(dot, mind_map)
+    return dot
+
+
+def timed(func):
+    # Every render should pay for its own layout
+    visualize._render_cache.clear()
+    start = time.perf_counter()
+    try:
+        func()
+    except (subprocess.TimeoutExpired, TimeoutError):
+        return "timeout"
+    except graphviz.ExecutableNotFound:
+        return "skipped: Graphviz executables not found"
+    return round(time.perf_counter() - start, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        tree = make_tree(size)
+        count = visualize.count_nodes(tree)
+        overview = count > visualize.OVERVIEW_MAX_NODES
+        drawn = visualize.limit_depth(tree, visualize.OVERVIEW_DEPTH) if overview else tree
+        old_build = timed(lambda: old_graph(tree).source)
+        build = timed(lambda: visualize.build_mind_map_graph(tree).source)
+        results.append({
+            "topics": count,
+            "depth": visualize.tree_depth(tree),
+            "engine": visualize.choose_engine(visualize.count_nodes(drawn)),
+            "overview_topics": visualize.count_nodes(drawn) if overview else None,
+            "old_build_seconds": old_build,
+            "build_seconds": build,
+            "old_render_seconds": timed(lambda: visualize._run_layout(old_graph(tree), args.timeout)),
+            "new_render_seconds": timed(lambda: visualize.render_mind_map_png(tree, timeout=args.timeout)),
+            # The whole tree with the size-based engine, as when overview is disabled
+            "full_engine": visualize.choose_engine(count),
+            "full_render_seconds": timed(lambda: visualize._run_layout(visualize.build_mind_map_graph(tree), args.timeout)),
+        })
+        print(json.dumps(results[-1]), file=sys.stderr)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
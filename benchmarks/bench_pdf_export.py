@@ -0,0 +1,73 @@
+"""Benchmark syllabus PDF export: text normalization and full document build.
+
+Usage: python benchmarks/bench_pdf_export.py [--topics 500]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Copilot_MCQ"))
+
+from pdf_maker import PDF_REPLACEMENTS, build_pdf, clean_text_for_pdf, generate_pdf_from_json, get_renderer
+
+
+def legacy_clean_text_for_pdf(text):
+    """The previous multi-pass implementation, kept here for comparison."""
+    for unicode_char, replacement in PDF_REPLACEMENTS.items():
+        text = text.replace(unicode_char, replacement)
+    return ''.join(c for c in text if ord(c) < 256 or c.isspace())
+
+
+def make_syllabus(num_topics: int):
+    paragraph = (
+        "- **Definition:** The process – studied in depth – converts “inputs” into outputs… "
+        "It’s measured with ∑ and √ notation. **Key idea:** energy is conserved.\n"
+    )
+    return [
+        {
+            "topic": f"topic {i}",
+            "explanation": paragraph * 8,
+            "video_url": f"https://www.youtube.com/results?search_query=topic+{i}",
+            "video_title": f"Topic {i}"
+        }
+        for i in range(num_topics)
+    ]
+
+
+def timed(fn, *args):
+    # Time and peak memory come from separate runs; tracemalloc slows allocation-heavy code
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--topics", type=int, default=500)
+    args = parser.parse_args()
+
+    syllabus = make_syllabus(args.topics)
+    texts = [item["explanation"] for item in syllabus]
+
+    for name, cleaner in (("legacy clean_text_for_pdf", legacy_clean_text_for_pdf),
+                          ("clean_text_for_pdf", clean_text_for_pdf)):
+        _, elapsed, peak = timed(lambda: [cleaner(t) for t in texts])
+        print(f"{name:28s} {elapsed * 1000:8.1f} ms  peak {peak / 1e6:6.2f} MB")
+
+    print(f"Renderer: {get_renderer().name}")
+    _, elapsed, peak = timed(build_pdf, syllabus)
+    print(f"{'build_pdf':28s} {elapsed * 1000:8.1f} ms  peak {peak / 1e6:6.2f} MB")
+    pdf_bytes, elapsed, peak = timed(generate_pdf_from_json, syllabus)
+    print(f"{'generate_pdf_from_json':28s} {elapsed * 1000:8.1f} ms  peak {peak / 1e6:6.2f} MB  "
+          f"({len(pdf_bytes) / 1e6:.2f} MB PDF, {args.topics} topics)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare file size and render time of the latin-1 and Unicode PDF renderers.
+
+Usage: python benchmarks/bench_pdf_renderers.py [--topics 100] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Copilot_MCQ"))
+
+from pdf_maker import Latin1Renderer, UnicodeRenderer, find_unicode_font, generate_pdf_from_json
+
+
+def make_syllabus(num_topics: int):
+    paragraph = (
+        "- **Definition:** Photosynthesis – प्रकाश संश्लेषण – converts light into chemical energy. "
+        "**Equation:** 6CO₂ + 6H₂O → C₆H₁₂O₆ + 6O₂, with ΔG > 0 and ∑ over all steps ≈ 2870 kJ/mol.\n"
+    )
+    return [{"topic": f"topic {i}", "explanation": paragraph * 5} for i in range(num_topics)]
+
+
+def run(renderer, syllabus, repeat):
+    timings = []
+    pdf_bytes = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pdf_bytes = generate_pdf_from_json(syllabus, renderer)
+        timings.append(time.perf_counter() - start)
+    return timings, len(pdf_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    syllabus = make_syllabus(args.topics)
+    renderers = [Latin1Renderer()]
+    regular, bold = find_unicode_font()
+    if regular:
+        renderers.append(UnicodeRenderer(regular, bold))
+    else:
+        print("No Unicode TTF font found; set PDF_UNICODE_FONT to include the Unicode renderer.")
+
+    for renderer in renderers:
+        timings, size = run(renderer, syllabus, args.repeat)
+        # The first Unicode run parses the TTF files; later runs reuse the process-wide font cache
+        warm = sorted(timings[1:])[len(timings[1:]) // 2] if len(timings) > 1 else timings[0]
+        print(f"{renderer.name:8s} first {timings[0] * 1000:8.1f} ms  warm median {warm * 1000:8.1f} ms  "
+              f"size {size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
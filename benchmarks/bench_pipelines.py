@@ -0,0 +1,276 @@
+"""Offline benchmark for the LLM-backed pipelines.
+
+Every external client is replaced by the deterministic fakes in fakes.py, so
+runs need no API keys or network. Import paths that newer LangChain releases
+moved (langchain.chains, langchain_core.pydantic_v1, ...) are aliased to their
+new homes. Each pipeline runs at several input sizes and three times per size
+(timing, tracemalloc, cProfile) so instrumentation does not skew the wall time.
+Results are printed as JSON. A pipeline that fails to import or run makes the
+benchmark exit with status 1, as do runs slower than --baseline by more than
+--threshold.
+
+Usage: python benchmarks/bench_pipelines.py [--pipelines process_syllabus,...]
+       [--llm-latency 0.0] [--error-rate 0.0] [--output results.json]
+       [--baseline old.json --threshold 1.25]
+"""
+import argparse
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+import logging
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+from unittest import mock
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (REPO_ROOT, os.path.join(REPO_ROOT, "Copilot_MCQ"), os.path.join(REPO_ROOT, "yt_transcript_RAG"),
+             os.path.join(REPO_ROOT, "Career_Guidence")):
+    if path not in sys.path:
+        sys.path.append(path)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Some modules build their real clients at import time; the fakes replace them before any call
+for key in ("GROQ_API_KEY", "A4F_API_KEY", "PINECONE_API_KEY"):
+    os.environ.setdefault(key, "offline-benchmark")
+
+import fakes  # noqa: E402
+from fakes import CALLS, FakeConfig  # noqa: E402
+
+LEGACY_IMPORT_ALIASES = fakes.install_legacy_imports()
+
+DEFAULT_SIZES = {
+    "process_syllabus": [5, 20, 50],
+    "generate_mcqs": [10, 100, 500],
+    "get_transcript_and_summary": [2000, 20000, 80000],
+    "yt_rag": [10, 50, 200],
+    "comprehensive_career_analysis": [1, 5, 20],
+    "generate_study_materials": [2000, 20000, 100000],
+}
+PROFILE_TOP = 15
+
+
+def no_sleep_time():
+    """A `time` module look-alike whose sleep() returns immediately (rate-limit pauses)."""
+    namespace = {name: getattr(time, name) for name in dir(time) if not name.startswith("_")}
+    namespace["sleep"] = lambda seconds: None
+    return SimpleNamespace(**namespace)
+
+
+def copilot_workspace(stack: contextlib.ExitStack, config: FakeConfig, keep_sleeps: bool):
+    """Fresh Chroma store and SQLite caches in a temp cwd, with every client faked."""
+    workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench_pipelines_"))
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    stack.callback(os.chdir, previous_cwd)
+
+    import clients
+    import duckduckgo_search
+    import hybrid_retriever
+    import processes
+    import source_cache
+    import vector_access
+
+    # Relative DB paths now resolve inside the temp dir, so their schemas must be created again
+    source_cache._initialized_paths.clear()
+    vector_access.reopen_store()
+    hybrid_retriever._index = None
+    clients.override("llm", fakes.fake_chat_model(config))
+    clients.override("embeddings", fakes.FakeEmbeddings(size=64))
+    clients.override("wikipedia", fakes.FakeWikipedia(config))
+    fakes.FakeDDGS.config = config
+    stack.enter_context(mock.patch.object(duckduckgo_search, "DDGS", fakes.FakeDDGS))
+    if not keep_sleeps:
+        stack.enter_context(mock.patch.object(processes, "TOPIC_DELAY_SECONDS", 0))
+
+    def cleanup():
+        vector_access.reopen_store()
+        hybrid_retriever._index = None
+        clients.reset()
+    stack.callback(cleanup)
+
+
+def setup_process_syllabus(stack, size, config, keep_sleeps) -> Callable:
+    copilot_workspace(stack, config, keep_sleeps)
+    from processes import process_syllabus
+    topics = [f"Benchmark topic {i}" for i in range(size)]
+    return lambda: process_syllabus(topics)
+
+
+def setup_generate_mcqs(stack, size, config, keep_sleeps) -> Callable:
+    copilot_workspace(stack, config, keep_sleeps)
+    from langchain_core.documents import Document
+    from mcq import generate_mcqs
+    from vector_access import add_documents
+    add_documents([
+        Document(page_content=f"Topic: Benchmark topic {i}\nExplanation: {fakes.filler_text(str(i), 180)}",
+                 metadata={"type": "topic", "topic": f"benchmark topic {i}"})
+        for i in range(size)
+    ])
+    return lambda: [generate_mcqs(f"Benchmark topic {i}", 5) for i in range(5)]
+
+
+def setup_transcript_summary(stack, size, config, keep_sleeps) -> Callable:
+    from yt_transcript_RAG import youtube_utils
+    stack.enter_context(mock.patch.object(youtube_utils, "YouTubeTranscriptApi",
+                                          fakes.transcript_api_factory(config, size)))
+    stack.enter_context(mock.patch.object(youtube_utils, "get_chat_model", fakes.chat_model_factory(config)))
+    if not keep_sleeps:
+        stack.enter_context(mock.patch.object(youtube_utils, "time", no_sleep_time()))
+    return lambda: youtube_utils.get_transcript_and_summary("fakevideo")
+
+
+def setup_yt_rag(stack, size, config, keep_sleeps) -> Callable:
+    import llm_utils
+    import pinecone_utils
+    from langchain_core.documents import Document
+    stack.enter_context(mock.patch.object(llm_utils, "openai_client", fakes.FakeOpenAI(config)))
+    if not keep_sleeps:
+        stack.enter_context(mock.patch.object(llm_utils, "time", no_sleep_time()))
+    documents = [Document(page_content=fakes.filler_text(f"chunk{i}", 150)) for i in range(size)]
+
+    def run():
+        index = fakes.FakePineconeIndex(config)
+        pinecone_utils.index_documents(documents, index)
+        retrieved = pinecone_utils.retrieve_documents("What is energy?", index, top_k=3)
+        return llm_utils.generate_answer("What is energy?", retrieved)
+    return run
+
+
+def setup_career_analysis(stack, size, config, keep_sleeps) -> Callable:
+    import career_guidance_system
+    stack.enter_context(mock.patch.object(career_guidance_system, "get_chat_model", fakes.chat_model_factory(config)))
+    if not keep_sleeps:
+        stack.enter_context(mock.patch.object(career_guidance_system, "time", no_sleep_time()))
+    careers = [f"Career {i}" for i in range(size)]
+
+    def run():
+        # Half the careers go through the LLM chains, half through the (fake) search agent
+        llm_system = career_guidance_system.CareerGuidanceSystem(groq_api_key="fake")
+        search_system = career_guidance_system.CareerGuidanceSystem(groq_api_key="fake")
+        search_system.search_agent = fakes.FakeSearchAgent(config)
+        search_system.serpapi_key = "fake"
+        return [
+            (search_system if i % 2 else llm_system).comprehensive_career_analysis(career, {"experience": "3-5 years"})
+            for i, career in enumerate(careers)
+        ]
+    return run
+
+
+def setup_study_materials(stack, size, config, keep_sleeps) -> Callable:
+    from flashcard_generator.utils import generate_material
+    stack.enter_context(mock.patch.object(generate_material, "get_chat_model", fakes.chat_model_factory(config)))
+    content = fakes.filler_text("study", size // 6)
+    return lambda: generate_material.generate_study_materials(content, "fake")
+
+
+PIPELINES = {
+    "process_syllabus": setup_process_syllabus,
+    "generate_mcqs": setup_generate_mcqs,
+    "get_transcript_and_summary": setup_transcript_summary,
+    "yt_rag": setup_yt_rag,
+    "comprehensive_career_analysis": setup_career_analysis,
+    "generate_study_materials": setup_study_materials,
+}
+
+
+def run_once(setup, size, config, keep_sleeps, mode: str) -> Dict:
+    """Set up a fresh environment, run the pipeline once and measure it in `mode`."""
+    with contextlib.ExitStack() as stack:
+        run = setup(stack, size, config, keep_sleeps)
+        CALLS.reset()
+        if mode == "time":
+            start = time.perf_counter()
+            run()
+            return {"wall_s": round(time.perf_counter() - start, 4), "calls": CALLS.snapshot()}
+        if mode == "memory":
+            tracemalloc.start()
+            try:
+                run()
+                return {"peak_kb": round(tracemalloc.get_traced_memory()[1] / 1024, 1)}
+            finally:
+                tracemalloc.stop()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            run()
+        finally:
+            profiler.disable()
+        stats = pstats.Stats(profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:PROFILE_TOP]
+        return {"hot_spots": [
+            {"function": f"{os.path.relpath(filename, REPO_ROOT) if filename.startswith(REPO_ROOT) else filename}"
+                         f":{line}({name})",
+             "calls": calls, "tottime_s": round(tottime, 4), "cumtime_s": round(cumtime, 4)}
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+        ]}
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = {(r["pipeline"], r["size"]): r for r in json.load(f)["results"] if "wall_s" in r}
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["pipeline"], result["size"]))
+        if previous and "wall_s" in result and result["wall_s"] > previous["wall_s"] * threshold:
+            regressions.append(f"{result['pipeline']}[{result['size']}]: "
+                               f"{previous['wall_s']:.3f}s -> {result['wall_s']:.3f}s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pipelines", default=",".join(PIPELINES))
+    parser.add_argument("--sizes", help="Comma-separated sizes overriding the defaults of every pipeline")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds added to each fake external call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability that a fake call raises")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-sleeps", action="store_true", help="Keep the pipelines' rate-limit sleeps")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier JSON output to compare wall times against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    config = FakeConfig(latency=args.llm_latency, error_rate=args.error_rate, seed=args.seed)
+    results = []
+    for name in args.pipelines.split(","):
+        sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else DEFAULT_SIZES[name]
+        for size in sizes:
+            result = {"pipeline": name, "size": size}
+            try:
+                for mode in ("time", "memory", "profile"):
+                    result.update(run_once(PIPELINES[name], size, config, args.keep_sleeps, mode))
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            results.append(result)
+            print(f"{name}[{size}]: " + (f"{result['wall_s']:.3f}s, peak {result.get('peak_kb', 0):.0f} KB"
+                                          if "wall_s" in result else result["error"]),
+                  file=sys.stderr)
+
+    report = {"config": vars(config), "python": sys.version.split()[0],
+              "legacy_import_aliases": LEGACY_IMPORT_ALIASES, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    failures = [f"{r['pipeline']}[{r['size']}]: {r['error']}" for r in results if "error" in r]
+    for failure in failures:
+        print(f"FAILED {failure}", file=sys.stderr)
+    regressions = compare(results, args.baseline, args.threshold) if args.baseline else []
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if failures or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
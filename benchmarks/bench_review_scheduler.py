@@ -0,0 +1,70 @@
+"""Benchmark the spaced-repetition scheduler with simulated review history.
+
+Usage: python benchmarks/bench_review_scheduler.py [--reviews 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Copilot_MCQ"))
+
+from review_scheduler import SECONDS_PER_DAY, due_count, due_questions, record_answers
+
+
+def make_answer(topic: str, n: int, rng: random.Random) -> dict:
+    return {
+        "question": f"{topic} question {n}",
+        "options": {"A": "a", "B": "b", "C": "c", "D": "d"},
+        "selected": "A",
+        "correct": "A",
+        "is_correct": rng.random() < 0.7,
+        "explanation": "Because."
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--topics", type=int, default=100)
+    parser.add_argument("--questions-per-topic", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    topics = [f"topic {i}" for i in range(args.topics)]
+    db_path = os.path.join(tempfile.mkdtemp(prefix="review_bench_"), "reviews.db")
+
+    start = time.perf_counter()
+    now = time.time() - 60 * SECONDS_PER_DAY
+    written = 0
+    while written < args.reviews:
+        topic = rng.choice(topics)
+        size = min(args.batch, args.reviews - written)
+        answers = [make_answer(topic, rng.randrange(args.questions_per_topic), rng) for _ in range(size)]
+        record_answers(topic, answers, now=now, db_path=db_path)
+        written += size
+        now += 60
+    ingest = time.perf_counter() - start
+    print(f"Ingested {written:,} reviews in {ingest:.1f}s ({written / ingest:,.0f} reviews/s)")
+
+    query_now = now + 30 * SECONDS_PER_DAY
+    latencies = []
+    for _ in range(args.queries):
+        topic = rng.choice(topics)
+        t0 = time.perf_counter()
+        due_questions(topic, 10, now=query_now, db_path=db_path)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"due_questions(N=10): p50 {p50:.3f} ms, p99 {p99:.3f} ms over {args.queries} queries")
+    print(f"Due items for '{topics[0]}': {due_count(topics[0], now=query_now, db_path=db_path):,}")
+    print(f"Database size: {os.path.getsize(db_path) / 1e6:.1f} MB at {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Perceived latency of streamed versus blocking study-guide generation.
+
+A fake chat model streams the StudyGuide JSON as ~4-character tokens with
+--token-latency-ms between them. Blocking generation shows nothing until the
+whole JSON is parsed. Streaming feeds the same chain's JsonOutputParser
+partials through flashcard_generator.utils.streaming, so the first card can
+be shown as soon as it is complete. The report covers time to first
+settled mind-map branch, time to first complete flashcard, and total time.
+
+Usage: python benchmarks/bench_streaming.py [--token-latency-ms 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from fakes import FakeChatModel
+from flashcard_generator.utils.streaming import complete_flashcards, settled_branches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--token-latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    model = FakeChatModel(token_latency=args.token_latency_ms / 1000)
+    chain = PromptTemplate.from_template('Return "mind_map" and "flashcards" for:\n{content}') | model | JsonOutputParser()
+    inputs = {"content": "Photosynthesis"}
+
+    start = time.perf_counter()
+    final = None
+    for final in chain.stream(inputs):
+        pass
+    blocking = time.perf_counter() - start
+
+    first_branch = first_card = None
+    start = time.perf_counter()
+    partials = 0
+    for partial in chain.stream(inputs):
+        partials += 1
+        if first_branch is None and settled_branches(partial):
+            first_branch = time.perf_counter() - start
+        if first_card is None and complete_flashcards(partial):
+            first_card = time.perf_counter() - start
+    total = time.perf_counter() - start
+
+    print(json.dumps({
+        "flashcards": len(final["flashcards"]),
+        "partials_parsed": partials,
+        "blocking_seconds": round(blocking, 3),
+        "streaming_first_branch_seconds": round(first_branch, 3) if first_branch is not None else None,
+        "streaming_first_card_seconds": round(first_card, 3) if first_card is not None else None,
+        "streaming_total_seconds": round(total, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
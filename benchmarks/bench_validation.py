@@ -0,0 +1,103 @@
+"""Local topic gate versus the old LLM validation round-trip.
+
+Runs flashcard_generator.utils.validation.validate_input_content over a
+labeled sample of real topics and gibberish and reports false-reject and
+false-accept rates. The gate only hard-rejects clear gibberish, so its false
+accepts are not errors the user sees: they go on to generation, where the
+model's is_valid_topic rejects them. The old path (a separate validation prompt) is timed
+through the same prompt | model | parser chain against a fake chat model
+with --llm-latency-ms per call, so the latency saved per request is that
+round-trip minus the gate's own cost.
+
+Usage: python benchmarks/bench_validation.py [--llm-latency-ms 350] [--repeat 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from fakes import FakeChatModel
+from flashcard_generator.utils.validation import validate_input_content
+
+VALID = [
+    "Machine Learning", "Quantum-Mechanics", "Photosynthesis", "World War II", "The French Revolution",
+    "Organic Chemistry", "Linear Algebra", "DNA replication", "HTML and CSS", "Thermodynamics",
+    "Pride and Prejudice", "Keynesian economics", "Plate tectonics", "Object oriented programming",
+    "Cell biology", "Shakespeare's sonnets", "Calculus", "Newton's laws of motion", "Mughal Empire",
+    "Data structures", "Blockchain", "Human anatomy", "Electromagnetism", "Python", "Game theory",
+    "Neural networks", "Indian constitution", "Renaissance art", "Climate change", "Statistics",
+    "NLP", "Strengths", "Twelfths", "Strengths and weaknesses", "Rhythm and blues", "Psychology",
+    "Microeconomics", "Stoichiometry", "Krebs cycle", "Byzantine Empire", "Fourier transform", "SQL joins",
+    "प्रकाश संश्लेषण", "Lymphocytes", "Cryptography", "Schrödinger equation", "Tsunami",
+    # Lowercase acronyms and short words
+    "sql", "html", "css", "php", "xml", "llm", "gpt", "ai", "pH", "Eye", "dbms", "http", "Ode", "Io",
+    "css grid", "gpt models", "ai ethics", "pH scale", "xml parsing", "llm agents", "eye anatomy",
+]
+GIBBERISH = [
+    "asdfghjkl", "qwrtpsdfgh", "aaaaaaaaaa", "xzxzxzxzxz", "jjjjjkkkkk", "zxcvbnm", "hjkl hjkl hjkl",
+    "sdfsdf sdfsdf", "mnbvcxz lkjhg", "qqqqq", "bcdfg hjklm", "!!!???!!!", "12345 67890", "ababababab",
+    "ppppp ooooo", "wrtzp", "lkjhgfdsa", "xkcdqrst", "hhhhhhhhhhhhh", "fjdkslaf", "trrrrrr",
+]
+
+
+def score():
+    false_rejects = [t for t in VALID if not validate_input_content(t)["is_valid_topic"]]
+    false_accepts = [t for t in GIBBERISH if validate_input_content(t)["is_valid_topic"]]
+    return {
+        "valid_samples": len(VALID),
+        "gibberish_samples": len(GIBBERISH),
+        "false_reject_rate": round(len(false_rejects) / len(VALID), 3),
+        "false_accept_rate": round(len(false_accepts) / len(GIBBERISH), 3),
+        "false_rejects": false_rejects,
+        "false_accepts": false_accepts,
+    }
+
+
+def time_gate(repeat):
+    samples = VALID + GIBBERISH
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in samples:
+            validate_input_content(text)
+    return (time.perf_counter() - start) / (repeat * len(samples))
+
+
+def time_llm_validation(latency, calls):
+    chain = (PromptTemplate.from_template("You are an intelligent validation assistant.\nTEXT:\n{content}")
+             | FakeChatModel(latency=latency) | JsonOutputParser())
+    timings = []
+    for text in (VALID + GIBBERISH)[:calls]:
+        start = time.perf_counter()
+        chain.invoke({"content": text})
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency-ms", type=float, default=350.0)
+    parser.add_argument("--llm-calls", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    gate = time_gate(args.repeat)
+    llm = time_llm_validation(args.llm_latency_ms / 1000, args.llm_calls)
+    print(json.dumps({
+        **score(),
+        "gate_us": round(gate * 1e6, 1),
+        "llm_validation_ms": round(llm * 1000, 1),
+        "saved_per_request_ms": round((llm - gate) * 1000, 1),
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Multi-process stress test for shared Chroma access.
+
+Writer processes add documents through vector_access.add_documents while reader
+processes run similarity searches. Embeddings are deterministic local fakes, so
+no network is used. Reports write throughput, read latency and errors.
+
+Usage: python benchmarks/bench_vector_store_concurrency.py [--mode local|server]
+       [--writers 4] [--readers 4] [--docs-per-writer 200] [--batch 10]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+COPILOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Copilot_MCQ")
+
+
+def _setup(store_dir: str, mode: str, port: int):
+    # Configuration is read at import time, so set it before importing Copilot_MCQ modules
+    os.environ["VECTOR_STORE_DIR"] = store_dir
+    os.environ["VECTOR_STORE_MODE"] = mode
+    os.environ["CHROMA_PORT"] = str(port)
+    sys.path.insert(0, COPILOT_DIR)
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    import clients
+    clients.override("embeddings", DeterministicFakeEmbedding(size=64))
+
+
+def writer(worker_id, store_dir, mode, port, num_docs, batch, results):
+    _setup(store_dir, mode, port)
+    from langchain_core.documents import Document
+    from vector_access import add_documents
+
+    errors = 0
+    start = time.perf_counter()
+    for offset in range(0, num_docs, batch):
+        documents = [
+            Document(page_content=f"Topic: writer {worker_id} topic {n}\nExplanation: text {n}",
+                     metadata={"type": "topic", "topic": f"w{worker_id}-{n}"})
+            for n in range(offset, min(offset + batch, num_docs))
+        ]
+        try:
+            add_documents(documents)
+        except Exception as e:
+            errors += 1
+            print(f"writer {worker_id}: {e}", file=sys.stderr)
+    results.put(("write", worker_id, num_docs, time.perf_counter() - start, errors))
+
+
+def reader(worker_id, store_dir, mode, port, read_seconds, results):
+    _setup(store_dir, mode, port)
+    from vector_access import similarity_search
+
+    latencies, errors = [], 0
+    # The first query opens the store; keep it out of the steady-state numbers
+    try:
+        similarity_search("warm up", k=1)
+    except Exception:
+        pass
+    stop_at = time.time() + read_seconds
+    while time.time() < stop_at:
+        start = time.perf_counter()
+        try:
+            similarity_search(f"Topic: writer 0 topic {len(latencies)}", k=3)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors += 1
+            print(f"reader {worker_id}: {e}", file=sys.stderr)
+            time.sleep(0.05)
+    results.put(("read", worker_id, latencies, errors))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=["local", "server"], default="local")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--docs-per-writer", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--read-seconds", type=float, default=15.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    store_dir = tempfile.mkdtemp(prefix="vector_stress_")
+    server = None
+    if args.mode == "server":
+        _setup(store_dir, args.mode, args.port)
+        from vector_access import start_local_server
+        server = start_local_server(path=store_dir, port=args.port)
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=writer, args=(i, store_dir, args.mode, args.port, args.docs_per_writer, args.batch, results))
+        for i in range(args.writers)
+    ] + [
+        ctx.Process(target=reader, args=(i, store_dir, args.mode, args.port, args.read_seconds, results))
+        for i in range(args.readers)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    wall = time.perf_counter() - start
+
+    writes = [r for r in collected if r[0] == "write"]
+    reads = [r for r in collected if r[0] == "read"]
+    total_docs = sum(r[2] for r in writes)
+    write_wall = max(r[3] for r in writes) if writes else 0.0
+    latencies = [latency for r in reads for latency in r[2]]
+    print(f"mode={args.mode} writers={args.writers} readers={args.readers} wall={wall:.1f}s")
+    print(f"writes: {total_docs} docs in {write_wall:.2f}s -> {total_docs / write_wall:.1f} docs/s, "
+          f"errors {sum(r[4] for r in writes)}")
+    print(f"reads: {len(latencies)} queries, p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, "
+          f"errors {sum(r[3] for r in reads)}")
+
+    if server is not None:
+        server.terminate()
+        server.wait()
+    shutil.rmtree(store_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
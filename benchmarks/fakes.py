@@ -0,0 +1,336 @@
+"""Deterministic offline stand-ins for the external services used by the pipelines.
+
+Every fake records its calls in CALLS and honours a FakeConfig: a fixed latency
+per call and a seeded error rate, so runs are repeatable without Groq, A4F,
+SerpAPI, Pinecone, DuckDuckGo, Wikipedia or YouTube access.
+"""
+import hashlib
+import importlib
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+# Captured before the harness replaces module-level `time` objects in the pipelines
+_sleep = time.sleep
+
+EMBEDDING_SIZE = 1536
+WORDS = (
+    "energy force motion cell structure function process system model theory data value rate change "
+    "example result method concept principle analysis learning growth balance pattern network signal"
+).split()
+
+
+# Import paths the pipelines use from older LangChain releases, where newer releases keep
+# them, and the names the pipelines import from each
+LEGACY_IMPORTS = {
+    "langchain.chains": ("langchain_classic.chains", ("LLMChain",)),
+    "langchain.prompts": ("langchain_classic.prompts", ("PromptTemplate",)),
+    "langchain.agents": ("langchain_classic.agents", ("load_tools", "initialize_agent", "AgentType")),
+    "langchain.text_splitter": ("langchain_text_splitters", ("RecursiveCharacterTextSplitter",)),
+    "langchain_core.pydantic_v1": ("pydantic.v1", ("BaseModel", "Field")),
+}
+
+
+def install_legacy_imports() -> List[str]:
+    """Alias legacy import paths the installed LangChain lacks or has emptied; returns the aliases made."""
+    installed = []
+    for legacy, (current, names) in LEGACY_IMPORTS.items():
+        try:
+            module = importlib.import_module(legacy)
+            if all(hasattr(module, name) for name in names):
+                continue
+        except ImportError:
+            pass
+        try:
+            sys.modules[legacy] = importlib.import_module(current)
+        except ImportError:
+            continue
+        installed.append(legacy)
+    return installed
+
+
+@dataclass
+class FakeConfig:
+    latency: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+class CallCounter:
+    """Thread-safe per-service call counts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Counter = Counter()
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+CALLS = CallCounter()
+
+
+class FakeService:
+    """Shared latency, error injection and call counting."""
+
+    def __init__(self, name: str, config: Optional[FakeConfig] = None):
+        self.name = name
+        self.config = config or FakeConfig()
+        self._rng = random.Random(f"{self.config.seed}:{name}")
+        self._lock = threading.Lock()
+
+    def call(self, operation: str = "") -> None:
+        CALLS.record(f"{self.name}.{operation}" if operation else self.name)
+        if self.config.latency:
+            _sleep(self.config.latency)
+        with self._lock:
+            failed = self._rng.random() < self.config.error_rate
+        if failed:
+            raise RuntimeError(f"Injected {self.name} failure")
+
+
+def filler_text(seed: str, words: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def fake_mind_map(seed: str, depth: int = 3, width: int = 3) -> Dict[str, Any]:
+    if depth == 0:
+        return {}
+    return {f"{seed} {i}": fake_mind_map(f"{seed} {i}", depth - 1, width) for i in range(width)}
+
+
+def fake_completion(prompt: str) -> str:
+    """A plausible response for each prompt shape used in the repo."""
+    if "multiple-choice questions" in prompt:
+        match = re.search(r"Generate (\d+) multiple-choice", prompt)
+        count = int(match.group(1)) if match else 5
+        return json.dumps([
+            {
+                "question": f"Question {i + 1}?",
+                "options": {letter: f"Option {letter}" for letter in "ABCD"},
+                "correct_answer": "A",
+                "explanation": filler_text(f"mcq{i}", 20),
+            }
+            for i in range(count)
+        ])
+    if '"mind_map"' in prompt:
+        return json.dumps({
+            "mind_map": fake_mind_map("Topic"),
+            "flashcards": [{"question": f"Q{i}?", "answer": filler_text(f"card{i}", 12)} for i in range(10)],
+            "is_valid_topic": True,
+            "reason": "",
+        })
+    if "validation assistant" in prompt:
+        return json.dumps({"is_valid_topic": True, "reason": "Looks like a real topic."})
+    if prompt.lstrip().startswith("Translate"):
+        return prompt.split("\n", 1)[-1]
+    if "Summarize the following text in 1-2 lines" in prompt:
+        return filler_text(prompt[-200:], 30)
+    return filler_text(prompt[-200:], 180)
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model returning fake_completion() after the configured latency.
+
+    Streaming emits ~4-character tokens, waiting token_latency before each one.
+    """
+
+    latency: float = 0.0
+    token_latency: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    _service: FakeService = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._service = FakeService("llm", FakeConfig(self.latency, self.error_rate, self.seed))
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self._service.call("invoke")
+        prompt = "\n".join(str(message.content) for message in messages)
+        message = AIMessage(
+            content=fake_completion(prompt),
+            usage_metadata={"input_tokens": len(prompt) // 4, "output_tokens": 200, "total_tokens": len(prompt) // 4 + 200},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        self._service.call("stream")
+        content = fake_completion("\n".join(str(message.content) for message in messages))
+        for start in range(0, len(content), 4):
+            if self.token_latency:
+                _sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content[start:start + 4]))
+
+
+def fake_chat_model(config: FakeConfig) -> FakeChatModel:
+    return FakeChatModel(latency=config.latency, error_rate=config.error_rate, seed=config.seed)
+
+
+def chat_model_factory(config: FakeConfig):
+    """Drop-in for `get_chat_model(...)` / `ChatGroq(...)`: ignores arguments, returns a fake."""
+    def factory(*args, **kwargs):
+        CALLS.record("llm.construct")
+        return fake_chat_model(config)
+    return factory
+
+
+class FakeEmbeddings(DeterministicFakeEmbedding):
+    """Deterministic embeddings that count calls (latency is not simulated)."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        CALLS.record("embeddings.embed_documents")
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        CALLS.record("embeddings.embed_query")
+        return super().embed_query(text)
+
+
+def fake_vector(text: str, size: int = EMBEDDING_SIZE) -> List[float]:
+    # Cheap and deterministic, so the fake does not dominate profiles
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [(byte - 127.5) / 127.5 for byte in (digest * (size // len(digest) + 1))[:size]]
+
+
+class FakeOpenAI(FakeService):
+    """The subset of the OpenAI client used in the repo: embeddings and chat completions."""
+
+    def __init__(self, config: Optional[FakeConfig] = None):
+        super().__init__("openai", config)
+        self.embeddings = SimpleNamespace(create=self._create_embedding)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+
+    def _create_embedding(self, input, model=None, **kwargs):
+        self.call("embeddings.create")
+        texts = [input] if isinstance(input, str) else list(input)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=fake_vector(text)) for text in texts])
+
+    def _create_completion(self, model=None, messages=(), **kwargs):
+        self.call("chat.completions.create")
+        content = fake_completion(messages[-1]["content"] if messages else "")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakePineconeIndex(FakeService):
+    """In-memory index with brute-force cosine similarity."""
+
+    def __init__(self, config: Optional[FakeConfig] = None):
+        super().__init__("pinecone", config)
+        self.vectors: Dict[str, Dict] = {}
+
+    def upsert(self, vectors: List[Dict], **kwargs) -> None:
+        self.call("upsert")
+        for vector in vectors:
+            self.vectors[vector["id"]] = vector
+
+    def query(self, vector: List[float], top_k: int = 1, include_metadata: bool = True, **kwargs):
+        self.call("query")
+        query_norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        matches = []
+        for stored in self.vectors.values():
+            values = stored["values"]
+            norm = math.sqrt(sum(v * v for v in values)) or 1.0
+            score = sum(a * b for a, b in zip(vector, values)) / (query_norm * norm)
+            matches.append(SimpleNamespace(id=stored["id"], score=score, metadata=stored.get("metadata", {})))
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return SimpleNamespace(matches=matches[:top_k])
+
+
+class FakeDDGS(FakeService):
+    """duckduckgo_search.DDGS replacement; also usable as a context manager."""
+
+    config = FakeConfig()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__("ddgs", FakeDDGS.config)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def text(self, query: str, max_results: int = 5, **kwargs) -> List[Dict]:
+        self.call("text")
+        return [{"title": f"{query} {i}", "href": f"https://example.com/{i}", "body": filler_text(f"{query}{i}", 80)}
+                for i in range(max_results)]
+
+    def videos(self, query: str, max_results: int = 5, **kwargs) -> List[Dict]:
+        self.call("videos")
+        return [{"title": f"{query} video {i}", "content": f"https://www.youtube.com/watch?v=fake{i}",
+                 "description": filler_text(f"{query}v{i}", 20)} for i in range(max_results)]
+
+
+class FakeWikipedia(FakeService):
+    """wikipediaapi.Wikipedia replacement."""
+
+    def __init__(self, config: Optional[FakeConfig] = None):
+        super().__init__("wikipedia", config)
+
+    def page(self, title: str):
+        self.call("page")
+        return SimpleNamespace(exists=lambda: True, summary=filler_text(title, 250), title=title)
+
+
+class FakeTranscript:
+    def __init__(self, service: FakeService, language_code: str, words: int):
+        self._service = service
+        self.language_code = language_code
+        self.words = words
+
+    def fetch(self):
+        self._service.call("fetch")
+        text = filler_text(self.language_code, self.words).split()
+        return [SimpleNamespace(text=" ".join(text[i:i + 12]), start=i / 3.0, duration=4.0)
+                for i in range(0, len(text), 12)]
+
+
+def transcript_api_factory(config: FakeConfig, words: int, language_code: str = "en"):
+    """Drop-in for `YouTubeTranscriptApi()` returning one transcript of `words` words."""
+    service = FakeService("youtube_transcript", config)
+
+    class FakeYouTubeTranscriptApi:
+        def list(self, video_id: str):
+            service.call("list")
+            return [FakeTranscript(service, language_code, words)]
+
+    return FakeYouTubeTranscriptApi
+
+
+class FakeSearchAgent(FakeService):
+    """Stand-in for the SerpAPI-backed LangChain agent (`agent.run(query)`)."""
+
+    def __init__(self, config: Optional[FakeConfig] = None):
+        super().__init__("search_agent", config)
+
+    def run(self, query: str) -> str:
+        self.call("run")
+        return "Final Answer:\n" + "\n".join(f"- {filler_text(query + str(i), 25)}" for i in range(8))
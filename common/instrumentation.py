@@ -0,0 +1,346 @@
+"""Per-call instrumentation for LLM, embedding, search and vector-store calls.
+
+Wrap each external call site with `track_call(kind, site)` (or decorate a
+function with `instrumented`). Every call records duration, tokens in/out,
+payload size, retries, cache hit/miss and errors into process-wide aggregates
+and a bounded list of recent calls. Aggregates export as Prometheus text
+(`prometheus_text`, `start_metrics_server`); when INSTRUMENTATION_SPAN_LOG is
+set each call is also appended to that file as an OpenTelemetry-style JSON span.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION", "1") != "0"
+SPAN_LOG_PATH = os.getenv("INSTRUMENTATION_SPAN_LOG")
+METRICS_PORT = os.getenv("INSTRUMENTATION_METRICS_PORT")
+SHOW_DEBUG_PANEL = os.getenv("INSTRUMENTATION_DEBUG_PANEL", "0") == "1"
+MAX_RECENT_CALLS = 1000
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRIC_PREFIX = "smart_teacher"
+
+
+@dataclass
+class CallSpan:
+    """One instrumented call; call sites annotate it while it is open."""
+    kind: str
+    site: str
+    start: float = field(default_factory=time.time)
+    duration: float = 0.0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    retries: int = 0
+    cache: Optional[str] = None
+    error: Optional[str] = None
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+
+    def set_tokens(self, tokens_in: int = 0, tokens_out: int = 0) -> None:
+        self.tokens_in += tokens_in or 0
+        self.tokens_out += tokens_out or 0
+
+    def set_payload(self, request: Any) -> None:
+        self.bytes_in += payload_size(request)
+
+    def add_retry(self) -> None:
+        self.retries += 1
+
+    def cache_hit(self) -> None:
+        self.cache = "hit"
+
+    def cache_miss(self) -> None:
+        self.cache = "miss"
+
+    def record_response(self, response: Any) -> Any:
+        """Pick up token usage and size from an LLM, chain or OpenAI response; returns it unchanged."""
+        self.bytes_out += payload_size(response)
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            self.set_tokens(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+            return response
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.set_tokens(getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0))
+        return response
+
+
+def payload_size(value: Any) -> int:
+    """Approximate size in bytes of a prompt or response."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    content = getattr(value, "content", None)
+    if isinstance(content, str):
+        return len(content.encode("utf-8"))
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    if isinstance(value, dict):
+        return len(json.dumps(value, default=str).encode("utf-8"))
+    page_content = getattr(value, "page_content", None)
+    return len(page_content.encode("utf-8")) if isinstance(page_content, str) else 0
+
+
+class _SiteStats:
+    __slots__ = ("calls", "errors", "duration", "buckets", "tokens_in", "tokens_out", "bytes_in", "bytes_out",
+                 "retries", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.calls = self.errors = self.retries = self.cache_hits = self.cache_misses = 0
+        self.tokens_in = self.tokens_out = self.bytes_in = self.bytes_out = 0
+        self.duration = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+    def add(self, span: CallSpan) -> None:
+        self.calls += 1
+        self.errors += span.error is not None
+        self.duration += span.duration
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if span.duration <= bound:
+                self.buckets[i] += 1
+        self.tokens_in += span.tokens_in
+        self.tokens_out += span.tokens_out
+        self.bytes_in += span.bytes_in
+        self.bytes_out += span.bytes_out
+        self.retries += span.retries
+        self.cache_hits += span.cache == "hit"
+        self.cache_misses += span.cache == "miss"
+
+
+_lock = threading.Lock()
+_stats: Dict[Tuple[str, str], _SiteStats] = {}
+_recent: Deque[CallSpan] = deque(maxlen=MAX_RECENT_CALLS)
+_span_log_lock = threading.Lock()
+
+
+def _finish(span: CallSpan, keep_recent: bool = True) -> None:
+    with _lock:
+        stats = _stats.get((span.kind, span.site))
+        if stats is None:
+            stats = _stats[(span.kind, span.site)] = _SiteStats()
+        stats.add(span)
+        if keep_recent:
+            _recent.append(span)
+    if SPAN_LOG_PATH and keep_recent:
+        _write_span(span)
+
+
+def _write_span(span: CallSpan) -> None:
+    record = {
+        "traceId": uuid.uuid4().hex,
+        "spanId": span.span_id,
+        "name": span.site,
+        "kind": "SPAN_KIND_CLIENT",
+        "startTimeUnixNano": int(span.start * 1e9),
+        "endTimeUnixNano": int((span.start + span.duration) * 1e9),
+        "attributes": {
+            "call.kind": span.kind,
+            "llm.tokens.input": span.tokens_in,
+            "llm.tokens.output": span.tokens_out,
+            "payload.bytes.input": span.bytes_in,
+            "payload.bytes.output": span.bytes_out,
+            "retries": span.retries,
+            "cache": span.cache or "none",
+        },
+        "status": {"code": "STATUS_CODE_ERROR", "message": span.error} if span.error else {"code": "STATUS_CODE_OK"},
+    }
+    try:
+        with _span_log_lock, open(SPAN_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        logger.error(f"Failed to write span log: {e}")
+
+
+@contextlib.contextmanager
+def track_call(kind: str, site: str, payload: Any = None) -> Iterator[CallSpan]:
+    """Time one external call; `kind` is llm/embedding/search/vector_store, `site` names the call site."""
+    span = CallSpan(kind=kind, site=site)
+    if payload is not None:
+        span.set_payload(payload)
+    if not INSTRUMENTATION_ENABLED:
+        yield span
+        return
+    started = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        span.duration = time.perf_counter() - started
+        _finish(span)
+
+
+def instrumented(kind: str, site: Optional[str] = None):
+    """Decorator form of track_call; the return value is inspected for token usage."""
+    def decorator(func):
+        name = site or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_call(kind, name) as span:
+                return span.record_response(func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def record_cache(site: str, hit: bool, kind: str = "cache") -> None:
+    """Count a cache lookup that does not wrap an external call."""
+    if not INSTRUMENTATION_ENABLED:
+        return
+    # Aggregated only, so cheap lookups do not push real calls out of the recent list
+    _finish(CallSpan(kind=kind, site=site, cache="hit" if hit else "miss"), keep_recent=False)
+
+
+def recent_calls(since: float = 0.0) -> List[CallSpan]:
+    """Calls recorded after `since` (epoch seconds), oldest first."""
+    with _lock:
+        return [span for span in _recent if span.start >= since]
+
+
+def slowest_calls(limit: int = 10, since: float = 0.0) -> List[CallSpan]:
+    return sorted(recent_calls(since), key=lambda span: span.duration, reverse=True)[:limit]
+
+
+def summary() -> List[Dict[str, Any]]:
+    """Aggregates per (kind, site), slowest total time first."""
+    with _lock:
+        rows = [
+            {"kind": kind, "site": site, "calls": s.calls, "errors": s.errors, "total_s": round(s.duration, 4),
+             "avg_ms": round(s.duration / s.calls * 1000, 2) if s.calls else 0.0, "tokens_in": s.tokens_in,
+             "tokens_out": s.tokens_out, "bytes_in": s.bytes_in, "bytes_out": s.bytes_out, "retries": s.retries,
+             "cache_hits": s.cache_hits, "cache_misses": s.cache_misses}
+            for (kind, site), s in _stats.items()
+        ]
+    return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+        _recent.clear()
+
+
+def _labels(**labels: str) -> str:
+    escaped = (f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for key, value in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def prometheus_text() -> str:
+    """All aggregates in the Prometheus text exposition format."""
+    p = METRIC_PREFIX
+    lines = [
+        f"# HELP {p}_calls_total External calls by kind, site and status.",
+        f"# TYPE {p}_calls_total counter",
+    ]
+    with _lock:
+        # Rendering is cheap; holding the lock keeps every metric from the same instant
+        snapshot = [(kind, site, stats) for (kind, site), stats in _stats.items()]
+        return _render_metrics(lines, snapshot)
+
+
+def _render_metrics(lines: List[str], snapshot: List[Tuple[str, str, _SiteStats]]) -> str:
+    p = METRIC_PREFIX
+    for kind, site, s in snapshot:
+        lines.append(f"{p}_calls_total{_labels(kind=kind, site=site, status='ok')} {s.calls - s.errors}")
+        lines.append(f"{p}_calls_total{_labels(kind=kind, site=site, status='error')} {s.errors}")
+    lines += [f"# HELP {p}_call_duration_seconds Duration of external calls.",
+              f"# TYPE {p}_call_duration_seconds histogram"]
+    for kind, site, s in snapshot:
+        for bound, count in zip(DURATION_BUCKETS, s.buckets):
+            lines.append(f"{p}_call_duration_seconds_bucket{_labels(kind=kind, site=site, le=bound)} {count}")
+        lines.append(f"{p}_call_duration_seconds_bucket{_labels(kind=kind, site=site, le='+Inf')} {s.calls}")
+        lines.append(f"{p}_call_duration_seconds_sum{_labels(kind=kind, site=site)} {s.duration:.6f}")
+        lines.append(f"{p}_call_duration_seconds_count{_labels(kind=kind, site=site)} {s.calls}")
+    for metric, help_text, directions in (
+        ("tokens_total", "LLM tokens by direction.", (("in", "tokens_in"), ("out", "tokens_out"))),
+        ("payload_bytes_total", "Request and response payload bytes.", (("in", "bytes_in"), ("out", "bytes_out"))),
+    ):
+        lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} counter"]
+        for kind, site, s in snapshot:
+            for direction, attr in directions:
+                lines.append(f"{p}_{metric}{_labels(kind=kind, site=site, direction=direction)} {getattr(s, attr)}")
+    lines += [f"# HELP {p}_retries_total Retries inside instrumented calls.", f"# TYPE {p}_retries_total counter"]
+    for kind, site, s in snapshot:
+        lines.append(f"{p}_retries_total{_labels(kind=kind, site=site)} {s.retries}")
+    lines += [f"# HELP {p}_cache_requests_total Cache lookups by result.", f"# TYPE {p}_cache_requests_total counter"]
+    for kind, site, s in snapshot:
+        if s.cache_hits or s.cache_misses:
+            lines.append(f"{p}_cache_requests_total{_labels(kind=kind, site=site, result='hit')} {s.cache_hits}")
+            lines.append(f"{p}_cache_requests_total{_labels(kind=kind, site=site, result='miss')} {s.cache_misses}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Write the metrics atomically, e.g. for node_exporter's textfile collector."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+_metrics_server = None
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = "127.0.0.1"):
+    """Serve /metrics from a daemon thread (once per process); no-op without a port or INSTRUMENTATION_METRICS_PORT."""
+    global _metrics_server
+    port = port or (int(METRICS_PORT) if METRICS_PORT else None)
+    if port is None:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, port), MetricsHandler)
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+            logger.info(f"Serving Prometheus metrics on http://{host}:{port}/metrics")
+    return _metrics_server
+
+
+def render_debug_panel(limit: int = 10) -> None:
+    """Streamlit sidebar expander with the slowest calls made since this session started.
+
+    Shown only when INSTRUMENTATION_DEBUG_PANEL=1.
+    """
+    if not SHOW_DEBUG_PANEL:
+        return
+    import streamlit as st
+    since = st.session_state.setdefault("instrumentation_since", time.time())
+    with st.sidebar.expander("🔍 Slowest calls (this session)"):
+        calls = slowest_calls(limit, since)
+        if not calls:
+            st.caption("No instrumented calls yet.")
+            return
+        st.table([
+            {"site": span.site, "kind": span.kind, "ms": round(span.duration * 1000, 1),
+             "tokens in/out": f"{span.tokens_in}/{span.tokens_out}", "retries": span.retries,
+             "cache": span.cache or "", "error": span.error or ""}
+            for span in calls
+        ])
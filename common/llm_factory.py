@@ -0,0 +1,136 @@
+"""Process-wide, pooled LLM and OpenAI-compatible clients.
+
+Constructing `ChatGroq` or `OpenAI` per call builds a fresh HTTP client each
+time, so every call pays for new TCP connections and TLS handshakes. Here chat
+models are cached per (provider, model, temperature, api key) and every client
+shares one keep-alive connection pool.
+
+`get_chat_model` is the sync face. `get_async_chat_model` returns a model whose
+async client belongs to the running event loop, since httpx async connections
+cannot be shared between loops.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import weakref
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = 60.0
+HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "60"))
+
+_lock = threading.RLock()
+_http_client = None
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_models: Dict[Tuple, Any] = {}
+_async_models: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, Any]]" = weakref.WeakKeyDictionary()
+_openai_clients: Dict[Tuple, Any] = {}
+
+
+def _limits():
+    import httpx
+    return httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY)
+
+
+def get_http_client():
+    """The shared sync httpx client (keep-alive pool) used by every LLM and OpenAI client."""
+    global _http_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                import httpx
+                _http_client = httpx.Client(limits=_limits(), timeout=HTTP_TIMEOUT)
+    return _http_client
+
+
+def get_async_http_client():
+    """The shared async httpx client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_http_clients.get(loop)
+        if client is None:
+            import httpx
+            client = _async_http_clients[loop] = httpx.AsyncClient(limits=_limits(), timeout=HTTP_TIMEOUT)
+        return client
+
+
+def _key_fingerprint(api_key: Optional[str]) -> str:
+    # Keep raw keys out of the cache keys (they show up in debuggers and repr)
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else ""
+
+
+def _build_chat_model(provider: str, model: str, temperature: float, api_key: Optional[str],
+                      http_client: Any, http_async_client: Any = None):
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, temperature=temperature, api_key=api_key or os.getenv("GROQ_API_KEY"),
+                        http_client=http_client, http_async_client=http_async_client)
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model=model, temperature=temperature, api_key=api_key or os.getenv("A4F_API_KEY"),
+                          base_url=os.getenv("A4F_BASE_URL"), http_client=http_client,
+                          http_async_client=http_async_client)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def get_chat_model(model: str, temperature: float = 0.0, api_key: Optional[str] = None, provider: str = "groq"):
+    """Shared chat model for (provider, model, temperature, api key), built once per process."""
+    key = (provider, model, float(temperature), _key_fingerprint(api_key))
+    instance = _models.get(key)
+    if instance is None:
+        with _lock:
+            instance = _models.get(key)
+            if instance is None:
+                instance = _models[key] = _build_chat_model(provider, model, temperature, api_key,
+                                                            get_http_client())
+                logger.info(f"Initialized shared {provider} chat model {model} (temperature {temperature})")
+    return instance
+
+
+def get_async_chat_model(model: str, temperature: float = 0.0, api_key: Optional[str] = None,
+                         provider: str = "groq"):
+    """Like get_chat_model, for `ainvoke`/`astream` inside the running event loop."""
+    loop = asyncio.get_running_loop()
+    key = (provider, model, float(temperature), _key_fingerprint(api_key))
+    with _lock:
+        models = _async_models.setdefault(loop, {})
+        instance = models.get(key)
+        if instance is None:
+            instance = models[key] = _build_chat_model(provider, model, temperature, api_key,
+                                                        get_http_client(), get_async_http_client())
+    return instance
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """Shared OpenAI SDK client (used for A4F) per (api key, base url)."""
+    key = (_key_fingerprint(api_key), base_url)
+    client = _openai_clients.get(key)
+    if client is None:
+        with _lock:
+            client = _openai_clients.get(key)
+            if client is None:
+                from openai import OpenAI
+                client = _openai_clients[key] = OpenAI(api_key=api_key, base_url=base_url,
+                                                       http_client=get_http_client())
+    return client
+
+
+def reset() -> None:
+    """Drop cached models and close the shared pools (tests and benchmarks)."""
+    global _http_client
+    with _lock:
+        _models.clear()
+        _async_models.clear()
+        _openai_clients.clear()
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+        _async_http_clients.clear()
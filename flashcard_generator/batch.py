@@ -0,0 +1,286 @@
+"""Batch study-guide generation for a whole course folder.
+
+Walks a directory for PDFs (and .txt/.md notes) and extracts text in a process
+pool. Study guides are generated with bounded parallelism under a
+requests-per-minute limit, and mind maps are rendered in a second process
+pool. Each document gets study_guide.json (plus mind_map.<format>) in a folder
+named after its path, extension included (OUT/week1/intro.pdf/), and
+manifest.json records every finished document. A rerun skips documents
+already done with unchanged content, so an interrupted run (Ctrl-C drops the
+queued documents) resumes where it stopped.
+
+Usage:
+    python -m flashcard_generator.batch COURSE_DIR --out OUTPUT_DIR [--concurrency 4] [--rpm 30]
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import threading
+import time
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import graphviz
+from dotenv import load_dotenv
+
+from flashcard_generator.src.visualize import render_mind_map_image, tree_depth
+from flashcard_generator.utils.generate_material import MAX_SINGLE_PASS_CHARS, generate_study_guide
+from flashcard_generator.utils.load_data import extract_pages
+from flashcard_generator.utils.map_reduce import split_into_sections
+from flashcard_generator.utils.study_cache import load_study_guide, save_study_guide
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+DOCUMENT_EXTENSIONS = (".pdf", ".txt", ".md")
+MANIFEST_NAME = "manifest.json"
+
+
+class RateLimiter:
+    """Spaces out LLM requests to at most `per_minute` per minute across threads."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: int = 1) -> None:
+        """Wait for a slot worth `cost` requests (a map-reduce document makes one per chunk)."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + cost * self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class Manifest:
+    """Per-document results, rewritten atomically after every document."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.documents = json.load(f).get("documents", {})
+
+    def is_done(self, name: str, digest: str) -> bool:
+        entry = self.documents.get(name)
+        # Invalid (gibberish) documents are final too; only failures are retried
+        return bool(entry) and entry.get("status") in ("done", "invalid") and entry.get("sha256") == digest
+
+    def record(self, name: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.documents[name] = entry
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"documents": self.documents}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def find_documents(course_dir: str) -> List[str]:
+    """Paths of the documents under course_dir, relative to it, in a stable order."""
+    documents = []
+    for root, dirs, files in os.walk(course_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(DOCUMENT_EXTENSIONS):
+                documents.append(os.path.relpath(os.path.join(root, name), course_dir))
+    return documents
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _ignore_interrupts() -> None:
+    # Ctrl-C reaches the whole process group; only the parent handles it and winds the pools down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def extract_document(path: str) -> str:
+    """Text of one document; runs in the extraction process pool."""
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return "".join(extract_pages(f.read()))
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def render_document_mind_map(mind_map: Dict[str, Any], fmt: str) -> bytes:
+    """The full mind map as image bytes; runs in the render process pool."""
+    try:
+        return render_mind_map_image(mind_map, fmt, max_depth=max(1, tree_depth(mind_map)), fallback_overview=False)
+    except graphviz.ExecutableNotFound as e:
+        # graphviz's exception does not survive pickling back to the parent process intact
+        raise RuntimeError(str(e)) from None
+
+
+def _request_cost(text: str) -> int:
+    if len(text) <= MAX_SINGLE_PASS_CHARS:
+        return 1
+    return len(split_into_sections(text))
+
+
+def process_document(name: str, out_dir: str, digest: str, text_future: Future,
+                     render_pool: Optional[ProcessPoolExecutor], fmt: str, groq_api_key: str,
+                     limiter: RateLimiter, manifest: Manifest) -> Dict[str, Any]:
+    """Generates, renders and writes one document's study guide, then records it in the manifest."""
+    started = time.perf_counter()
+    entry: Dict[str, Any] = {"sha256": digest}
+    try:
+        text = text_future.result()
+        entry["characters"] = len(text)
+        if len(text.strip()) < 10:
+            raise ValueError("No extractable text")
+
+        cached = load_study_guide(text)
+        if cached:
+            study_guide, image = cached
+            entry["cached"] = True
+        else:
+            limiter.acquire(_request_cost(text))
+            study_guide, image = generate_study_guide(text, groq_api_key), None
+            if not study_guide:
+                raise ValueError("The model returned no study guide")
+
+        # The extension stays in the directory name so week1.pdf and week1.md do not collide
+        target_dir = os.path.join(out_dir, name)
+        os.makedirs(target_dir, exist_ok=True)
+        with open(os.path.join(target_dir, "study_guide.json"), "w", encoding="utf-8") as f:
+            json.dump(study_guide, f, ensure_ascii=False, indent=2)
+        outputs = [os.path.join(target_dir, "study_guide.json")]
+
+        if study_guide.get("is_valid_topic") is False:
+            entry["status"] = "invalid"
+            entry["reason"] = study_guide.get("reason", "")
+        else:
+            if render_pool and study_guide.get("mind_map"):
+                try:
+                    if fmt != "png" or not image:
+                        image = render_pool.submit(render_document_mind_map, study_guide["mind_map"], fmt).result()
+                    image_path = os.path.join(target_dir, f"mind_map.{fmt}")
+                    with open(image_path, "wb") as f:
+                        f.write(image)
+                    outputs.append(image_path)
+                except Exception as e:
+                    # The study guide is still usable; note the render failure instead of failing the document
+                    logger.warning(f"Mind map render failed for {name}: {e}")
+                    entry["render_error"] = f"{type(e).__name__}: {e}"
+            if not entry.get("cached"):
+                save_study_guide(text, study_guide, image if fmt == "png" else None)
+            entry["status"] = "done"
+            entry["flashcards"] = len(study_guide.get("flashcards", []))
+        entry["outputs"] = [os.path.relpath(path, out_dir) for path in outputs]
+    except Exception as e:
+        logger.error(f"Failed to process {name}: {e}")
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+
+    entry["seconds"] = round(time.perf_counter() - started, 2)
+    manifest.record(name, entry)
+    return entry
+
+
+def run_batch(course_dir: str, out_dir: str, groq_api_key: str, concurrency: int = 4, rpm: float = 30,
+              extract_workers: int = 4, render_workers: int = 2, fmt: str = "png") -> Dict[str, Any]:
+    """Processes every pending document in course_dir and returns a throughput summary."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = Manifest(os.path.join(out_dir, MANIFEST_NAME))
+    documents = find_documents(course_dir)
+    digests = {name: file_digest(os.path.join(course_dir, name)) for name in documents}
+    pending = [name for name in documents if not manifest.is_done(name, digests[name])]
+    logger.info(f"{len(documents)} documents found, {len(documents) - len(pending)} already done, {len(pending)} to process")
+
+    limiter = RateLimiter(rpm)
+    started = time.perf_counter()
+    statuses: Dict[str, int] = {}
+    finished = 0
+    futures: Dict[Future, str] = {}
+    tallied = set()
+    render_pool = (ProcessPoolExecutor(max_workers=render_workers, initializer=_ignore_interrupts)
+                   if fmt != "none" else None)
+    extract_pool = ProcessPoolExecutor(max_workers=extract_workers, initializer=_ignore_interrupts)
+    workers = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="study-guide")
+
+    def tally(future: Future) -> None:
+        nonlocal finished
+        tallied.add(future)
+        finished += 1
+        status = future.result()["status"]
+        statuses[status] = statuses.get(status, 0) + 1
+        elapsed = time.perf_counter() - started
+        logger.info(f"[{finished}/{len(pending)}] {futures[future]}: {status} "
+                    f"({finished / elapsed * 60:.1f} docs/min)")
+
+    try:
+        # Extraction is queued for every document up front so it overlaps with generation
+        texts = {name: extract_pool.submit(extract_document, os.path.join(course_dir, name)) for name in pending}
+        for name in pending:
+            futures[workers.submit(process_document, name, out_dir, digests[name], texts[name],
+                                   render_pool, fmt, groq_api_key, limiter, manifest)] = name
+        for future in as_completed(futures):
+            tally(future)
+    except KeyboardInterrupt:
+        # Queued documents are dropped; the ones already generating finish and reach the manifest,
+        # so a rerun resumes from there
+        logger.warning(f"Interrupted after {finished} documents; waiting for the ones in progress")
+        workers.shutdown(cancel_futures=True)
+        extract_pool.shutdown(cancel_futures=True)
+        for future in futures:
+            if future not in tallied and not future.cancelled():
+                tally(future)
+        statuses["cancelled"] = sum(future.cancelled() for future in futures)
+    finally:
+        workers.shutdown()
+        extract_pool.shutdown()
+        if render_pool:
+            render_pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "documents": len(documents),
+        "skipped": len(documents) - len(pending),
+        "processed": finished,
+        "statuses": statuses,
+        "seconds": round(elapsed, 1),
+        "docs_per_minute": round(finished / elapsed * 60, 2) if finished and elapsed else 0.0,
+    }
+    logger.info(f"Batch finished: {summary}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("course_dir", help="Folder of PDFs / notes; searched recursively")
+    parser.add_argument("--out", required=True, help="Output folder for study guides and manifest.json")
+    parser.add_argument("--concurrency", type=int, default=4, help="Documents generated in parallel")
+    parser.add_argument("--rpm", type=float, default=30, help="LLM requests per minute (0 for no limit)")
+    parser.add_argument("--extract-workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--render-workers", type=int, default=2)
+    parser.add_argument("--format", choices=("png", "svg", "none"), default="png", help="Mind map image format")
+    parser.add_argument("--api-key", default=os.getenv("GROQ_API_KEY"), help="Defaults to $GROQ_API_KEY")
+    args = parser.parse_args()
+
+    if not args.api_key:
+        parser.error("A GROQ API key is required (--api-key or GROQ_API_KEY)")
+    summary = run_batch(args.course_dir, args.out, args.api_key, args.concurrency, args.rpm,
+                        args.extract_workers, args.render_workers, args.format)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Client-side mind map: the JSON goes to the browser, which lays it out.
+
+The tree is a collapsible outline built in plain JavaScript (no CDN), and a
+branch's children are only created the first time it is expanded, so large
+hierarchies stay responsive. Graphviz only runs when the user asks for an
+SVG or PNG export, and the file goes into a temp directory owned by the
+Streamlit session.
+"""
+import json
+import os
+import re
+import tempfile
+import logging
+from typing import Optional
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from flashcard_generator.src.visualize import count_nodes, render_mind_map_image, tree_depth
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INITIAL_EXPANDED_DEPTH = 2
+
+_TEMPLATE = """
+<style>
+  body { font-family: Helvetica, Arial, sans-serif; font-size: 14px; margin: 0; color: #003366; }
+  .toolbar { position: sticky; top: 0; background: #fff; padding: 6px 0; display: flex; gap: 6px; }
+  .toolbar button, .toolbar input { font: inherit; padding: 3px 8px; border: 1px solid #99c2ff; border-radius: 4px; }
+  .toolbar button { background: #cce5ff; cursor: pointer; }
+  ul { list-style: none; margin: 0; padding-left: 18px; border-left: 1px dashed #99c2ff; }
+  #tree > ul { border-left: none; padding-left: 0; }
+  li { margin: 3px 0; }
+  .topic { display: inline-block; padding: 2px 8px; border-radius: 6px; background: #cce5ff; cursor: default; }
+  .branch > .topic { cursor: pointer; font-weight: 600; }
+  .toggle { display: inline-block; width: 14px; color: #336699; }
+  .match > .topic { background: #ffe08a; }
+  .count { color: #6b8fb3; font-size: 12px; margin-left: 4px; }
+</style>
+<div class="toolbar">
+  <button onclick="setAll(true)">Expand all</button>
+  <button onclick="setAll(false)">Collapse all</button>
+  <input id="search" placeholder="Find a topic..." oninput="search(this.value)">
+</div>
+<div id="tree"></div>
+<script>
+const DATA = __DATA__;
+const INITIAL_DEPTH = __DEPTH__;
+
+function size(node) {
+  let n = 0;
+  for (const key in node) { n += 1 + size(node[key] || {}); }
+  return n;
+}
+
+function buildList(node, depth) {
+  const ul = document.createElement("ul");
+  for (const key of Object.keys(node)) {
+    const children = node[key] || {};
+    const li = document.createElement("li");
+    const label = document.createElement("span");
+    label.className = "topic";
+    label.textContent = key;
+    li.dataset.label = key.toLowerCase();
+    if (Object.keys(children).length) {
+      li.className = "branch";
+      li._children = children;
+      li._depth = depth;
+      const toggle = document.createElement("span");
+      toggle.className = "toggle";
+      const count = document.createElement("span");
+      count.className = "count";
+      count.textContent = "(" + size(children) + ")";
+      li.append(toggle, label, count);
+      label.onclick = toggle.onclick = () => setOpen(li, !li._open);
+      setOpen(li, depth < INITIAL_DEPTH);
+    } else {
+      li.append(Object.assign(document.createElement("span"), {className: "toggle"}), label);
+    }
+    ul.appendChild(li);
+  }
+  return ul;
+}
+
+// Children are built on first expansion only
+function setOpen(li, open) {
+  if (open && !li._list) {
+    li._list = buildList(li._children, li._depth + 1);
+    li.appendChild(li._list);
+  }
+  if (li._list) { li._list.style.display = open ? "" : "none"; }
+  li._open = open;
+  li.querySelector(".toggle").textContent = open ? "▾" : "▸";
+}
+
+function setAll(open) {
+  // Expanding everything builds the whole tree once; later toggles reuse it
+  const queue = Array.from(document.querySelectorAll("#tree li.branch"));
+  while (queue.length) {
+    const li = queue.shift();
+    setOpen(li, open);
+    if (open) { queue.push(...li._list.querySelectorAll(":scope > li.branch")); }
+  }
+}
+
+function search(text) {
+  text = text.trim().toLowerCase();
+  document.querySelectorAll("#tree li.match").forEach(li => li.classList.remove("match"));
+  if (!text) { return; }
+  setAll(true);
+  document.querySelectorAll("#tree li").forEach(li => {
+    if (li.dataset.label.includes(text)) { li.classList.add("match"); }
+  });
+}
+
+document.getElementById("tree").appendChild(buildList(DATA, 0));
+</script>
+"""
+
+
+def build_mind_map_html(mind_map_data: dict, expanded_depth: int = INITIAL_EXPANDED_DEPTH) -> str:
+    """
+    Builds the self-contained HTML page for the collapsible mind map.
+    """
+    # Keep "</script>" inside topic names from closing the script block
+    payload = json.dumps(mind_map_data, ensure_ascii=False).replace("</", "<\\/")
+    return _TEMPLATE.replace("__DATA__", payload).replace("__DEPTH__", str(int(expanded_depth)))
+
+
+def render_interactive_mind_map(mind_map_data: dict, height: int = 600) -> None:
+    """
+    Shows the mind map as a collapsible tree laid out in the browser.
+    """
+    components.html(build_mind_map_html(mind_map_data), height=height, scrolling=True)
+
+
+def session_export_dir() -> str:
+    """
+    A temp directory private to the current Streamlit session, removed when the session ends.
+    """
+    if "export_dir" not in st.session_state:
+        # TemporaryDirectory deletes itself when the session state holding it is garbage collected
+        st.session_state.export_dir = tempfile.TemporaryDirectory(prefix="mind_map_")
+    return st.session_state.export_dir.name
+
+
+def export_mind_map(mind_map_data: dict, fmt: str = "svg", export_dir: Optional[str] = None) -> str:
+    """
+    Writes the mind map as svg, png or json into the session's export directory and returns the path.
+    """
+    fmt = fmt.lower()
+    if fmt == "json":
+        data = json.dumps(mind_map_data, ensure_ascii=False, indent=2).encode("utf-8")
+    elif fmt in ("svg", "png"):
+        # Exports are the full tree, not the on-screen overview; a layout timeout raises instead of truncating
+        try:
+            data = render_mind_map_image(mind_map_data, fmt, max_depth=tree_depth(mind_map_data), fallback_overview=False)
+        except TimeoutError as e:
+            raise TimeoutError(f"{e}. The full tree is too large to lay out; export it as JSON instead.") from e
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    root = next(iter(mind_map_data), "mind_map")
+    name = re.sub(r"[^\w\-]+", "_", root).strip("_")[:60] or "mind_map"
+    path = os.path.join(export_dir or session_export_dir(), f"{name}.{fmt}")
+    with open(path, "wb") as f:
+        f.write(data)
+    logger.info(f"Exported mind map with {count_nodes(mind_map_data)} topics to {path}")
+    return path
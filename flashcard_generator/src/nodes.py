@@ -1,20 +1,65 @@
-import uuid
+import io
+from typing import Dict, Iterator, Optional, Tuple
+
+def iter_nodes(data: dict) -> Iterator[Tuple[str, Optional[str], str]]:
+    """
+    Walks a mind map depth-first without recursion, yielding (node_id, parent_id, label).
+
+    Ids are sequential in visiting order ("n0", "n1", ...), so the same tree always gets the same ids.
+    """
+    counter = 0
+    stack = [(data, None)]
+    while stack:
+        node, parent_id = stack.pop()
+        children = []
+        for key, value in node.items():
+            node_id = f"n{counter}"
+            counter += 1
+            yield node_id, parent_id, key
+            if isinstance(value, dict) and value:
+                children.append((value, node_id))
+        stack.extend(reversed(children))
 
 def add_nodes_edges(graph, data, parent_id=None):
     """
-    Recursively adds nodes and edges to a Graphviz graph for a pure topic hierarchy.
+    Adds nodes and edges to a Graphviz graph for a pure topic hierarchy.
 
     Args:
         graph: The Graphviz graph object.
         data (dict): The dictionary representing the mind map structure.
-        parent_id (str, optional): The unique ID of the parent node. Defaults to None.
+        parent_id (str, optional): The id of an existing node to attach the top-level topics to. Defaults to None.
     """
-    for key, value in data.items():
-        node_id = str(uuid.uuid4())
-        graph.node(node_id, key, shape='box', style='rounded,filled', fillcolor='#cce5ff', fontcolor='#003366')
+    for node_id, node_parent, label in iter_nodes(data):
+        graph.node(node_id, label, shape='box', style='rounded,filled', fillcolor='#cce5ff', fontcolor='#003366')
+        if node_parent or parent_id:
+            graph.edge(node_parent or parent_id, node_id)
 
-        if parent_id:
-            graph.edge(parent_id, node_id)
+def _quote(text: str) -> str:
+    return '"' + str(text).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+def _attr_list(attrs: Dict[str, str]) -> str:
+    return ", ".join(f"{key}={_quote(value)}" for key, value in attrs.items())
 
-        if isinstance(value, dict) and value:
-            add_nodes_edges(graph, value, parent_id=node_id)
\ No newline at end of file
+NODE_STYLE = {"shape": "box", "style": "rounded,filled", "fillcolor": "#cce5ff", "fontcolor": "#003366"}
+
+def build_dot_source(data: dict, graph_attrs: Optional[Dict[str, str]] = None,
+                     node_attrs: Optional[Dict[str, str]] = None, edge_attrs: Optional[Dict[str, str]] = None,
+                     name: str = "MindMap") -> str:
+    """
+    Writes the DOT source for a mind map into a single buffer.
+
+    The output depends only on the tree and the attributes, so it can be used as a render cache key.
+    """
+    buffer = io.StringIO()
+    buffer.write(f"digraph {_quote(name)} {{\n")
+    if graph_attrs:
+        buffer.write(f"\tgraph [{_attr_list(graph_attrs)}]\n")
+    buffer.write(f"\tnode [{_attr_list({**NODE_STYLE, **(node_attrs or {})})}]\n")
+    if edge_attrs:
+        buffer.write(f"\tedge [{_attr_list(edge_attrs)}]\n")
+    for node_id, parent_id, label in iter_nodes(data):
+        buffer.write(f"\t{node_id} [label={_quote(label)}]\n")
+        if parent_id:
+            buffer.write(f"\t{parent_id} -> {node_id}\n")
+    buffer.write("}\n")
+    return buffer.getvalue()
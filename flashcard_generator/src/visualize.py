@@ -1,16 +1,200 @@
+import hashlib
+import os
+import subprocess
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
 import graphviz
-from flashcard_generator.src.nodes import add_nodes_edges
+from flashcard_generator.src.nodes import build_dot_source
+from common.instrumentation import record_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Layout engine by node count: ortho-routed dot only where it stays fast, radial and
+# force-directed layouts for the large trees the "most exhaustive hierarchy" prompt produces
+ORTHO_MAX_NODES = 60
+DOT_MAX_NODES = 250
+TWOPI_MAX_NODES = 1500
+# Above this many nodes the default image is a depth-limited overview; subtrees render on demand
+OVERVIEW_MAX_NODES = 400
+OVERVIEW_DEPTH = 3
+RENDER_TIMEOUT = float(os.getenv("MIND_MAP_RENDER_TIMEOUT", "20"))
+# Rendered PNGs keyed by (engine, DOT source), so an unchanged tree is never laid out twice
+RENDER_CACHE_MAX_BYTES = int(os.getenv("MIND_MAP_RENDER_CACHE_MAX_BYTES", str(64 * 2**20)))
+
+_render_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_render_cache_bytes = 0
+_render_cache_lock = threading.Lock()
+
+def count_nodes(mind_map_data: dict) -> int:
+    """
+    Counts the topics in a mind map without recursion.
+    """
+    count = 0
+    stack = [mind_map_data]
+    while stack:
+        node = stack.pop()
+        count += len(node)
+        stack.extend(value for value in node.values() if isinstance(value, dict) and value)
+    return count
+
+def tree_depth(mind_map_data: dict) -> int:
+    """
+    Number of levels in a mind map.
+    """
+    depth = 0
+    stack = [(mind_map_data, 1)]
+    while stack:
+        node, level = stack.pop()
+        if node:
+            depth = max(depth, level)
+            stack.extend((value, level + 1) for value in node.values() if isinstance(value, dict) and value)
+    return depth
+
+def choose_engine(node_count: int) -> str:
+    """
+    Picks the Graphviz layout engine for a tree of node_count topics.
+    """
+    if node_count <= DOT_MAX_NODES:
+        return "dot"
+    if node_count <= TWOPI_MAX_NODES:
+        return "twopi"
+    return "sfdp"
+
+def limit_depth(mind_map_data: dict, max_depth: int) -> dict:
+    """
+    Copies the top max_depth levels of a mind map; a cut-off topic is labelled with how many topics it hides.
+    """
+    overview: Dict[str, dict] = {}
+    stack = [(mind_map_data, overview, 1)]
+    while stack:
+        source, target, level = stack.pop()
+        for key, value in source.items():
+            children = value if isinstance(value, dict) else {}
+            if level >= max_depth and children:
+                target[f"{key} (+{count_nodes(children)})"] = {}
+            else:
+                target[key] = {}
+                stack.append((children, target[key], level + 1))
+    return overview
+
+def get_subtree(mind_map_data: dict, path: Sequence[str]) -> dict:
+    """
+    The branch of a mind map at path (a list of topic names from the root), keeping its own topic as the root.
+    """
+    node = mind_map_data
+    for key in path[:-1]:
+        node = node[key]
+    return {path[-1]: node[path[-1]]} if path else mind_map_data
+
+def branch_paths(mind_map_data: dict, max_depth: int = 2) -> List[List[str]]:
+    """
+    Paths of the branches with sub-topics in the top max_depth levels, for choosing a subtree to render.
+    """
+    paths = []
+    stack = [(mind_map_data, [])]
+    while stack:
+        node, prefix = stack.pop()
+        for key, value in reversed(list(node.items())):
+            if isinstance(value, dict) and value:
+                paths.append(prefix + [key])
+                if len(prefix) + 1 < max_depth:
+                    stack.append((value, prefix + [key]))
+    return paths
+
+def build_mind_map_graph(mind_map_data: dict, engine: Optional[str] = None) -> graphviz.Source:
+    """
+    Builds the styled Graphviz graph for a mind map, with attributes suited to the layout engine.
+    """
+    node_count = count_nodes(mind_map_data)
+    engine = engine or choose_engine(node_count)
+    if engine == "dot" and node_count <= ORTHO_MAX_NODES:
+        graph_attrs = {"rankdir": "TB", "splines": "ortho", "concentrate": "true", "newrank": "true", "size": "20,20"}
+    elif engine == "dot":
+        graph_attrs = {"rankdir": "LR", "splines": "spline", "size": "30,30"}
+    elif engine == "twopi":
+        graph_attrs = {"overlap": "false", "splines": "false", "ranksep": "2", "size": "40,40"}
+    else:
+        graph_attrs = {"overlap": "prism", "splines": "false", "outputorder": "edgesfirst", "size": "60,60"}
+
+    source = build_dot_source(mind_map_data, graph_attrs,
+                              node_attrs={"fontname": "Helvetica", "fontsize": "12", "margin": "0.25"},
+                              edge_attrs={"fontname": "Helvetica", "fontsize": "10"})
+    return graphviz.Source(source, engine=engine)
+
+def _cache_image(key: str, image: bytes) -> None:
+    global _render_cache_bytes
+    if len(image) > RENDER_CACHE_MAX_BYTES:
+        return
+    with _render_cache_lock:
+        if key in _render_cache:
+            return
+        _render_cache[key] = image
+        _render_cache_bytes += len(image)
+        while _render_cache_bytes > RENDER_CACHE_MAX_BYTES:
+            _, evicted = _render_cache.popitem(last=False)
+            _render_cache_bytes -= len(evicted)
+
+def _run_layout(dot, timeout: float, fmt: str = "png") -> bytes:
+    key = hashlib.sha256(f"{dot.engine}\n{fmt}\n{dot.source}".encode("utf-8")).hexdigest()
+    with _render_cache_lock:
+        image = _render_cache.get(key)
+        if image is not None:
+            _render_cache.move_to_end(key)
+    record_cache("flashcards.mind_map_render", hit=image is not None)
+    if image is not None:
+        return image
+
+    try:
+        result = subprocess.run([dot.engine, f"-T{fmt}"], input=dot.source.encode("utf-8"),
+                                capture_output=True, timeout=timeout, check=True)
+    except FileNotFoundError as e:
+        raise graphviz.ExecutableNotFound([dot.engine]) from e
+    _cache_image(key, result.stdout)
+    return result.stdout
 
 def visualize_mind_map(mind_map_data: dict, output_filename: str = "mind_map") -> str:
     """
     Generates a PNG image of the mind map using Graphviz.
     """
-    dot = graphviz.Digraph('MindMap', comment='Study Mind Map')
-    dot.attr(rankdir='TB', splines='ortho', concentrate='true', newrank='true', size="20,20")
-    dot.attr('node', fontname='Helvetica', fontsize='12', margin='0.25')
-    dot.attr('edge', fontname='Helvetica', fontsize='10')
+    output_path = f"{output_filename}.png"
+    with open(output_path, "wb") as f:
+        f.write(render_mind_map_png(mind_map_data))
+    return output_path
 
-    add_nodes_edges(dot, mind_map_data)
+def render_mind_map_image(mind_map_data: dict, fmt: str = "png", subtree_path: Optional[Sequence[str]] = None,
+                          max_depth: Optional[int] = None, timeout: float = RENDER_TIMEOUT,
+                          fallback_overview: bool = True) -> bytes:
+    """
+    Renders the mind map (or the branch at subtree_path) to image bytes (png or svg) in memory.
 
-    output_path = dot.render(output_filename, format='png', view=False, cleanup=True)
-    return output_path
+    Trees above OVERVIEW_MAX_NODES are drawn as a depth-limited overview unless max_depth is given.
+    A layout that exceeds the timeout is retried once as a shallower overview, or raises TimeoutError
+    when fallback_overview is False (exports, which must not silently come out truncated).
+    """
+    data = get_subtree(mind_map_data, subtree_path) if subtree_path else mind_map_data
+    if max_depth is None and count_nodes(data) > OVERVIEW_MAX_NODES:
+        max_depth = OVERVIEW_DEPTH
+    if max_depth is not None:
+        data = limit_depth(data, max_depth)
+
+    dot = build_mind_map_graph(data)
+    try:
+        return _run_layout(dot, timeout, fmt)
+    except subprocess.TimeoutExpired:
+        depth = min(max_depth or tree_depth(data), OVERVIEW_DEPTH) - 1
+        if depth < 1 or not fallback_overview:
+            raise TimeoutError(f"Mind map layout with {dot.engine} exceeded {timeout:.0f}s")
+        logger.warning(f"{dot.engine} layout of {count_nodes(data)} topics timed out; rendering depth {depth} overview")
+        return _run_layout(build_mind_map_graph(limit_depth(data, depth)), timeout, fmt)
+
+def render_mind_map_png(mind_map_data: dict, subtree_path: Optional[Sequence[str]] = None,
+                        max_depth: Optional[int] = None, timeout: float = RENDER_TIMEOUT) -> bytes:
+    """
+    Renders the mind map (or the branch at subtree_path) to PNG bytes in memory.
+    """
+    return render_mind_map_image(mind_map_data, "png", subtree_path, max_depth, timeout)
@@ -1,33 +1,27 @@
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.pydantic_v1 import BaseModel, Field
-from langchain_groq import ChatGroq
-from typing import List, Dict, Any
+from common.llm_factory import get_chat_model
+from typing import List, Dict, Any, Iterator, Tuple
 from dotenv import load_dotenv
 import streamlit as st
 from flashcard_generator.utils.structure import StudyGuide
+from flashcard_generator.utils.normalize import normalize_study_guide
+from common.instrumentation import track_call
 
 load_dotenv()
 
-def generate_study_materials(content: str, groq_api_key: str) -> dict:
-    """
-    Generates a mind map and flashcards using LangChain and ChatGroq.
-    """
-    try:
-        model = ChatGroq(
-            temperature=0,
-            model_name="llama3-8b-8192",
-            api_key=groq_api_key
-        )
-
-        parser = JsonOutputParser(pydantic_object=StudyGuide)
+STUDY_GUIDE_MODEL = "llama3-8b-8192"
+# Bump whenever STUDY_GUIDE_TEMPLATE or normalize_study_guide changes so cached study guides are regenerated
+PROMPT_VERSION = "3"
+# Above this many characters the text no longer fits the model's 8k-token context in one prompt
+MAX_SINGLE_PASS_CHARS = 18000
 
-        prompt = PromptTemplate(
-            template="""
+STUDY_GUIDE_TEMPLATE = """
             You are a world-class AI expert at creating deeply hierarchical outlines.
             Your task is to analyze the provided text and create a comprehensive study guide in a structured JSON format.
 
-            The study guide must contain two main keys: "mind_map" and "flashcards".
+            The study guide must contain the keys "mind_map", "flashcards", "is_valid_topic" and "reason".
 
             1.  **mind_map**:
                 -   This must be a deeply nested JSON object representing a pure topic-subtopic hierarchy.
@@ -37,9 +31,14 @@ def generate_study_materials(content: str, groq_api_key: str) -> dict:
                 -   Your goal is to create the deepest and most exhaustive hierarchy possible, breaking down every concept from the source text into its constituent parts.
 
             2.  **flashcards**:
-                -   This must be a list of 10 insightful flashcards based on the most important information in the text.
+                -   This must be a list of {num_flashcards} insightful flashcards based on the most important information in the text.
                 -   Each flashcard should be a JSON object with a "question" and an "answer" field.
 
+            3.  **is_valid_topic** and **reason**:
+                -   Set "is_valid_topic" to false only if the content is random characters, gibberish, or a nonsensical phrase rather than a real topic, concept, book title or set of notes.
+                -   In that case return an empty "mind_map" {{}}, an empty "flashcards" list, and a one-sentence "reason".
+                -   Otherwise set "is_valid_topic" to true and "reason" to an empty string.
+
             Please process the following content and generate the detailed study guide.
 
             CONTENT:
@@ -47,17 +46,87 @@ def generate_study_materials(content: str, groq_api_key: str) -> dict:
 
             FORMAT INSTRUCTIONS:
             {format_instructions}
-            """,
-            input_variables=["content"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
+            """
+
+
+def build_study_chain(groq_api_key: str, num_flashcards: int = 10):
+    """
+    Builds the prompt | model | parser chain that turns content into a StudyGuide dict.
+    """
+    model = get_chat_model(STUDY_GUIDE_MODEL, temperature=0, api_key=groq_api_key)
+
+    parser = JsonOutputParser(pydantic_object=StudyGuide)
+
+    prompt = PromptTemplate(
+        template=STUDY_GUIDE_TEMPLATE,
+        input_variables=["content"],
+        partial_variables={
+            "format_instructions": parser.get_format_instructions(),
+            "num_flashcards": str(num_flashcards),
+        },
+    )
+
+    return prompt | model | parser
+
+
+def generate_study_guide(content: str, groq_api_key: str) -> dict:
+    """
+    Generates and normalizes a study guide, raising on failure (for callers outside Streamlit).
+    Content too long for one prompt goes through the map-reduce pipeline instead.
+    """
+    if len(content) > MAX_SINGLE_PASS_CHARS:
+        from flashcard_generator.utils.map_reduce import generate_study_materials_map_reduce
+        response = generate_study_materials_map_reduce(content, groq_api_key)
+    else:
+        chain = build_study_chain(groq_api_key)
+
+        with track_call("llm", "flashcards.generate_study_materials", payload=content) as span:
+            response = span.record_response(chain.invoke({"content": content}))
+
+    if response:
+        response, _ = normalize_study_guide(response)
+    return response
+
+
+def generate_study_materials(content: str, groq_api_key: str) -> dict:
+    """
+    Generates a mind map and flashcards using LangChain and a shared ChatGroq client.
+    The result is normalized and size-bounded (see normalize_study_guide).
+    """
+    try:
+        return generate_study_guide(content, groq_api_key)
+
+    except Exception as e:
+        st.error(f"An error occurred during generation: {e}")
+        st.warning("Failed to generate study materials. The model may have returned an invalid format. Please try again with a different input or a more specific topic.")
+        return None
+
+
+def stream_study_materials(content: str, groq_api_key: str) -> Iterator[Tuple[dict, bool]]:
+    """
+    Streams the study guide, yielding (partial_study_guide, done) as the JSON is parsed token by token.
+    Only the final item has done=True; on failure the stream just ends after showing the error.
+    """
+    try:
+        if len(content) > MAX_SINGLE_PASS_CHARS:
+            # The map-reduce path merges whole chunk results, so there is nothing partial to show
+            from flashcard_generator.utils.map_reduce import generate_study_materials_map_reduce
+            response = generate_study_materials_map_reduce(content, groq_api_key)
+            if response:
+                yield normalize_study_guide(response)[0], True
+            return
 
-        chain = prompt | model | parser
+        chain = build_study_chain(groq_api_key)
 
-        response = chain.invoke({"content": content})
-        return response
+        partial = None
+        with track_call("llm", "flashcards.stream_study_materials", payload=content) as span:
+            for partial in chain.stream({"content": content}):
+                if isinstance(partial, dict):
+                    yield partial, False
+            span.record_response(partial)
+        if isinstance(partial, dict):
+            yield normalize_study_guide(partial)[0], True
 
     except Exception as e:
         st.error(f"An error occurred during generation: {e}")
         st.warning("Failed to generate study materials. The model may have returned an invalid format. Please try again with a different input or a more specific topic.")
-        return None
\ No newline at end of file
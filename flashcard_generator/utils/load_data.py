@@ -1,17 +1,127 @@
+import hashlib
+import io
+import os
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
 import pypdf
 import streamlit as st
-def extract_text_from_pdf(pdf_file) -> str:
+from common.instrumentation import record_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Books at least this long are split into page ranges and extracted in a process pool
+PARALLEL_MIN_PAGES = 64
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Extracted text kept in memory, keyed by the PDF's content hash
+TEXT_CACHE_MAX_CHARS = int(os.getenv("PDF_TEXT_CACHE_MAX_CHARS", str(50_000_000)))
+
+_text_cache: "OrderedDict[str, str]" = OrderedDict()
+_text_cache_chars = 0
+_text_cache_lock = threading.Lock()
+
+
+def _read_bytes(pdf_file) -> bytes:
+    """Raw bytes of an uploaded file, a path, or a binary file object."""
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, "rb") as f:
+            return f.read()
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    pdf_file.seek(0)
+    return pdf_file.read()
+
+
+def _page_texts(pdf_reader: pypdf.PdfReader, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    pages = pdf_reader.pages
+    for index in range(start, len(pages) if stop is None else min(stop, len(pages))):
+        page_text = pages[index].extract_text()
+        if page_text:
+            yield page_text
+
+
+def extract_pages(pdf_file, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """
+    Yields the text of each page in [start, stop), one page at a time.
+    """
+    source = io.BytesIO(pdf_file) if isinstance(pdf_file, (bytes, bytearray)) else pdf_file
+    yield from _page_texts(pypdf.PdfReader(source), start, stop)
+
+
+# Each pool worker receives the PDF once, through the initializer, and parses it once
+_worker_reader: Optional[pypdf.PdfReader] = None
+
+
+def _init_worker(data: bytes) -> None:
+    global _worker_reader
+    _worker_reader = pypdf.PdfReader(io.BytesIO(data))
+
+
+def _extract_range(start: int, stop: int) -> str:
+    return "".join(_page_texts(_worker_reader, start, stop))
+
+
+def _page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    # A few ranges per worker so one slow, image-heavy range does not hold up the rest
+    size = max(1, -(-page_count // (workers * 4)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def _extract_text(data: bytes, workers: int) -> str:
+    pdf_reader = pypdf.PdfReader(io.BytesIO(data))
+    page_count = len(pdf_reader.pages)
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        return "".join(_page_texts(pdf_reader))
+
+    ranges = _page_ranges(page_count, workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as executor:
+        parts = executor.map(_extract_range, *zip(*ranges))
+        return "".join(parts)
+
+
+def _cache_get(digest: str) -> Optional[str]:
+    with _text_cache_lock:
+        text = _text_cache.get(digest)
+        if text is not None:
+            _text_cache.move_to_end(digest)
+        return text
+
+
+def _cache_put(digest: str, text: str) -> None:
+    global _text_cache_chars
+    if len(text) > TEXT_CACHE_MAX_CHARS:
+        return
+    with _text_cache_lock:
+        if digest in _text_cache:
+            return
+        _text_cache[digest] = text
+        _text_cache_chars += len(text)
+        while _text_cache_chars > TEXT_CACHE_MAX_CHARS:
+            _, evicted = _text_cache.popitem(last=False)
+            _text_cache_chars -= len(evicted)
+
+
+def extract_text_from_pdf(pdf_file, workers: int = PDF_EXTRACT_WORKERS) -> str:
     """
     Extracts text from an uploaded PDF file.
+    Results are cached by file content, so re-uploading the same PDF (or a Streamlit rerun) is instant.
     """
     try:
-        pdf_reader = pypdf.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text
+        data = _read_bytes(pdf_file)
+        digest = hashlib.sha256(data).hexdigest()
+        text = _cache_get(digest)
+        record_cache("flashcards.pdf_text", hit=text is not None)
+        if text is None:
+            text = _extract_text(data, workers)
+            _cache_put(digest, text)
         return text
     except Exception as e:
         st.error(f"Error reading PDF file: {e}")
-        return ""
\ No newline at end of file
+        return ""
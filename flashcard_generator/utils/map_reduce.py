@@ -0,0 +1,185 @@
+"""Map-reduce study-guide generation for documents too long for one prompt.
+
+The text is split on section headings into chunks that fit the model's context,
+each chunk gets its own partial mind map and flashcards (in parallel), and the
+reduce step merges the trees and de-duplicates the flashcards. Latency then
+grows with the number of chunk batches, not with document length.
+"""
+import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from flashcard_generator.utils.generate_material import build_study_chain
+from common.instrumentation import track_call
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ~3k tokens of content leaves room for the template and the JSON answer in an 8k context
+CHUNK_CHARS = int(os.getenv("STUDY_GUIDE_CHUNK_CHARS", "12000"))
+MAP_CONCURRENCY = int(os.getenv("STUDY_GUIDE_CONCURRENCY", "4"))
+FLASHCARDS_PER_CHUNK = 5
+MAX_MERGED_FLASHCARDS = 30
+DUPLICATE_SIMILARITY = 0.8
+
+HEADING_PATTERN = re.compile(
+    r"^[ \t]*(?:"
+    r"#{1,6}[ \t]+\S.*"                              # Markdown headings
+    r"|\d+(?:\.\d+)*\.?[ \t]+[A-Z][^\n]{0,80}"       # 2.1 Numbered headings
+    r"|[A-Z][A-Z0-9 ,:&'\-]{3,80}"                    # ALL-CAPS lines
+    r")[ \t]*$",
+    re.MULTILINE,
+)
+CHAPTER_PATTERN = re.compile(r"^[ \t]*(?:chapter|section|unit|part|lesson|module)[ \t]+[\dIVXLC]+\b",
+                             re.MULTILINE | re.IGNORECASE)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _section_starts(text: str) -> List[int]:
+    starts = {match.start() for match in HEADING_PATTERN.finditer(text)}
+    starts.update(match.start() for match in CHAPTER_PATTERN.finditer(text))
+    return sorted(starts)
+
+
+def split_into_sections(text: str, chunk_chars: int = CHUNK_CHARS) -> List[str]:
+    """
+    Splits text at section headings and packs consecutive sections into chunks of at most chunk_chars.
+    Sections longer than a chunk are split further on paragraph and sentence boundaries.
+    """
+    starts = _section_starts(text)
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    sections = [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_chars, chunk_overlap=200)
+    chunks: List[str] = []
+    current: List[str] = []
+    current_size = 0
+    for section in sections:
+        if not section.strip():
+            continue
+        if len(section) > chunk_chars:
+            if current:
+                chunks.append("".join(current))
+                current, current_size = [], 0
+            chunks.extend(splitter.split_text(section))
+            continue
+        if current_size + len(section) > chunk_chars:
+            chunks.append("".join(current))
+            current, current_size = [], 0
+        current.append(section)
+        current_size += len(section)
+    if current:
+        chunks.append("".join(current))
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
+
+
+def _normalize_key(key: str) -> str:
+    return " ".join(key.split()).casefold()
+
+
+def merge_mind_maps(mind_maps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Deep-merges partial mind maps; topics that differ only in case or spacing are merged,
+    keeping the first spelling seen.
+    """
+    merged: Dict[str, Any] = {}
+    spelling: Dict[int, Dict[str, str]] = {}
+
+    def merge_into(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+        names = spelling.setdefault(id(target), {_normalize_key(k): k for k in target})
+        for key, value in source.items():
+            if not isinstance(key, str) or not key.strip():
+                continue
+            name = names.setdefault(_normalize_key(key), key.strip())
+            child = target.setdefault(name, {})
+            if isinstance(value, dict):
+                merge_into(child, value)
+
+    for mind_map in mind_maps:
+        if isinstance(mind_map, dict):
+            merge_into(merged, mind_map)
+
+    # One chunk per top-level topic is common; wrap them so the tree keeps a single root
+    if len(merged) > 1:
+        return {"Study Guide": merged}
+    return merged
+
+
+def _tokens(text: str) -> set:
+    return set(_WORD_PATTERN.findall(text.casefold()))
+
+
+def _is_duplicate(tokens: set, seen: List[set]) -> bool:
+    for other in seen:
+        union = tokens | other
+        if union and len(tokens & other) / len(union) >= DUPLICATE_SIMILARITY:
+            return True
+    return False
+
+
+def dedupe_flashcards(card_lists: List[List[Dict[str, str]]],
+                      limit: int = MAX_MERGED_FLASHCARDS) -> List[Dict[str, str]]:
+    """
+    Drops flashcards whose questions match an earlier one (exactly or by word overlap) and
+    interleaves the chunks round-robin so every part of the document is represented.
+    """
+    flashcards: List[Dict[str, str]] = []
+    seen: List[set] = []
+    exact = set()
+    depth = max((len(cards) for cards in card_lists), default=0)
+    for position in range(depth):
+        for cards in card_lists:
+            if position >= len(cards) or len(flashcards) >= limit:
+                continue
+            card = cards[position]
+            if not isinstance(card, dict) or not card.get("question") or not card.get("answer"):
+                continue
+            normalized = _normalize_key(card["question"])
+            tokens = _tokens(card["question"])
+            if normalized in exact or _is_duplicate(tokens, seen):
+                continue
+            exact.add(normalized)
+            seen.append(tokens)
+            flashcards.append({"question": card["question"], "answer": card["answer"]})
+    return flashcards
+
+
+def _map_chunk(chain, index: int, chunk: str) -> Optional[Dict[str, Any]]:
+    try:
+        with track_call("llm", "flashcards.map_chunk", payload=chunk) as span:
+            return span.record_response(chain.invoke({"content": chunk}))
+    except Exception as e:
+        logger.error(f"Study guide generation failed for chunk {index}: {e}")
+        return None
+
+
+def generate_study_materials_map_reduce(content: str, groq_api_key: str,
+                                        chunk_chars: int = CHUNK_CHARS,
+                                        max_concurrency: int = MAP_CONCURRENCY) -> Dict[str, Any]:
+    """
+    Generates a study guide for long content: one partial guide per section chunk, then merged.
+    Raises RuntimeError if every chunk failed.
+    """
+    chunks = split_into_sections(content, chunk_chars)
+    logger.info(f"Generating study guide from {len(chunks)} chunks ({len(content)} characters)")
+    chain = build_study_chain(groq_api_key, num_flashcards=FLASHCARDS_PER_CHUNK)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as executor:
+        partials = list(executor.map(lambda item: _map_chunk(chain, *item), enumerate(chunks)))
+
+    partials = [partial for partial in partials if isinstance(partial, dict)]
+    if not partials:
+        raise RuntimeError(f"Study guide generation failed for all {len(chunks)} sections of the document")
+    if len(partials) < len(chunks):
+        logger.warning(f"{len(chunks) - len(partials)} of {len(chunks)} chunks failed; merging the rest")
+
+    return {
+        "mind_map": merge_mind_maps([partial.get("mind_map") or {} for partial in partials]),
+        "flashcards": dedupe_flashcards([partial.get("flashcards") or [] for partial in partials]),
+    }
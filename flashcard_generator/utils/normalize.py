@@ -0,0 +1,190 @@
+"""Post-processing for model-generated study guides.
+
+The model is asked for "the deepest and most exhaustive hierarchy possible",
+so its mind maps have no natural bound. Every generated guide is coerced into
+the StudyGuide shape, case-variant sibling topics are merged, and depth,
+fan-out and total size are capped. Whatever is cut is folded into a
+"more…" topic that says how many topics it stands for, which keeps rendering
+and session memory predictable.
+"""
+import os
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from flashcard_generator.utils.structure import StudyGuide
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Overridden by MIND_MAP_MAX_DEPTH / MIND_MAP_MAX_CHILDREN / MIND_MAP_MAX_NODES. Those are read on
+# every call, because the apps load .env only after importing this module.
+DEFAULT_MAX_DEPTH = 6
+DEFAULT_MAX_CHILDREN = 12
+DEFAULT_MAX_NODES = 500
+MORE_LABEL = "more…"
+
+
+def _limit(value: Optional[int], env_name: str, default: int) -> int:
+    return value if value is not None else int(os.getenv(env_name, str(default)))
+
+
+def _normalize_key(key: str) -> str:
+    return " ".join(key.split()).casefold()
+
+
+def _coerce_children(value: Any) -> Dict[str, Any]:
+    """Sub-topics of a mind map value; descriptions the prompt forbids are dropped."""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, list):
+        # Some responses list leaf topics instead of nesting empty objects
+        return {item: {} for item in value if isinstance(item, str)}
+    return {}
+
+
+def merge_siblings(mind_map: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """
+    Copies a mind map with duplicate and case-variant sibling topics merged (first spelling wins).
+    Returns the merged tree and the number of topics merged away.
+    """
+    merged_count = 0
+    result: Dict[str, Any] = {}
+    stack = [(mind_map, result, {})]
+    while stack:
+        source, target, names = stack.pop()
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        for key, value in _coerce_children(source).items():
+            label = " ".join(str(key).split())
+            if not label:
+                continue
+            normalized = _normalize_key(label)
+            if normalized in names:
+                merged_count += 1
+            name = names.setdefault(normalized, label)
+            child = target.setdefault(name, {})
+            pending.append((value, child))
+        # Merged duplicates share one target, so they also share its spelling table
+        tables: Dict[int, Dict[str, str]] = {}
+        for value, child in reversed(pending):
+            table = tables.setdefault(id(child), {})
+            stack.append((value, child, table))
+    return result, merged_count
+
+
+def count_topics(mind_map: Any) -> int:
+    count = 0
+    stack = [mind_map]
+    while stack:
+        node = _coerce_children(stack.pop())
+        count += len(node)
+        stack.extend(value for value in node.values() if value)
+    return count
+
+
+def _depth(mind_map: Any) -> int:
+    depth = 0
+    stack = [(mind_map, 1)]
+    while stack:
+        node, level = stack.pop()
+        node = _coerce_children(node)
+        if node:
+            depth = max(depth, level)
+            stack.extend((value, level + 1) for value in node.values())
+    return depth
+
+
+def _more(count: int) -> str:
+    return f"{MORE_LABEL} ({count} topics)"
+
+
+def limit_tree(mind_map: Dict[str, Any], max_depth: Optional[int] = None, max_children: Optional[int] = None,
+               max_nodes: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Copies a mind map level by level within the depth, fan-out and total-topic limits.
+
+    Siblings past max_children (or past the topic budget) are folded into one "more…" sibling, and
+    the sub-topics of a topic at max_depth into one "more…" child. "more…" topics count against the
+    budget, but branches already queued when it runs out still get theirs, so the result stays under
+    twice max_nodes. Limits left as None come from the environment. Returns the tree and the number
+    of topics folded away.
+    """
+    max_depth = _limit(max_depth, "MIND_MAP_MAX_DEPTH", DEFAULT_MAX_DEPTH)
+    max_children = _limit(max_children, "MIND_MAP_MAX_CHILDREN", DEFAULT_MAX_CHILDREN)
+    max_nodes = _limit(max_nodes, "MIND_MAP_MAX_NODES", DEFAULT_MAX_NODES)
+    folded = 0
+    budget = max_nodes
+    result: Dict[str, Any] = {}
+    queue = deque([(mind_map, result, 1)])
+    while queue:
+        source, target, level = queue.popleft()
+        items = list(source.items())
+        limit = len(items) if len(items) <= max_children else max_children - 1
+        kept = 0
+        for key, children in items[:limit]:
+            if budget <= 0:
+                break
+            budget -= 1
+            kept += 1
+            target[key] = {}
+            if not children:
+                continue
+            if level >= max_depth:
+                hidden = count_topics(children)
+                target[key][_more(hidden)] = {}
+                folded += hidden
+                budget -= 1
+            else:
+                queue.append((children, target[key], level + 1))
+        overflow = items[kept:]
+        if overflow:
+            hidden = len(overflow) + sum(count_topics(children) for _, children in overflow)
+            target[_more(hidden)] = {}
+            folded += hidden
+            budget -= 1
+    return result, folded
+
+
+def _clean_flashcards(cards: Any) -> List[Dict[str, str]]:
+    flashcards = []
+    seen = set()
+    for card in cards if isinstance(cards, list) else []:
+        if not isinstance(card, dict):
+            continue
+        question = " ".join(str(card.get("question") or "").split())
+        answer = str(card.get("answer") or "").strip()
+        if not question or not answer or _normalize_key(question) in seen:
+            continue
+        seen.add(_normalize_key(question))
+        flashcards.append({"question": question, "answer": answer})
+    return flashcards
+
+
+def normalize_study_guide(study_guide: Dict[str, Any], max_depth: Optional[int] = None, max_children: Optional[int] = None,
+                          max_nodes: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Validates a generated study guide against StudyGuide and bounds its mind map.
+    Returns the normalized guide and a report of topic counts before and after.
+    """
+    raw_map = _coerce_children(study_guide.get("mind_map"))
+    merged, merged_count = merge_siblings(raw_map)
+    limited, folded = limit_tree(merged, max_depth, max_children, max_nodes)
+
+    normalized = dict(study_guide)
+    normalized["mind_map"] = limited
+    normalized["flashcards"] = _clean_flashcards(study_guide.get("flashcards"))
+    # Raises if the model's output cannot be coerced into the schema at all
+    normalized = StudyGuide.parse_obj(normalized).dict()
+
+    report = {
+        "topics_in": count_topics(raw_map),
+        "topics_out": count_topics(limited),
+        "topics_merged": merged_count,
+        "topics_folded": folded,
+        "depth_in": _depth(raw_map),
+        "depth_out": _depth(limited),
+        "flashcards": len(normalized["flashcards"]),
+    }
+    logger.info(f"Normalized study guide: {report}")
+    return normalized, report
@@ -0,0 +1,69 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import streamlit as st
+
+def complete_flashcards(partial: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Flashcards from a partially parsed StudyGuide that the model has finished writing.
+
+    The last card in the list may still be streaming, so it only counts once a later
+    top-level key (e.g. "is_valid_topic") has started.
+    """
+    cards = partial.get("flashcards")
+    if not isinstance(cards, list):
+        return []
+    keys = list(partial)
+    flashcards_done = keys.index("flashcards") < len(keys) - 1
+    settled = cards if flashcards_done else cards[:-1]
+    return [card for card in settled if isinstance(card, dict) and card.get("question") and card.get("answer")]
+
+def settled_branches(partial: Dict[str, Any]) -> List[str]:
+    """
+    Top-level mind map branches that are fully written; a single root topic is looked through.
+
+    A branch is settled once the next one has started or the mind map itself is closed.
+    """
+    mind_map = partial.get("mind_map")
+    if not isinstance(mind_map, dict) or not mind_map:
+        return []
+    keys = list(partial)
+    mind_map_done = keys.index("mind_map") < len(keys) - 1
+    if len(mind_map) == 1:
+        root, children = next(iter(mind_map.items()))
+        if isinstance(children, dict) and children:
+            branches = list(children)
+            return [f"{root} › {branch}" for branch in (branches if mind_map_done else branches[:-1])]
+    branches = list(mind_map)
+    return branches if mind_map_done else branches[:-1]
+
+def render_partial_study_guide(placeholder, partial: Dict[str, Any]) -> None:
+    """
+    Shows the branches and flashcards that have arrived so far in a Streamlit placeholder.
+    """
+    branches = settled_branches(partial)
+    flashcards = complete_flashcards(partial)
+    with placeholder.container():
+        st.subheader("Generating your study guide...")
+        if branches:
+            st.markdown("**Mind map branches so far:** " + ", ".join(branches))
+        for i, card in enumerate(flashcards):
+            with st.expander(f"**Question {i+1}:** {card['question']}"):
+                st.info(f"**Answer:** {card['answer']}")
+
+def show_study_guide_stream(stream: Iterable[Tuple[Dict[str, Any], bool]], placeholder) -> Optional[Dict[str, Any]]:
+    """
+    Consumes stream_study_materials, redrawing the placeholder whenever another branch or card is complete.
+    Returns the final study guide, or None if the stream failed.
+    """
+    study_guide = None
+    shown = (0, 0)
+    for partial, done in stream:
+        if done:
+            study_guide = partial
+            break
+        progress = (len(settled_branches(partial)), len(complete_flashcards(partial)))
+        if progress != shown:
+            render_partial_study_guide(placeholder, partial)
+            shown = progress
+    placeholder.empty()
+    return study_guide
@@ -8,4 +8,10 @@ class Flashcard(BaseModel):
 
 class StudyGuide(BaseModel):
     mind_map: Dict[str, Any] = Field(description="A deeply nested dictionary representing a pure topic-subtopic hierarchy. Keys are topics, and values are always another nested dictionary of sub-topics.")
-    flashcards: List[Flashcard] = Field(description="A list of 10 flashcards, each with a question and an answer.")
\ No newline at end of file
+    flashcards: List[Flashcard] = Field(description="A list of 10 flashcards, each with a question and an answer.")
+    is_valid_topic: bool = Field(True, description="False if the content is gibberish or not a real topic, in which case mind_map and flashcards are empty.")
+    reason: str = Field("", description="A short explanation when is_valid_topic is false.")
+
+class ValidationResponse(BaseModel):
+    is_valid_topic: bool = Field(description="Whether the input is a real, understandable topic suitable for study materials.")
+    reason: str = Field(description="A short explanation of the decision.")
@@ -0,0 +1,131 @@
+"""Persistent cache of generated study guides and their rendered mind maps.
+
+Entries are keyed by (content hash, model, prompt version), so the same topic
+or notes from any user skip both the LLM call and the Graphviz render. Topic
+names are normalized before hashing; notes and PDFs are hashed verbatim. The
+SQLite file is bounded by total stored bytes; the least recently used entries
+are evicted first.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from flashcard_generator.utils.generate_material import PROMPT_VERSION, STUDY_GUIDE_MODEL
+from flashcard_generator.utils.validation import MAX_GATED_LENGTH
+from common.instrumentation import record_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STUDY_GUIDE_CACHE_PATH = os.getenv("STUDY_GUIDE_CACHE_PATH", "./study_guide_cache.db")
+STUDY_GUIDE_CACHE_MAX_BYTES = int(os.getenv("STUDY_GUIDE_CACHE_MAX_BYTES", str(256 * 2**20)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS study_guides (
+    key TEXT PRIMARY KEY,
+    study_guide TEXT NOT NULL,
+    image BLOB,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS study_guides_last_used ON study_guides (last_used);
+"""
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def normalize_content(content: str) -> str:
+    """
+    Cache form of the input. Short topic names are casefolded with whitespace and hyphens
+    collapsed ("Cell-Division" and "cell division" share an entry); longer notes and PDFs
+    are kept verbatim, since case and hyphens there change what the study guide covers.
+    """
+    if len(content.strip()) > MAX_GATED_LENGTH:
+        return content
+    return " ".join(content.replace("-", " ").split()).casefold()
+
+
+def study_guide_key(content: str, model: str = STUDY_GUIDE_MODEL, prompt_version: str = PROMPT_VERSION) -> str:
+    """Cache key for generating a study guide from `content` with this model and prompt."""
+    digest = hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+    return f"{model}:{prompt_version}:{digest}"
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30)
+    if db_path not in _initialized_paths:
+        with _init_lock:
+            if db_path not in _initialized_paths:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                conn.commit()
+                _initialized_paths.add(db_path)
+    return conn
+
+
+def load_study_guide(content: str, db_path: str = STUDY_GUIDE_CACHE_PATH) -> Optional[Tuple[Dict[str, Any], Optional[bytes]]]:
+    """Return (study_guide, mind map PNG bytes) for previously generated content, or None."""
+    key = study_guide_key(content)
+    try:
+        conn = _connect(db_path)
+        try:
+            row = conn.execute("SELECT study_guide, image FROM study_guides WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                with conn:
+                    conn.execute("UPDATE study_guides SET last_used = ? WHERE key = ?", (time.time(), key))
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"Study guide cache read failed: {e}")
+        row = None
+
+    record_cache("flashcards.study_guide", hit=row is not None)
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1]
+
+
+def _evict(conn: sqlite3.Connection, max_bytes: int) -> None:
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM study_guides").fetchone()[0]
+    if total <= max_bytes:
+        return
+    evicted = 0
+    for key, size in conn.execute("SELECT key, size FROM study_guides ORDER BY last_used").fetchall():
+        if total <= max_bytes:
+            break
+        conn.execute("DELETE FROM study_guides WHERE key = ?", (key,))
+        total -= size
+        evicted += 1
+    logger.info(f"Evicted {evicted} study guides from the cache")
+
+
+def save_study_guide(content: str, study_guide: Dict[str, Any], image: Optional[bytes],
+                     db_path: str = STUDY_GUIDE_CACHE_PATH, max_bytes: int = STUDY_GUIDE_CACHE_MAX_BYTES) -> None:
+    """Store a generated study guide and its rendered mind map, evicting old entries past max_bytes."""
+    payload = json.dumps(study_guide, ensure_ascii=False)
+    size = len(payload.encode("utf-8")) + len(image or b"")
+    if size > max_bytes:
+        return
+    now = time.time()
+    try:
+        conn = _connect(db_path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO study_guides (key, study_guide, image, size, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (study_guide_key(content), payload, image, size, now, now)
+                )
+                _evict(conn, max_bytes)
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"Failed to cache study guide: {e}")
@@ -1,38 +1,81 @@
-from langchain_groq import ChatGroq
-from flashcard_generator.utils.structure import ValidationResponse
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import PromptTemplate
+import math
+import re
+from collections import Counter
+from typing import Dict, List
 
-def validate_input_content(content: str, groq_api_key: str) -> ValidationResponse:
+# Inputs at most this long (topic names, short phrases) go through the local gate.
+# Longer notes and PDFs are judged by the model itself via StudyGuide.is_valid_topic.
+MAX_GATED_LENGTH = 300
+# The gate only rejects when it is confident; anything borderline goes on to the model,
+# whose StudyGuide.is_valid_topic has the final say.
+MIN_DICTIONARY_HIT_RATE = 0.5
+# Bits per character below which a string is mostly one repeated pattern ("aaaaaa", "abababab")
+MIN_CHAR_ENTROPY = 1.5
+MAX_CONSONANT_RUN = 5
+# Vowel-less tokens up to this long are read as acronyms whatever their case (sql, HTML, pH)
+MAX_ACRONYM_LENGTH = 5
+
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+", re.UNICODE)
+_VOWELS = set("aeiouy")
+
+
+def char_entropy(text: str) -> float:
+    """Shannon entropy of the non-space characters, in bits per character."""
+    chars = [c for c in text.casefold() if not c.isspace()]
+    if not chars:
+        return 0.0
+    total = len(chars)
+    return -sum(n / total * math.log2(n / total) for n in Counter(chars).values())
+
+
+def _is_word_like(token: str) -> bool:
+    # Non-Latin scripts (e.g. Hindi topic names) cannot be judged by English letter rules
+    if not token.isascii():
+        return True
+    word = token.casefold()
+    if re.search(r"(.)\1\1", word):
+        return False
+    vowels = sum(c in _VOWELS for c in word)
+    # Acronyms such as DNA, sql, pH, and short words such as "ai" or "Eye"
+    if len(word) <= 3 or (token.isupper() and len(token) <= MAX_ACRONYM_LENGTH):
+        return True
+    if not vowels:
+        return len(word) <= MAX_ACRONYM_LENGTH
+    if vowels / len(word) > 0.8:
+        return False
+    run = 0
+    for c in word:
+        run = 0 if c in _VOWELS else run + 1
+        if run > MAX_CONSONANT_RUN:
+            return False
+    return True
+
+
+def dictionary_hit_rate(text: str) -> float:
+    """Share of alphabetic tokens that look like real (English-spelled) words."""
+    tokens: List[str] = _TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return 0.0
+    return sum(_is_word_like(token) for token in tokens) / len(tokens)
+
+
+def validate_input_content(content: str) -> Dict:
     """
-    NEW FUNCTION: Validates if the user input is a real topic using an LLM call.
+    Rejects short input locally, without an LLM call, when it is clearly gibberish.
+    Anything it is unsure about passes and is judged by the model during generation.
+    Returns a dict shaped like ValidationResponse.
     """
-    try:
-        model = ChatGroq(temperature=0, model_name="llama3-8b-8192", api_key=groq_api_key)
-        parser = JsonOutputParser(pydantic_object=ValidationResponse)
-
-        prompt = PromptTemplate(
-            template="""
-            You are an intelligent validation assistant. Your task is to determine if the provided text is a real, understandable topic suitable for creating study materials.
-            Topics can be academic subjects, concepts, book titles, etc.
-            Invalid input would be random characters, gibberish, or nonsensical phrases.
-
-            Analyze the following text and respond in the requested JSON format.
-
-            TEXT:
-            {content}
-
-            FORMAT INSTRUCTIONS:
-            {format_instructions}
-            """,
-            input_variables=["content"],
-            partial_variables={"format_instructions": parser.get_format_instructions()},
-        )
-
-        chain = prompt | model | parser
-        response = chain.invoke({"content": content})
-        return response
-    
-    except Exception as e:
-        print(f"Validation chain failed: {e}")
-        return {"is_valid_topic": True, "reason": "Validation process encountered an error."}
\ No newline at end of file
+    text = content.replace("-", " ").strip()
+    if not text:
+        return {"is_valid_topic": False, "reason": "The input is empty."}
+    if len(text) > MAX_GATED_LENGTH:
+        return {"is_valid_topic": True, "reason": "Long input is checked during generation."}
+
+    if len(text.replace(" ", "")) >= 6 and char_entropy(text) < MIN_CHAR_ENTROPY:
+        return {"is_valid_topic": False, "reason": "The input is mostly repeated characters."}
+    tokens = text.casefold().split()
+    if len(tokens) >= 3 and len(set(tokens)) == 1:
+        return {"is_valid_topic": False, "reason": "The input is one word repeated."}
+    if dictionary_hit_rate(text) < MIN_DICTIONARY_HIT_RATE:
+        return {"is_valid_topic": False, "reason": "The input does not look like real words."}
+    return {"is_valid_topic": True, "reason": "The input looks like a real topic."}
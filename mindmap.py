@@ -2,9 +2,14 @@ import streamlit as st
 import os
 from dotenv import load_dotenv
 
-from flashcard_generator.src.visualize import visualize_mind_map
-from flashcard_generator.utils.generate_material import generate_study_materials
+from flashcard_generator.src.interactive import export_mind_map, render_interactive_mind_map
+from flashcard_generator.src.visualize import OVERVIEW_DEPTH, OVERVIEW_MAX_NODES, branch_paths, count_nodes, render_mind_map_png
+from flashcard_generator.utils.generate_material import stream_study_materials
 from flashcard_generator.utils.load_data import extract_text_from_pdf
+from flashcard_generator.utils.streaming import show_study_guide_stream
+from flashcard_generator.utils.study_cache import load_study_guide, save_study_guide
+from flashcard_generator.utils.validation import validate_input_content
+from common.instrumentation import render_debug_panel, start_metrics_server
 
 load_dotenv()
 
@@ -22,6 +27,11 @@ if 'study_guide' not in st.session_state:
     st.session_state.study_guide = None
 if 'mind_map_image' not in st.session_state:
     st.session_state.mind_map_image = None
+if 'mind_map_export' not in st.session_state:
+    st.session_state.mind_map_export = None
+
+# Branches and flashcards appear here while the model is still writing
+stream_placeholder = st.empty()
 
 with st.sidebar:
     st.header("📚 Input Your Content")
@@ -41,25 +51,43 @@ with st.sidebar:
             with st.spinner("Extracting text from PDF..."):
                 content_input = extract_text_from_pdf(uploaded_file)
 
+    # The interactive tree is laid out in the browser; Graphviz then only runs for exports
+    view_mode = st.radio("Mind map view:", ("Interactive", "Image"))
+
     if st.button("Generate Study Materials", use_container_width=True, type="primary"):
         if not groq_api_key:
             st.error("Please provide a GROQ API Key to proceed.")
         elif not content_input or len(content_input.strip()) < 2:
             st.error("Input is too short. Please enter a valid topic, paste more detailed notes, or upload a valid PDF.")
+        elif not validate_input_content(content_input)["is_valid_topic"]:
+            st.error("This doesn't look like a real topic. Please check the spelling or try a different input.")
         else:
+            st.session_state.mind_map_export = None
             with st.spinner("The AI is thinking... Generating your deep topic hierarchy..."):
                 try:
-                    study_guide = generate_study_materials(content_input, groq_api_key)
-                    if study_guide and 'mind_map' in study_guide and study_guide['mind_map']:
-                        st.session_state.study_guide = study_guide
-                        with st.spinner("Creating detailed mind map visualization..."):
-                            mind_map_path = visualize_mind_map(study_guide['mind_map'])
-                            st.session_state.mind_map_image = mind_map_path
-                        st.success("Successfully generated study materials!")
+                    cached = load_study_guide(content_input)
+                    if cached:
+                        st.session_state.study_guide, st.session_state.mind_map_image = cached
+                        st.success("Loaded study materials from the cache!")
                     else:
-                        st.session_state.study_guide = None
-                        st.session_state.mind_map_image = None
-                        st.error("Generation failed. The model might not have returned the expected data. Please try again.")
+                        study_guide = show_study_guide_stream(stream_study_materials(content_input, groq_api_key), stream_placeholder)
+                        if study_guide and study_guide.get('is_valid_topic') is False:
+                            st.session_state.study_guide = None
+                            st.session_state.mind_map_image = None
+                            st.error(f"This doesn't look like a real topic: {study_guide.get('reason', '')}")
+                        elif study_guide and 'mind_map' in study_guide and study_guide['mind_map']:
+                            st.session_state.study_guide = study_guide
+                            if view_mode == "Image":
+                                with st.spinner("Creating detailed mind map visualization..."):
+                                    st.session_state.mind_map_image = render_mind_map_png(study_guide['mind_map'])
+                            else:
+                                st.session_state.mind_map_image = None
+                            save_study_guide(content_input, study_guide, st.session_state.mind_map_image)
+                            st.success("Successfully generated study materials!")
+                        else:
+                            st.session_state.study_guide = None
+                            st.session_state.mind_map_image = None
+                            st.error("Generation failed. The model might not have returned the expected data. Please try again.")
                 except Exception as e:
                     st.error(f"A critical error occurred: {e}")
                     st.session_state.study_guide = None
@@ -74,18 +102,51 @@ if st.session_state.study_guide:
 
     with col1:
         st.subheader("Mind Map")
-        if st.session_state.mind_map_image:
-            st.image(st.session_state.mind_map_image, caption="Generated Mind Map", use_container_width=True)
-            with open(st.session_state.mind_map_image, "rb") as file:
+        mind_map = st.session_state.study_guide.get('mind_map', {})
+        if view_mode == "Interactive":
+            render_interactive_mind_map(mind_map)
+            export_format = st.selectbox("Export as:", ("SVG", "PNG", "JSON"))
+            if st.button("Prepare Export", use_container_width=True):
+                with st.spinner("Exporting mind map..."):
+                    try:
+                        st.session_state.mind_map_export = export_mind_map(mind_map, export_format)
+                    except Exception as e:
+                        st.error(f"Could not export the mind map: {e}")
+            export_path = st.session_state.mind_map_export
+            if export_path and os.path.exists(export_path):
+                with open(export_path, "rb") as file:
+                    st.download_button(
+                        label=f"Download {os.path.basename(export_path)}",
+                        data=file,
+                        file_name=os.path.basename(export_path),
+                        use_container_width=True
+                    )
+        else:
+            if not st.session_state.mind_map_image and mind_map:
+                with st.spinner("Rendering mind map image..."):
+                    try:
+                        st.session_state.mind_map_image = render_mind_map_png(mind_map)
+                    except Exception as e:
+                        st.error(f"Could not render the mind map: {e}")
+            if st.session_state.mind_map_image:
+                st.image(st.session_state.mind_map_image, caption="Generated Mind Map", use_container_width=True)
                 st.download_button(
                     label="Download Mind Map (PNG)",
-                    data=file,
+                    data=st.session_state.mind_map_image,
                     file_name="mind_map.png",
                     mime="image/png",
                     use_container_width=True
                 )
-        else:
-            st.warning("Could not generate mind map image.")
+                topic_count = count_nodes(mind_map)
+                if topic_count > OVERVIEW_MAX_NODES:
+                    st.caption(f"Showing the top {OVERVIEW_DEPTH} levels of {topic_count} topics. Pick a branch to see it in full.")
+                    branch = st.selectbox("Expand a branch:", [None] + branch_paths(mind_map),
+                                          format_func=lambda path: "Overview" if path is None else " › ".join(path))
+                    if branch:
+                        with st.spinner("Rendering branch..."):
+                            st.image(render_mind_map_png(mind_map, subtree_path=branch), caption=" › ".join(branch), use_container_width=True)
+            else:
+                st.warning("Could not generate mind map image.")
 
     with col2:
         st.subheader("Flashcards")
@@ -103,3 +164,6 @@ if st.session_state.study_guide:
 else:
     st.info("Your generated study materials will appear here once you provide an input and click 'Generate'.")
 
+# Opt-in via INSTRUMENTATION_METRICS_PORT / INSTRUMENTATION_DEBUG_PANEL
+start_metrics_server()
+render_debug_panel()
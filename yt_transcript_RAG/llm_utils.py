@@ -1,23 +1,55 @@
-from openai import OpenAI
-from typing import List, Tuple
+from typing import Any, Iterator, List, Optional, Tuple
+import contextlib
 import time
 import os
 from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+try:
+    from common.instrumentation import track_call
+    from common.llm_factory import get_chat_model, get_openai_client
+except ImportError:
+    # Run from this folder (python main.py), where the repository root is not on sys.path:
+    # clients are built directly (no shared connection pool) and calls are not instrumented
+    def get_chat_model(model: str, temperature: float = 0.0, api_key: Optional[str] = None):
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model, temperature=temperature, api_key=api_key)
+
+    def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+        from openai import OpenAI
+        return OpenAI(api_key=api_key, base_url=base_url)
+
+    class _NullSpan:
+        def record_response(self, response: Any) -> Any:
+            return response
+
+        def set_tokens(self, tokens_in: int = 0, tokens_out: int = 0) -> None:
+            pass
+
+        def set_payload(self, request: Any) -> None:
+            pass
+
+        def add_retry(self) -> None:
+            pass
+
+    @contextlib.contextmanager
+    def track_call(kind: str, site: str, payload: Any = None) -> Iterator[_NullSpan]:
+        yield _NullSpan()
+
 # API configuration
 A4F_API_KEY = os.getenv("A4F_API_KEY")
 A4F_API_URL = os.getenv("A4F_API_URL")
-openai_client = OpenAI(api_key=A4F_API_KEY, base_url=A4F_API_URL)
+openai_client = get_openai_client(api_key=A4F_API_KEY, base_url=A4F_API_URL)
 
 def get_embedding(text: str) -> List[float]:
     """Generate embedding for a given text using OpenAI."""
     time.sleep(10)
-    response = openai_client.embeddings.create(
-        input=text,
-        model="provider-3/text-embedding-ada-002"
-    )
+    with track_call("embedding", "llm_utils.get_embedding", payload=text) as span:
+        response = span.record_response(openai_client.embeddings.create(
+            input=text,
+            model="provider-3/text-embedding-ada-002"
+        ))
     return response.data[0].embedding
 
 def generate_answer(query: str, retrieved_docs: List[Tuple[str, float]]) -> str:
@@ -25,12 +57,13 @@ def generate_answer(query: str, retrieved_docs: List[Tuple[str, float]]) -> str:
     context = "\n".join([doc[0] for doc in retrieved_docs])
     prompt = f"""Context:\n{context}\n\nQuery: {query}\n\nAnswer the query based on the provided context."""
 
-    response = openai_client.chat.completions.create(
-        model="provider-3/gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=500
-    )
+    with track_call("llm", "llm_utils.generate_answer", payload=prompt) as span:
+        response = span.record_response(openai_client.chat.completions.create(
+            model="provider-3/gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=500
+        ))
     return response.choices[0].message.content.strip()
\ No newline at end of file
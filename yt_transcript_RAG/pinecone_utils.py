@@ -2,7 +2,7 @@ from pinecone import Pinecone, ServerlessSpec
 from typing import List
 # import streamlit as st
 import uuid
-from llm_utils import get_embedding
+from llm_utils import get_embedding, track_call
 import os
 from dotenv import load_dotenv
 # Load environment variables
@@ -38,15 +38,18 @@ def index_documents(documents: List[str], index):
             "values": embedding,
             "metadata": {"text": doc.page_content}
         })
-    index.upsert(vectors=vectors)
+    with track_call("vector_store", "pinecone.upsert", payload=[vector["metadata"]["text"] for vector in vectors]):
+        index.upsert(vectors=vectors)
     # st.write(f"Indexed {len(vectors)} documents.")
 
 def retrieve_documents(query: str, index, top_k: int = 1) -> List[tuple[str, float]]:
     """Retrieve relevant documents from Pinecone based on query."""
     query_embedding = get_embedding(query)
-    query_response = index.query(
-        vector=query_embedding,
-        top_k=top_k,
-        include_metadata=True
-    )
+    with track_call("vector_store", "pinecone.query", payload=query) as span:
+        query_response = index.query(
+            vector=query_embedding,
+            top_k=top_k,
+            include_metadata=True
+        )
+        span.record_response([match.metadata.get("text", "") for match in query_response.matches])
     return [(match.metadata.get("text"), match.score) for match in query_response.matches]
\ No newline at end of file
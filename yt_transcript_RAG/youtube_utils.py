@@ -2,10 +2,10 @@ from urllib.parse import urlparse, parse_qs
 from typing import Optional, Tuple
 from youtube_transcript_api import YouTubeTranscriptApi
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_groq import ChatGroq
 import time
 import logging
 from dataclasses import dataclass
+from llm_utils import get_chat_model, track_call
 import os
 from dotenv import load_dotenv
 # Load environment variables
@@ -39,36 +39,42 @@ def extract_video_id(url: str) -> Optional[str]:
 def get_transcript_and_summary(video_id: str) -> Tuple[str, str]:
     """Fetch transcript and generate summary for a YouTube video."""
     ytt_api = YouTubeTranscriptApi()
-    transcript_list = ytt_api.list(video_id)
+    with track_call("transcript", "youtube.list_transcripts", payload=video_id):
+        transcript_list = ytt_api.list(video_id)
     final_trans = ""
     final_sum = ""
 
     for transcript in transcript_list:
         lan = transcript.language_code
-        res = transcript.fetch()
+        with track_call("transcript", "youtube.fetch_transcript", payload=video_id) as span:
+            res = transcript.fetch()
+            span.record_response([item.text for item in res])
         snippets = [FetchedTranscriptSnippet(text=item.text, start=item.start, duration=item.duration) for item in res]
         combined_text = " ".join(snippet.text for snippet in snippets)
 
         if lan == 'hi':
             text_split = RecursiveCharacterTextSplitter(chunk_size=7000, chunk_overlap=200)
             tsplit = text_split.split_text(combined_text)
+            llm = get_chat_model('gemma2-9b-it', temperature=0.7, api_key=GROQ_API_KEY)
             for i in tsplit:
-                llm = ChatGroq(model='gemma2-9b-it', api_key=GROQ_API_KEY)
                 prompt = f"""Translate the following Hindi text into fluent English. Return only the translated English text without any explanation:\n{i}"""
-                result = llm.invoke(prompt)
+                with track_call("llm", "youtube_utils.translate_chunk", payload=prompt) as span:
+                    result = span.record_response(llm.invoke(prompt))
                 time.sleep(1)
                 final_trans += result.content + " "
                 prompt = f"""Summarize the following text in 1-2 lines:\n{i}"""
-                result = llm.invoke(prompt)
+                with track_call("llm", "youtube_utils.summarize_chunk", payload=prompt) as span:
+                    result = span.record_response(llm.invoke(prompt))
                 final_sum += result.content + "\n"
                 time.sleep(3)
         else:
             final_trans = combined_text
             text_split = RecursiveCharacterTextSplitter(chunk_size=7000, chunk_overlap=200)
             tsplit = text_split.split_text(combined_text)
+            llm = get_chat_model('gemma2-9b-it', temperature=0.7, api_key=GROQ_API_KEY)
             for i in tsplit:
-                llm = ChatGroq(model='gemma2-9b-it', api_key=GROQ_API_KEY)
                 prompt = f"""Summarize the following text in 1-2 lines:\n{i}"""
-                result = llm.invoke(prompt)
+                with track_call("llm", "youtube_utils.summarize_chunk", payload=prompt) as span:
+                    result = span.record_response(llm.invoke(prompt))
                 final_sum += result.content + "\n"
     return final_trans, final_sum
\ No newline at end of file